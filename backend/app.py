@@ -1,107 +1,220 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
-from summarizer import TextSummarizer
 from file_handler import FileHandler
-from multilingual_summarizer import MultilingualSummarizer
-from language_detector import LanguageDetector
-from translator import TextTranslator
+from summary_service import build_summary_service
+from jobs import JobManager
+from bulk import BulkSummarizer, parse_json_items, parse_ndjson_items
+from model_registry import get_registry
+from streaming import to_ndjson
+from uploads import UploadRequest, purge_stale_spools, upload_sha256
+from document_store import DocumentStore, DocumentNotFound
+from document import Document
+from startup import preload_models, warm_up
+from process_memory import MASTER_PID_ENV, memory_report
+import nltk_support
+from werkzeug.exceptions import RequestEntityTooLarge
 import logging
-from io import BytesIO
+import os
+import sys
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_config
+
 app = Flask(__name__)
+app.config.from_object(get_config())
 CORS(app)
 
+# NLTK data comes from the bundled directory; nothing is downloaded unless NLTK_DOWNLOAD is set
+nltk_support.configure(app.config['NLTK_DATA_DIR'], allow_download=app.config['NLTK_DOWNLOAD'])
+
+# Uploads are spooled to disk and hashed while the request body streams in
+UploadRequest.configure(
+    spool_dir=app.config['UPLOAD_SPOOL_DIR'],
+    max_file_bytes=app.config['MAX_UPLOAD_MB'] * 1024 * 1024,
+    request_quota_bytes=app.config['UPLOAD_REQUEST_QUOTA_MB'] * 1024 * 1024
+)
+app.request_class = UploadRequest
+purge_stale_spools(app.config['UPLOAD_SPOOL_DIR'])
+
 # Initialize components
-summarizer = TextSummarizer()
+summary_service = build_summary_service(app.config)
+summarizer = summary_service.summarizer
+multilingual_summarizer = summary_service.multilingual_summarizer
+language_detector = summary_service.language_detector
+summary_cache = summary_service.cache
+model_registry = get_registry()
 file_handler = FileHandler()
-multilingual_summarizer = MultilingualSummarizer()
-language_detector = LanguageDetector()
-translator = TextTranslator()
+translator = multilingual_summarizer.translator  # Shares the bounded translation pool
+document_store = DocumentStore(
+    app.config['DOCUMENT_DB_PATH'],
+    language_detector=language_detector,
+    max_bytes=app.config['DOCUMENT_STORE_MAX_MB'] * 1024 * 1024,
+    max_documents=app.config['DOCUMENT_STORE_MAX_DOCUMENTS'],
+    ttl=app.config['DOCUMENT_TTL']
+)
+job_manager = JobManager(app.config)
+bulk_summarizer = BulkSummarizer(
+    summary_service,
+    batch_size=app.config['BULK_BATCH_SIZE'],
+    workers=app.config['BULK_WORKERS'],
+    extractive_processes=app.config['BULK_EXTRACTIVE_PROCESSES']
+)
 
 logging.basicConfig(level=logging.INFO)
 
+# Components above are cheap to build; models and heavy libraries load on first use
+if not app.config['LAZY_STARTUP']:
+    warm_up(summary_service)
+
+# Under gunicorn with preload_app these load once in the master and every worker shares them
+if app.config['PRELOAD_MODELS']:
+    preload_models(summary_service, app.config['PRELOAD_MODELS'])
+
+def pdf_page_options(form):
+    """Optional first_page / last_page / max_pages form fields for PDF uploads"""
+    options = {}
+    for name in ('first_page', 'last_page', 'max_pages'):
+        if form.get(name):
+            options[name] = int(form[name])
+    return options
+
+def include_text(params):
+    """Whether a request asked for the extracted text (include_text=true)"""
+    return params.get('include_text', 'false').lower() == 'true'
+
+def request_document(data, field='text'):
+    """
+    Document a JSON request refers to
+    
+    Requests either carry the text itself or a document_id from the
+    document store, which also knows the document's language and word
+    count. Everything else is analysed on first use, once per request.
+    
+    Returns:
+        Document (its text is empty when the request has none)
+    """
+    document_id = data.get('document_id')
+    if document_id:
+        return Document.from_stored(document_store.require(document_id), language_detector)
+    return Document(data.get(field, ''), language_detector=language_detector)
+
 @app.route('/api/summarize', methods=['POST'])
 def summarize():
     """Summarize text with multilingual support"""
     try:
         data = request.get_json()
-        text = data.get('text', '')
+        document = request_document(data)
         method = data.get('method', 'transformer')
         max_length = data.get('max_length', 150)
         min_length = data.get('min_length', 50)
         target_lang = data.get('target_lang', 'auto')  # NEW: target language
         multilingual_mode = data.get('multilingual_mode', 'translate')  # NEW
         
-        if not text:
+        if not document.text:
             return jsonify({'error': 'No text provided'}), 400
         
-        # Detect language
-        detected_lang = language_detector.detect_language(text)
-        detected_lang_name = language_detector.get_language_name(detected_lang)
-        
-        # If target language is auto, use detected language
-        if target_lang == 'auto':
-            target_lang = detected_lang
-        
-        # Use multilingual summarizer if needed
-        if detected_lang != 'en' or target_lang != 'en':
-            result = multilingual_summarizer.summarize_multilingual(
-                text,
-                target_lang=target_lang,
-                method=multilingual_mode,
-                max_length=max_length,
-                min_length=min_length
-            )
-            
-            return jsonify({
-                'summary': result['summary'],
-                'original_length': result['original_length'],
-                'summary_length': result['summary_length'],
-                'compression_ratio': f"{(result['summary_length'] / result['original_length'] * 100):.1f}%",
-                'source_language': result['source_language'],
-                'source_language_name': result['source_language_name'],
-                'target_language': result['target_language'],
-                'target_language_name': result['target_language_name'],
-                'detected_language': detected_lang,
-                'detected_language_name': detected_lang_name
-            })
-        else:
-            # Standard English summarization
-            summary = summarizer.summarize(
-                text, 
-                method=method,
-                max_length=max_length,
-                min_length=min_length
-            )
-            
-            return jsonify({
-                'summary': summary,
-                'original_length': len(text.split()),
-                'summary_length': len(summary.split()),
-                'compression_ratio': f"{(len(summary) / len(text) * 100):.1f}%",
-                'detected_language': detected_lang,
-                'detected_language_name': detected_lang_name,
-                'source_language': 'en',
-                'target_language': 'en'
-            })
+        return jsonify(summary_service.summarize(
+            document,
+            method=method,
+            max_length=max_length,
+            min_length=min_length,
+            target_lang=target_lang,
+            multilingual_mode=multilingual_mode
+        ))
     
+    except DocumentNotFound as e:
+        return jsonify({'error': str(e)}), 404
     except Exception as e:
         logging.error(f"Error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/summarize/stream', methods=['POST'])
+def summarize_stream():
+    """Summarize text, streaming stage events and summary tokens as NDJSON"""
+    try:
+        data = request.get_json()
+        document = request_document(data)
+        
+        if not document.text:
+            return jsonify({'error': 'No text provided'}), 400
+        
+        events = summary_service.stream(
+            document,
+            method=data.get('method', 'transformer'),
+            max_length=data.get('max_length', 150),
+            min_length=data.get('min_length', 50),
+            target_lang=data.get('target_lang', 'auto'),
+            multilingual_mode=data.get('multilingual_mode', 'translate')
+        )
+        
+        return Response(
+            stream_with_context(to_ndjson(events)),
+            mimetype='application/x-ndjson',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'  # Keep nginx from buffering the stream
+            }
+        )
+    
+    except DocumentNotFound as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        logging.error(f"Stream error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/summarize/batch', methods=['POST'])
+def summarize_batch():
+    """Summarize many texts, streaming one NDJSON result line per item as it finishes"""
+    try:
+        if 'file' in request.files:
+            items = parse_ndjson_items(request.files['file'].stream)
+        elif request.is_json:
+            items = parse_json_items(request.get_json())
+        else:
+            items = parse_ndjson_items(request.get_data().splitlines())
+        
+        if not items:
+            return jsonify({'error': 'No items provided'}), 400
+        
+        max_items = app.config['BULK_MAX_ITEMS']
+        if len(items) > max_items:
+            return jsonify({'error': f'Too many items ({len(items)}). Maximum is {max_items}'}), 400
+        
+        return Response(
+            stream_with_context(to_ndjson(bulk_summarizer.run(items))),
+            mimetype='application/x-ndjson',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'
+            }
+        )
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except RequestEntityTooLarge as e:
+        return jsonify({'error': e.description}), 413
+    except Exception as e:
+        logging.error(f"Batch error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/translate', methods=['POST'])
 def translate():
     """Translate text between languages"""
     try:
         data = request.get_json()
-        text = data.get('text', '')
+        document = request_document(data)
+        text = document.raw_text
         target_lang = data.get('target_lang', 'en')
         source_lang = data.get('source_lang', 'auto')
         
-        if not text:
+        if not document.text:
             return jsonify({'error': 'No text provided'}), 400
         
+        # Stored documents already know their language
+        if source_lang == 'auto' and document.known_language:
+            source_lang = document.known_language
+        
         translated = translator.translate(text, target_lang, source_lang)
         
         # Detect source if auto
@@ -114,13 +227,15 @@ def translate():
             'target_language': target_lang
         })
     
+    except DocumentNotFound as e:
+        return jsonify({'error': str(e)}), 404
     except Exception as e:
         logging.error(f"Translation error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/detect-language', methods=['POST'])
 def detect_language():
-    """Detect language of input text"""
+    """Detect language of input text, optionally segment by segment"""
     try:
         data = request.get_json()
         text = data.get('text', '')
@@ -128,14 +243,23 @@ def detect_language():
         if not text:
             return jsonify({'error': 'No text provided'}), 400
         
-        lang_code = language_detector.detect_language(text)
+        detection = language_detector.detect_with_confidence(text)
+        lang_code = detection['language']
         lang_name = language_detector.get_language_name(lang_code)
         
-        return jsonify({
+        response = {
             'language_code': lang_code,
             'language_name': lang_name,
+            'confidence': detection['confidence'],
+            'sampled_chars': detection['sampled_chars'],
             'is_supported': language_detector.is_supported(lang_code)
-        })
+        }
+        if data.get('segments'):
+            response['segments'] = [
+                dict(segment, language_name=language_detector.get_language_name(segment['language']))
+                for segment in language_detector.detect_segments(text)
+            ]
+        return jsonify(response)
     
     except Exception as e:
         logging.error(f"Detection error: {str(e)}")
@@ -162,24 +286,35 @@ def upload_file():
             return jsonify({'error': 'No file uploaded'}), 400
         
         file = request.files['file']
-        file_handler.validate_file(file)
-        text = file_handler.extract_text(file, file.filename)
+        file_handler.validate_file(file, max_size=app.config['MAX_UPLOAD_MB'] * 1024 * 1024)
+        text = file_handler.extract_text(
+            file,
+            file.filename,
+            pdf_workers=app.config['PDF_EXTRACT_WORKERS'],
+            **pdf_page_options(request.form)
+        )
         
         if not text or len(text.strip()) == 0:
             return jsonify({'error': 'No text could be extracted from the file'}), 400
         
-        # Detect language
-        detected_lang = language_detector.detect_language(text)
-        detected_lang_name = language_detector.get_language_name(detected_lang)
+        # Language detection and other metadata happen once, in the store
+        document = document_store.add(text, filename=file.filename, sha256=upload_sha256(file))
         
-        return jsonify({
-            'text': text,
+        response = {
+            'document_id': document.id,
             'filename': file.filename,
-            'word_count': len(text.split()),
-            'detected_language': detected_lang,
-            'detected_language_name': detected_lang_name
-        })
+            'sha256': document.metadata['sha256'],
+            'word_count': document.word_count,
+            'detected_language': document.language,
+            'detected_language_name': document.metadata['language_name']
+        }
+        # The text can be large; clients fetch it by document_id when they need it
+        if include_text(request.form):
+            response['text'] = text
+        return jsonify(response)
     
+    except RequestEntityTooLarge as e:
+        return jsonify({'error': e.description}), 413
     except Exception as e:
         logging.error(f"Upload error: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -196,78 +331,248 @@ def summarize_file():
         max_length = int(request.form.get('max_length', 150))
         min_length = int(request.form.get('min_length', 50))
         target_lang = request.form.get('target_lang', 'auto')
+        multilingual_mode = request.form.get('multilingual_mode', 'translate')
         
-        file_handler.validate_file(file)
-        text = file_handler.extract_text(file, file.filename)
+        file_handler.validate_file(file, max_size=app.config['MAX_UPLOAD_MB'] * 1024 * 1024)
+        text = file_handler.extract_text(
+            file,
+            file.filename,
+            pdf_workers=app.config['PDF_EXTRACT_WORKERS'],
+            **pdf_page_options(request.form)
+        )
         
         if not text or len(text.strip()) == 0:
             return jsonify({'error': 'No text could be extracted from the file'}), 400
         
-        # Detect language
-        detected_lang = language_detector.detect_language(text)
-        
-        # Use appropriate summarizer
-        if detected_lang != 'en' or target_lang != 'auto':
-            if target_lang == 'auto':
-                target_lang = detected_lang
-                
-            result = multilingual_summarizer.summarize_multilingual(
-                text,
-                target_lang=target_lang,
-                max_length=max_length,
-                min_length=min_length
-            )
-            summary = result['summary']
-        else:
-            summary = summarizer.summarize(
-                text,
-                method=method,
-                max_length=max_length,
-                min_length=min_length
-            )
+        stored = document_store.add(text, filename=file.filename, sha256=upload_sha256(file))
+        document = Document.from_stored(stored, language_detector)
+        result = summary_service.summarize(
+            document,
+            method=method,
+            max_length=max_length,
+            min_length=min_length,
+            target_lang=target_lang,
+            multilingual_mode=multilingual_mode
+        )
+        summary = result['summary']
+        detected_lang = result['detected_language']
         
-        return jsonify({
+        response = {
+            'document_id': stored.id,
             'summary': summary,
-            'original_text': text,
-            'original_length': len(text.split()),
+            'original_length': document.word_count,
             'summary_length': len(summary.split()),
-            'compression_ratio': f"{(len(summary) / len(text) * 100):.1f}%",
+            'compression_ratio': f"{(len(summary) / document.char_count * 100):.1f}%",
             'filename': file.filename,
             'detected_language': detected_lang
-        })
+        }
+        if include_text(request.form):
+            response['original_text'] = text
+        return jsonify(response)
     
+    except RequestEntityTooLarge as e:
+        return jsonify({'error': e.description}), 413
     except Exception as e:
         logging.error(f"Summarize file error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/jobs/summarize-file', methods=['POST'])
+def submit_file_job():
+    """Queue a file for background summarization and return its job id"""
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file uploaded'}), 400
+        
+        file = request.files['file']
+        file_handler.validate_file(file, max_size=app.config['MAX_UPLOAD_MB'] * 1024 * 1024)
+        
+        job_id = job_manager.submit_file(file, file.filename, {
+            'method': request.form.get('method', 'transformer'),
+            'max_length': int(request.form.get('max_length', 150)),
+            'min_length': int(request.form.get('min_length', 50)),
+            'target_lang': request.form.get('target_lang', 'auto'),
+            'multilingual_mode': request.form.get('multilingual_mode', 'translate'),
+            **pdf_page_options(request.form)
+        })
+        
+        return jsonify({
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': f'/api/jobs/{job_id}'
+        }), 202
+    
+    except RequestEntityTooLarge as e:
+        return jsonify({'error': e.description}), 413
+    except Exception as e:
+        logging.error(f"Job submit error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Poll a job's stage, progress and result"""
+    try:
+        job = job_manager.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(job)
+    
+    except Exception as e:
+        logging.error(f"Job status error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>/download', methods=['GET'])
+def download_job_report(job_id):
+    """Download the PDF rendered by a background report job"""
+    try:
+        path = job_manager.report_path(job_id)
+        if path is None:
+            return jsonify({'error': 'Report not found or not ready'}), 404
+        
+        return send_file(
+            path,
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=f'summary_{job_id[:8]}.pdf'
+        )
+    
+    except Exception as e:
+        logging.error(f"Report download error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    try:
+        job = job_manager.cancel(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(job)
+    
+    except Exception as e:
+        logging.error(f"Job cancel error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/documents', methods=['POST'])
+def create_document():
+    """Store text server-side and return its document_id and metadata"""
+    try:
+        data = request.get_json()
+        text = data.get('text', '')
+        
+        if not text:
+            return jsonify({'error': 'No text provided'}), 400
+        
+        document = document_store.add(text, filename=data.get('filename'))
+        return jsonify(document.to_dict()), 201
+    
+    except Exception as e:
+        logging.error(f"Document store error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/documents/<document_id>', methods=['GET'])
+def get_document(document_id):
+    """Document metadata; add ?include_text=true for the text and sentence spans"""
+    try:
+        document = document_store.require(document_id)
+        return jsonify(document.to_dict(include_text=include_text(request.args)))
+    
+    except DocumentNotFound as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        logging.error(f"Document fetch error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/documents/<document_id>', methods=['DELETE'])
+def delete_document(document_id):
+    """Remove a stored document"""
+    try:
+        if not document_store.delete(document_id):
+            return jsonify({'error': 'Document not found'}), 404
+        return jsonify({'deleted': document_id})
+    
+    except Exception as e:
+        logging.error(f"Document delete error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/download-pdf', methods=['POST'])
 def download_pdf():
     """Generate and download PDF with summary"""
     try:
         data = request.get_json()
-        original_text = data.get('original_text', '')
+        original = request_document(data, field='original_text')
+        original_text = original.raw_text
         summary = data.get('summary', '')
         stats = data.get('stats', {})
         
         if not summary:
             return jsonify({'error': 'No summary provided'}), 400
         
-        pdf_data = file_handler.generate_pdf(original_text, summary, stats)
+        background = data.get('background', False)
+        if background or original.word_count >= app.config['REPORT_BACKGROUND_MIN_WORDS']:
+            job_id = job_manager.submit_report(original_text, summary, stats)
+            return jsonify({
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f'/api/jobs/{job_id}'
+            }), 202
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f'summary_{timestamp}.pdf'
         
-        return send_file(
-            BytesIO(pdf_data),
+        return Response(
+            stream_with_context(file_handler.stream_pdf(original_text, summary, stats)),
             mimetype='application/pdf',
-            as_attachment=True,
-            download_name=filename
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
         )
     
+    except DocumentNotFound as e:
+        return jsonify({'error': str(e)}), 404
     except Exception as e:
         logging.error(f"PDF generation error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Summary cache hit, miss and eviction counters"""
+    try:
+        return jsonify(summary_cache.get_stats())
+    except Exception as e:
+        logging.error(f"Cache stats error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/translation-memory/stats', methods=['GET'])
+def translation_memory_stats():
+    """Translation memory hit rate, size and evictions"""
+    try:
+        if translator.memory is None:
+            return jsonify({'enabled': False})
+        return jsonify(dict(translator.memory.get_stats(), enabled=True))
+    except Exception as e:
+        logging.error(f"Translation memory stats error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/models', methods=['GET'])
+def model_stats():
+    """Loaded models and their memory use"""
+    try:
+        return jsonify(model_registry.get_stats())
+    except Exception as e:
+        logging.error(f"Model stats error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/memory', methods=['GET'])
+def memory_stats():
+    """Shared and unique memory of the gunicorn master and each worker"""
+    try:
+        master_pid = os.environ.get(MASTER_PID_ENV)
+        report = memory_report(int(master_pid) if master_pid else None)
+        report['preloaded_models'] = app.config['PRELOAD_MODELS']
+        report['mmap_weights'] = app.config['MMAP_WEIGHTS']
+        return jsonify(report)
+    except Exception as e:
+        logging.error(f"Memory stats error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/health', methods=['GET'])
 def health():
     return jsonify({'status': 'healthy'})
@@ -0,0 +1,199 @@
+"""
+Dynamic micro-batching for transformer inference
+"""
+
+from concurrent.futures import Future
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingRequest:
+    """One caller waiting for a generation result"""
+
+    __slots__ = ('text', 'max_length', 'min_length', 'input_length', 'options', 'future')
+
+    def __init__(self, text, max_length, min_length, input_length, options):
+        self.text = text
+        self.max_length = max_length
+        self.min_length = min_length
+        self.input_length = input_length
+        self.options = options
+        self.future = Future()
+
+
+class BatchScheduler:
+    """
+    Collect concurrent generation requests and run them as padded batches
+
+    Requests arriving within max_wait_ms of each other are grouped by their
+    (max_length, min_length) pair and any generation options (e.g. the
+    mBART target language), sorted by input length and cut into batches of
+    similar length so padding stays small. Each result is routed back to
+    its caller through a Future.
+    """
+
+    def __init__(self, generate_batch, max_wait_ms=20, max_batch_size=8, length_ratio=2.0, name='bart', result_timeout=600):
+        """
+        Args:
+            generate_batch: Callable(texts, max_length, min_length, **options) -> list of summaries
+            max_wait_ms: How long to hold the first request while collecting more
+            max_batch_size: Largest batch handed to generate_batch
+            length_ratio: Longest/shortest input length allowed in one batch
+            name: Model name for the worker thread
+            result_timeout: Seconds summarize() waits for its result
+        """
+        self.generate_batch = generate_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self.length_ratio = length_ratio
+        self.name = name
+        self.result_timeout = result_timeout
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+        self.batches_run = 0
+        self.requests_served = 0
+
+    def _ensure_worker(self):
+        """Start the worker thread on first use (after any gunicorn fork)"""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name=f'{self.name}-batch-scheduler',
+                    daemon=True
+                )
+                self._worker.start()
+
+    def submit(self, text, max_length, min_length, input_length=None, **options):
+        """
+        Queue a text for summarization
+
+        Args:
+            text: Input handed to generate_batch
+            input_length: Length used to bucket batches (default: word count)
+            options: Passed on to generate_batch; only requests with equal
+                options share a batch
+
+        Returns:
+            Future resolving to the summary text
+        """
+        if input_length is None:
+            input_length = len(text.split())
+        request = _PendingRequest(text, max_length, min_length, input_length, options)
+        self._ensure_worker()
+        self._queue.put(request)
+        return request.future
+
+    def summarize(self, text, max_length, min_length, input_length=None, **options):
+        """
+        Submit and block until the summary is ready
+
+        Raises:
+            concurrent.futures.TimeoutError after result_timeout seconds
+        """
+        future = self.submit(text, max_length, min_length, input_length, **options)
+        return future.result(timeout=self.result_timeout)
+
+    def _collect(self):
+        """Block for one request, then gather whatever arrives within max_wait"""
+        pending = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        # Gather a few batches' worth so length bucketing has something to sort
+        while len(pending) < self.max_batch_size * 4:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return pending
+
+    def _plan(self, pending):
+        """Split pending requests into compatible, length-bucketed batches"""
+        groups = {}
+        for request in pending:
+            key = (request.max_length, request.min_length, tuple(sorted(request.options.items())))
+            groups.setdefault(key, []).append(request)
+
+        batches = []
+        for (max_length, min_length, _), requests in groups.items():
+            requests.sort(key=lambda r: r.input_length)
+            batch = []
+            for request in requests:
+                if batch and (
+                    len(batch) >= self.max_batch_size or
+                    request.input_length > max(batch[0].input_length, 1) * self.length_ratio
+                ):
+                    batches.append((max_length, min_length, batch))
+                    batch = []
+                batch.append(request)
+            if batch:
+                batches.append((max_length, min_length, batch))
+        return batches
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            try:
+                for max_length, min_length, batch in self._plan(pending):
+                    self._execute(max_length, min_length, batch)
+            except Exception as e:
+                # Keep the worker alive; nobody in the drained requests may be left waiting
+                logger.error(f"Batch scheduler error: {e}")
+                self._fail(pending, e)
+
+    @staticmethod
+    def _fail(requests, error):
+        """Set error on every request whose future is not resolved yet"""
+        for request in requests:
+            if request.future.done():
+                continue
+            if request.future.running() or request.future.set_running_or_notify_cancel():
+                request.future.set_exception(error)
+
+    def _execute(self, max_length, min_length, batch):
+        live = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if not live:
+            return
+
+        try:
+            summaries = list(self.generate_batch(
+                [request.text for request in live],
+                max_length,
+                min_length,
+                **live[0].options
+            ))
+            if len(summaries) != len(live):
+                raise Exception(f"generate_batch returned {len(summaries)} results for {len(live)} requests")
+        except Exception as e:
+            logger.error(f"Batched generation failed ({len(live)} requests): {e}")
+            self._fail(live, e)
+            return
+
+        self.batches_run += 1
+        self.requests_served += len(live)
+        logger.debug(f"Ran batch of {len(live)} (max_length={max_length}, min_length={min_length})")
+
+        for request, summary in zip(live, summaries):
+            request.future.set_result(summary)
+
+    def get_stats(self):
+        """Scheduler counters"""
+        return {
+            'batches_run': self.batches_run,
+            'requests_served': self.requests_served,
+            'average_batch_size': (
+                self.requests_served / self.batches_run if self.batches_run else 0.0
+            ),
+            'queued': self._queue.qsize()
+        }
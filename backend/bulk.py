@@ -0,0 +1,294 @@
+"""
+Bulk summarization: many documents per request, results streamed as they finish
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+import json
+import logging
+import multiprocessing
+import threading
+
+from cache import make_cache_key
+from document import Document
+from extractive import default_sentence_count
+
+logger = logging.getLogger(__name__)
+
+ITEM_OPTIONS = ('method', 'max_length', 'min_length', 'target_lang', 'multilingual_mode')
+DEFAULT_OPTIONS = {
+    'method': 'transformer',
+    'max_length': 150,
+    'min_length': 50,
+    'target_lang': 'auto',
+    'multilingual_mode': 'translate'
+}
+# Longest summary an item may ask for; the summarization models cap out at 1024 tokens
+LENGTH_LIMIT = 1024
+
+
+def parse_json_items(payload):
+    """
+    Read items from a JSON body
+
+    Accepts a bare array of items or {"items": [...], "options": {...}}
+    where options are defaults for every item. An item is either a string
+    or an object with 'text' and optional 'id' and per-item options.
+    """
+    defaults = {}
+    if isinstance(payload, dict):
+        defaults = payload.get('options') or {}
+        payload = payload.get('items')
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON array of items or an object with an 'items' array")
+    return [_normalize_item(item, defaults) for item in payload]
+
+
+def parse_ndjson_items(lines):
+    """Read one item per non-empty line of NDJSON (bytes or str lines)"""
+    items = []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            items.append(_normalize_item(json.loads(line), {}))
+        except json.JSONDecodeError as e:
+            items.append({'error': f"Invalid JSON: {e}"})
+    return items
+
+
+def _normalize_item(item, defaults):
+    if isinstance(item, str):
+        item = {'text': item}
+    if not isinstance(item, dict):
+        return {'error': 'Item must be a string or an object'}
+    normalized = dict(DEFAULT_OPTIONS)
+    normalized.update({k: v for k, v in defaults.items() if k in ITEM_OPTIONS})
+    normalized.update({k: v for k, v in item.items() if k in ITEM_OPTIONS})
+    normalized['id'] = item.get('id')
+    normalized['text'] = item.get('text', '')
+    try:
+        normalized['max_length'] = _length_option(normalized['max_length'], 'max_length', 1, LENGTH_LIMIT)
+        normalized['min_length'] = _length_option(normalized['min_length'], 'min_length', 0, normalized['max_length'])
+    except ValueError as e:
+        return {'id': normalized['id'], 'error': str(e)}
+    return normalized
+
+
+def _length_option(value, name, lowest, highest):
+    """Coerce a length option to an int in [lowest, highest] or raise ValueError"""
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be an integer")
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+    if not lowest <= value <= highest:
+        raise ValueError(f"{name} must be between {lowest} and {highest}")
+    return value
+
+
+# Per-process extractive scorer for the process pool
+_scorer = None
+
+
+def _extractive_worker(texts, scorer_name):
+    """Process-pool entry point: extractive summaries for a list of texts"""
+    global _scorer
+    # NLTK_DATA set by nltk_support.configure is inherited from the parent
+    from nltk_support import sent_tokenize, stop_words
+    if _scorer is None:
+        from extractive import ExtractiveScorer
+        _scorer = ExtractiveScorer(stop_words('english'))
+
+    summaries = []
+    for text in texts:
+        sentences = sent_tokenize(text)
+        num_sentences = default_sentence_count(len(text.split()))
+        if len(sentences) <= num_sentences:
+            summaries.append(text)
+        else:
+            summaries.append(_scorer.summarize(sentences, num_sentences, scorer_name))
+    return summaries
+
+
+class BulkSummarizer:
+    """
+    Summarize many items at once
+
+    Items are grouped by language and method: English transformer items
+    with the same length settings share padded generate batches, English
+    extractive items are scored in a process pool, and everything else
+    goes through the multilingual path on a thread pool. Results are
+    yielded as soon as the group holding them finishes.
+    """
+
+    def __init__(self, service, batch_size=8, workers=4, extractive_processes=2, extractive_chunk=32):
+        """
+        Args:
+            service: SummaryService whose components do the work
+            batch_size: Texts per transformer generate call
+            workers: Threads running batches and multilingual items
+            extractive_processes: Processes for extractive scoring
+            extractive_chunk: Extractive texts sent to a process at a time
+        """
+        self.service = service
+        self.batch_size = batch_size
+        self.workers = workers
+        self.extractive_processes = extractive_processes
+        self.extractive_chunk = extractive_chunk
+        self._process_pool = None
+        self._lock = threading.Lock()
+
+    def _get_process_pool(self):
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.extractive_processes,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._process_pool
+
+    def run(self, items):
+        """
+        Summarize items, yielding one result dict per item as it completes
+
+        Each result carries the item's 'index' and 'id' plus either the
+        /api/summarize response fields or an 'error'. A failing item never
+        fails the rest of the batch.
+        """
+        service = self.service
+        transformer_groups = {}
+        extractive_items = []
+        multilingual_items = []
+
+        for index, item in enumerate(items):
+            item['index'] = index
+            if 'error' in item:
+                yield self._error(item, item['error'])
+                continue
+            if not item['text'] or not str(item['text']).strip():
+                yield self._error(item, 'No text provided')
+                continue
+            if item['method'] not in ('transformer', 'extractive'):
+                yield self._error(item, f"Invalid method: {item['method']}. Use 'transformer' or 'extractive'")
+                continue
+
+            cached = self._cache_get(item)
+            if cached is not None:
+                yield dict(cached, index=index, id=item['id'], cached=True)
+                continue
+
+            # Analysed once; the summarizers reuse the language and counts
+            item['document'] = Document(item['text'], language_detector=service.language_detector)
+            try:
+                item['detected_lang'] = item['document'].language
+            except Exception as e:
+                yield self._error(item, str(e))
+                continue
+
+            target_lang = item['target_lang']
+            if target_lang == 'auto':
+                target_lang = item['detected_lang']
+            item['resolved_target'] = target_lang
+
+            if item['detected_lang'] != 'en' or target_lang != 'en':
+                multilingual_items.append(item)
+            elif item['method'] == 'extractive':
+                extractive_items.append(item)
+            else:
+                key = (item['max_length'], item['min_length'])
+                transformer_groups.setdefault(key, []).append(item)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # future -> (items, submit); a failed group of several items is
+            # resubmitted one item at a time so only the bad item errors
+            futures = {}
+
+            def submit_transformer(batch, max_length, min_length):
+                future = pool.submit(
+                    service.summarizer.summarize_batch,
+                    [item['document'] for item in batch],
+                    max_length,
+                    min_length,
+                    self.batch_size
+                )
+                futures[future] = (batch, lambda retry: submit_transformer(retry, max_length, min_length))
+                return future
+
+            def submit_extractive(chunk):
+                future = self._get_process_pool().submit(
+                    _extractive_worker,
+                    [item['text'] for item in chunk],
+                    service.summarizer.extractive_scorer
+                )
+                futures[future] = (chunk, submit_extractive)
+                return future
+
+            for (max_length, min_length), group in transformer_groups.items():
+                group.sort(key=lambda item: len(item['text']))
+                for start in range(0, len(group), self.batch_size):
+                    submit_transformer(group[start:start + self.batch_size], max_length, min_length)
+
+            for start in range(0, len(extractive_items), self.extractive_chunk):
+                submit_extractive(extractive_items[start:start + self.extractive_chunk])
+
+            for item in multilingual_items:
+                future = pool.submit(
+                    service.multilingual_summarizer.summarize_multilingual,
+                    item['document'],
+                    target_lang=item['resolved_target'],
+                    method=item['multilingual_mode'],
+                    max_length=item['max_length'],
+                    min_length=item['min_length']
+                )
+                futures[future] = (item, None)
+
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    owner, submit = futures.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        if submit is not None and len(owner) > 1:
+                            logger.warning(f"Bulk group of {len(owner)} failed, retrying items one by one: {e}")
+                            pending.update(submit([item]) for item in owner)
+                            continue
+                        logger.error(f"Bulk summarization failed: {e}")
+                        for item in owner if isinstance(owner, list) else [owner]:
+                            yield self._error(item, str(e))
+                        continue
+
+                    if isinstance(owner, list):
+                        for item, summary in zip(owner, outcome):
+                            yield self._finish(item, service.english_response(
+                                item['document'], summary, item['detected_lang']
+                            ))
+                    else:
+                        yield self._finish(owner, service.multilingual_response(
+                            outcome, owner['detected_lang']
+                        ))
+
+    def _cache_key(self, item):
+        return make_cache_key(
+            item['text'], item['method'], item['max_length'], item['min_length'],
+            item['target_lang'], item['multilingual_mode'], self.service.model_id
+        )
+
+    def _cache_get(self, item):
+        if self.service.cache is None:
+            return None
+        return self.service.cache.get(self._cache_key(item))
+
+    def _finish(self, item, response):
+        if self.service.cache is not None:
+            self.service.cache.set(self._cache_key(item), response)
+        return dict(response, index=item['index'], id=item['id'])
+
+    @staticmethod
+    def _error(item, message):
+        return {'index': item['index'], 'id': item.get('id'), 'error': message}
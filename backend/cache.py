@@ -0,0 +1,315 @@
+"""
+Content-addressed result cache with an in-process LRU tier and an optional SQLite disk tier
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# The disk tier re-reads its true size (other workers write to it too) at
+# least this often; in between it adds up the sizes this process wrote
+EVICT_CHECK_INTERVAL = 64
+# Rows removed per eviction statement
+EVICT_BATCH = 256
+
+
+def make_cache_key(text, method, max_length, min_length, target_lang, multilingual_mode, model_id):
+    """
+    Hash the request parameters that determine a summary
+
+    Whitespace is collapsed so trivially different copies of the same text share an entry.
+    """
+    normalized = ' '.join(text.split())
+    payload = json.dumps(
+        [normalized, method, max_length, min_length, target_lang, multilingual_mode, model_id],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class MemoryCache:
+    """Thread-safe LRU with per-entry TTL and a byte budget"""
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, size, value = entry
+            if expires_at < time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, size, timeout):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time() + timeout, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'evictions': self.evictions
+            }
+
+
+class DiskCache:
+    """
+    SQLite-backed tier that survives restarts
+
+    The database runs in WAL mode so several gunicorn workers can share one file.
+    """
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._bytes = None  # estimated table size since the last check
+        self._writes = 0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+
+    def _connect(self):
+        """One connection per thread and per process (connections must not cross a fork)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        now = time.time()
+        if expires_at < now:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(value)
+
+    def set(self, key, encoded, timeout):
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, encoded, len(encoded), now + timeout, now)
+        )
+        self._evict(conn, now, len(encoded))
+
+    def _evict(self, conn, now, added):
+        """
+        Drop expired rows, then least recently used rows until under the byte budget
+
+        The table is only summed every EVICT_CHECK_INTERVAL writes or when
+        the running estimate goes over budget.
+        """
+        self._writes += 1
+        if self._bytes is not None:
+            self._bytes += added
+            if self._bytes <= self.max_bytes and self._writes % EVICT_CHECK_INTERVAL:
+                return
+        conn.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        while total > self.max_bytes:
+            sizes = [size for (size,) in conn.execute(
+                "SELECT size FROM entries ORDER BY accessed_at LIMIT ?", (EVICT_BATCH,)
+            )]
+            if not sizes:
+                break
+            count = 0
+            for size in sizes:
+                total -= size
+                count += 1
+                if total <= self.max_bytes:
+                    break
+            conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed_at LIMIT ?)",
+                (count,)
+            )
+            self.evictions += count
+        self._bytes = total
+
+    def clear(self):
+        self._connect().execute("DELETE FROM entries")
+        self._bytes = 0
+
+    def get_stats(self):
+        entries, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return {
+            'path': self.path,
+            'entries': entries,
+            'bytes': size,
+            'evictions': self.evictions
+        }
+
+
+class SummaryCache:
+    """Two-tier cache for summarization results"""
+
+    def __init__(
+        self,
+        enabled=True,
+        cache_type='simple',
+        default_timeout=300,
+        max_entries=1024,
+        max_bytes=64 * 1024 * 1024,
+        disk_path=None,
+        disk_max_bytes=512 * 1024 * 1024
+    ):
+        """
+        Args:
+            enabled: When False every lookup misses and nothing is stored
+            cache_type: 'simple' for memory only, 'disk' to add the SQLite tier
+            default_timeout: TTL in seconds
+            max_entries: Memory tier entry limit
+            max_bytes: Memory tier byte budget
+            disk_path: SQLite file for the disk tier
+            disk_max_bytes: Disk tier byte budget
+        """
+        self.enabled = enabled
+        self.default_timeout = default_timeout
+        self.memory = MemoryCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.disk = None
+        if enabled and cache_type == 'disk':
+            self.disk = DiskCache(
+                disk_path or os.path.join(tempfile.gettempdir(), 'text-summarizer', 'summaries.sqlite3'),
+                max_bytes=disk_max_bytes
+            )
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value or None"""
+        if not self.enabled:
+            return None
+
+        value = self.memory.get(key)
+        if value is not None:
+            self._count(hit=True)
+            return value
+
+        if self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except sqlite3.Error as e:
+                logger.error(f"Disk cache read failed: {e}")
+                value = None
+            if value is not None:
+                self._count(hit=True, disk=True)
+                self.memory.set(key, value, len(json.dumps(value)), self.default_timeout)
+                return value
+
+        self._count(hit=False)
+        return None
+
+    def _count(self, hit, disk=False):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+                self.disk_hits += disk
+            else:
+                self.misses += 1
+
+    def set(self, key, value, timeout=None):
+        """Store a JSON-serializable value"""
+        if not self.enabled:
+            return
+        timeout = timeout or self.default_timeout
+        encoded = json.dumps(value, ensure_ascii=False)
+        self.memory.set(key, value, len(encoded), timeout)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, encoded, timeout)
+            except sqlite3.Error as e:
+                logger.error(f"Disk cache write failed: {e}")
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def get_stats(self):
+        """Hit, miss and eviction counters for both tiers"""
+        with self._stats_lock:
+            hits, misses, disk_hits = self.hits, self.misses, self.disk_hits
+        lookups = hits + misses
+        stats = {
+            'enabled': self.enabled,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'memory': self.memory.get_stats()
+        }
+        if self.disk is not None:
+            stats['disk'] = self.disk.get_stats()
+            stats['disk']['hits'] = disk_hits
+        return stats
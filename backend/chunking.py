@@ -0,0 +1,216 @@
+"""
+Script-aware sentence splitting and token-budgeted chunking
+
+Shared by the translation path (MultilingualSummarizer) and the
+summarization path (map-reduce in TextSummarizer). Sentences end at the
+terminators of every script LanguageDetector supports: Latin/Cyrillic
+'.!?' before whitespace, CJK '。！？', Devanagari/Bengali danda '।' '॥',
+Arabic '؟' and Urdu '۔', and at paragraph breaks. Everything runs in one
+pass over the text.
+"""
+
+import logging
+import math
+import re
+
+logger = logging.getLogger(__name__)
+
+# A sentence runs up to a terminator (with any closing quotes or brackets),
+# up to a paragraph break, or to the end
+SENTENCE_PATTERN = re.compile(
+    r'\S.*?(?:'
+    r'[.!?]+[)\]"\'’”»]*(?=\s)'
+    r'|[。．｡！？]+[」』）)"\'’”]*'
+    r'|[।॥؟۔]+[)"\'’”]*'
+    r'|(?=\n[^\S\n]*\n)'
+    r'|\Z)',
+    re.S
+)
+
+# Boundaries punkt (trained on English) does not know about
+SCRIPT_SENTENCE_PATTERN = re.compile(
+    r'\S.*?(?:'
+    r'[。．｡！？]+[」』）)"\'’”]*'
+    r'|[।॥؟۔]+[)"\'’”]*'
+    r'|(?=\n[^\S\n]*\n)'
+    r'|\Z)',
+    re.S
+)
+SCRIPT_BOUNDARY = re.compile(r'[。．｡！？।॥؟۔]|\n[^\S\n]*\n')
+
+# Places to break a sentence that is over the token budget on its own
+CLAUSE_BREAK = re.compile(r'[,;:，、；：]\s*|\s+')
+
+# Ideographs, kana and hangul: roughly one token per character
+CJK_CHAR = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]')
+# Other non-Latin scripts (Cyrillic to Indic and Thai): roughly a token per few characters
+NON_LATIN_CHAR = re.compile(r'[\u0400-\u0e7f]')
+
+
+def _trimmed_spans(pattern, text, start=0, end=None):
+    spans = []
+    end = len(text) if end is None else end
+    for match in pattern.finditer(text, start, end):
+        stop = match.end()
+        while stop > match.start() and text[stop - 1].isspace():
+            stop -= 1
+        spans.append((match.start(), stop))
+    return spans
+
+
+def sentence_spans(text):
+    """(start, end) character offsets of each sentence, trailing whitespace excluded"""
+    return _trimmed_spans(SENTENCE_PATTERN, text)
+
+
+def refine_spans(text, spans):
+    """
+    Split sentence spans (e.g. from punkt) at CJK, Indic and Arabic-script
+    terminators and at paragraph breaks
+    """
+    if not SCRIPT_BOUNDARY.search(text):
+        return spans
+    refined = []
+    for start, end in spans:
+        refined.extend(_trimmed_spans(SCRIPT_SENTENCE_PATTERN, text, start, end))
+    return refined
+
+
+def estimate_tokens(texts):
+    """
+    Rough subword count used when no tokenizer is available
+
+    Whitespace-separated words count 1.3 tokens each. CJK characters
+    count one each, because those scripts do not put spaces between words.
+    """
+    counts = []
+    for text in texts:
+        cjk = len(CJK_CHAR.findall(text))
+        non_latin = len(NON_LATIN_CHAR.findall(text))
+        counts.append(int(len(text.split()) * 1.3) + cjk + non_latin // 4 + 1)
+    return counts
+
+
+class TextChunker:
+    """
+    Pack whole sentences into chunks under a token budget
+
+    Sentences that are over the budget on their own are cut at clause
+    punctuation or whitespace (or, failing that, mid-text) instead of being
+    truncated later by the model. Consecutive chunks can share up to
+    overlap_tokens of trailing sentences for context.
+    """
+
+    def __init__(self, max_tokens=512, count_tokens=None, overlap_tokens=0):
+        """
+        Args:
+            max_tokens: Token budget per chunk
+            count_tokens: Callable(list of texts) -> list of counts, usually
+                the target model's tokenizer (default: estimate_tokens)
+            overlap_tokens: Tokens of context repeated from the previous
+                chunk (at most half the budget)
+        """
+        self.max_tokens = max(1, max_tokens)
+        self.count_tokens = count_tokens or estimate_tokens
+        self.overlap_tokens = max(0, min(overlap_tokens, self.max_tokens // 2))
+
+    def units(self, text):
+        """
+        Sentence spans and token counts, with oversized sentences split
+
+        Args:
+            text: String or Document (its memoized sentences and token
+                counts are reused)
+
+        Returns:
+            (document, list of (start, end), list of token counts)
+        """
+        from document import as_document
+
+        document = as_document(text)
+        spans = []
+        counts = []
+        for (start, end), tokens in zip(
+            document.sentence_spans, document.sentence_token_counts(self.count_tokens)
+        ):
+            if tokens <= self.max_tokens:
+                spans.append((start, end))
+                counts.append(tokens)
+                continue
+            pieces = self._split_long(document.text, start, end, tokens)
+            spans.extend(pieces)
+            # Tokens are spread over the pieces by length
+            counts.extend(max(1, tokens * (b - a) // (end - start)) for a, b in pieces)
+        return document, spans, counts
+
+    def _split_long(self, text, start, end, tokens):
+        """Cut one sentence into roughly equal pieces that each fit the budget"""
+        parts = math.ceil(tokens / (self.max_tokens * 0.9))
+        target = max(1, (end - start) // parts)
+        pieces = []
+        position = start
+        while end - position > target:
+            limit = position + target
+            cut = None
+            # Last clause break in the second half of the window
+            for match in CLAUSE_BREAK.finditer(text, position + target // 2, limit):
+                cut = match.end()
+            cut = cut or limit
+            pieces.append((position, cut))
+            position = cut
+            while position < end and text[position].isspace():
+                position += 1
+        if position < end:
+            pieces.append((position, end))
+        trimmed = []
+        for a, b in pieces:
+            while b > a and text[b - 1].isspace():
+                b -= 1
+            if b > a:
+                trimmed.append((a, b))
+        return trimmed
+
+    def chunk_spans(self, text):
+        """
+        Chunk boundaries in the (normalized) text
+
+        Returns:
+            List of (start, end, tokens)
+        """
+        document, spans, counts = self.units(text)
+        chunks = []
+        first = 0
+        while first < len(spans):
+            last = first
+            total = 0
+            while last < len(spans) and (last == first or total + counts[last] <= self.max_tokens):
+                total += counts[last]
+                last += 1
+            chunks.append((spans[first][0], spans[last - 1][1], total))
+            if last == len(spans):
+                break
+            # The next chunk starts with the trailing sentences that fit the overlap
+            next_first = last
+            repeated = 0
+            while next_first - 1 > first and repeated + counts[next_first - 1] <= self.overlap_tokens:
+                next_first -= 1
+                repeated += counts[next_first]
+            first = next_first
+        return chunks
+
+    def chunk(self, text):
+        """
+        Split text into chunks under the token budget
+
+        Chunks are slices of the normalized text, so the original spacing
+        between sentences (none in CJK text) is kept.
+
+        Returns:
+            List of chunk strings
+        """
+        from document import as_document
+
+        document = as_document(text)
+        chunks = [document.text[start:end] for start, end, _ in self.chunk_spans(document)]
+        logger.info(f"Split into {len(chunks)} chunks of at most {self.max_tokens} tokens")
+        return chunks
@@ -0,0 +1,156 @@
+"""
+Text analysed once per request and shared by every stage that needs it
+"""
+
+from functools import cached_property
+import logging
+import re
+import unicodedata
+
+from chunking import refine_spans, sentence_spans as script_sentence_spans
+import nltk_support
+
+logger = logging.getLogger(__name__)
+
+HORIZONTAL_SPACE = re.compile(r'[^\S\n]+')
+SPACE_AROUND_NEWLINE = re.compile(r' ?\n ?')
+BLANK_LINES = re.compile(r'\n{3,}')
+
+_warned_no_punkt = False
+
+
+def normalize_text(text):
+    """
+    NFC-normalize text and tidy its whitespace
+
+    Runs of spaces and tabs become one space and line endings become '\\n'.
+    Paragraph breaks are kept, at most one blank line each.
+    """
+    if not unicodedata.is_normalized('NFC', text):
+        text = unicodedata.normalize('NFC', text)
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = HORIZONTAL_SPACE.sub(' ', text)
+    text = SPACE_AROUND_NEWLINE.sub('\n', text)
+    return BLANK_LINES.sub('\n\n', text).strip()
+
+
+class Document:
+    """
+    Analysis of one input text, computed lazily and memoized
+
+    The normalized text, word count, sentence spans, language and token
+    counts are each worked out on first use and then reused, so the API
+    layer, TextSummarizer and MultilingualSummarizer never repeat a pass
+    over a large text. Summarizer methods accept a Document or a plain
+    string (see as_document).
+    """
+
+    def __init__(self, text, language=None, language_detector=None, word_count=None):
+        """
+        Args:
+            text: Raw input text
+            language: Language code when already known (skips detection)
+            language_detector: LanguageDetector used if language is needed
+            word_count: Word count when already known
+        """
+        self.raw_text = text or ''
+        self.language_detector = language_detector
+        if language is not None:
+            self.__dict__['language'] = language
+        if word_count is not None:
+            self.__dict__['word_count'] = word_count
+        self._token_counts = {}
+
+    @classmethod
+    def from_stored(cls, stored, language_detector=None):
+        """Document for a document_store entry, reusing the metadata computed when it was stored"""
+        return cls(
+            stored.text,
+            language=stored.language,
+            language_detector=language_detector,
+            word_count=stored.word_count
+        )
+
+    @cached_property
+    def text(self):
+        """Normalized text; this is what the models see"""
+        return normalize_text(self.raw_text)
+
+    @cached_property
+    def word_count(self):
+        return len(self.text.split())
+
+    @cached_property
+    def char_count(self):
+        return len(self.text)
+
+    @cached_property
+    def sentence_spans(self):
+        """
+        (start, end) offsets of each sentence in self.text
+
+        Punkt when its data is installed, split further at CJK, Indic and
+        Arabic-script terminators; otherwise the script-aware splitter the
+        document store uses (see chunking).
+        """
+        global _warned_no_punkt
+        try:
+            return refine_spans(self.text, nltk_support.sentence_spans(self.text))
+        except LookupError as e:
+            if not _warned_no_punkt:
+                _warned_no_punkt = True
+                logger.warning(f"Splitting sentences without punkt: {e}")
+            return script_sentence_spans(self.text)
+
+    @cached_property
+    def sentences(self):
+        return [self.text[start:end] for start, end in self.sentence_spans]
+
+    @cached_property
+    def sentence_word_counts(self):
+        return [len(sentence.split()) for sentence in self.sentences]
+
+    @cached_property
+    def language(self):
+        """Detected language code (detected on first access)"""
+        if self.language_detector is None:
+            raise Exception("Document language is unknown and no language detector was given")
+        return self.language_detector.detect_language(self.text)
+
+    @property
+    def known_language(self):
+        """The language if it was given or already detected, else None (never detects)"""
+        return self.__dict__.get('language')
+
+    def sentence_token_counts(self, count_tokens):
+        """
+        Token count of every sentence
+
+        Args:
+            count_tokens: Callable(list of texts) -> list of counts; results
+                are memoized per callable, so each tokenizer runs once
+        """
+        counts = self._token_counts.get(count_tokens)
+        if counts is None:
+            counts = self._token_counts[count_tokens] = list(count_tokens(self.sentences))
+        return counts
+
+    def token_count(self, count_tokens):
+        """Tokens in the whole text, as the sum over its sentences"""
+        return sum(self.sentence_token_counts(count_tokens))
+
+
+def as_document(text, language=None, language_detector=None):
+    """
+    Return text as a Document
+
+    A Document is passed through (taking the language or detector if it
+    has none yet); a string is wrapped in a new one.
+    """
+    if isinstance(text, Document):
+        if language is not None and text.known_language is None:
+            text.__dict__['language'] = language
+        if text.language_detector is None:
+            text.language_detector = language_detector
+        return text
+    return Document(text, language=language, language_detector=language_detector)
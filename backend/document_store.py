@@ -0,0 +1,293 @@
+"""
+Server-side store for extracted documents, referenced by document_id
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from chunking import sentence_spans
+
+logger = logging.getLogger(__name__)
+
+# Documents added between full size checks of the shared store
+EVICT_CHECK_INTERVAL = 16
+# Documents removed per eviction statement
+EVICT_BATCH = 100
+
+
+def document_id_for(text):
+    """Documents are content-addressed: the same text always gets the same id"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+class DocumentNotFound(Exception):
+    """Raised when a document_id is unknown or has been evicted"""
+
+    def __init__(self, document_id):
+        super().__init__(f"Document not found or expired: {document_id}")
+        self.document_id = document_id
+
+
+class StoredDocument:
+    """Extracted text plus the metadata computed once when it was stored"""
+
+    def __init__(self, document_id, text, metadata):
+        self.id = document_id
+        self.text = text
+        self.metadata = metadata
+
+    @property
+    def word_count(self):
+        return self.metadata['word_count']
+
+    @property
+    def language(self):
+        return self.metadata.get('language')
+
+    @property
+    def sentence_spans(self):
+        return self.metadata['sentence_spans']
+
+    def sentences(self):
+        return [self.text[start:end] for start, end in self.sentence_spans]
+
+    def to_dict(self, include_text=False):
+        """API representation; sentence spans and text only on request"""
+        result = {'document_id': self.id}
+        result.update({k: v for k, v in self.metadata.items() if k != 'sentence_spans'})
+        result['sentence_count'] = len(self.sentence_spans)
+        if include_text:
+            result['text'] = self.text
+            result['sentence_spans'] = self.sentence_spans
+        return result
+
+
+class DocumentStore:
+    """
+    SQLite-backed document store shared by every worker on the host
+
+    Documents expire after ttl seconds without being used, and the least
+    recently used ones are evicted when the total text size goes over
+    max_bytes. A few recently used documents are kept parsed in memory.
+    """
+
+    def __init__(
+        self,
+        path,
+        language_detector=None,
+        max_bytes=256 * 1024 * 1024,
+        max_documents=1000,
+        ttl=3600,
+        memory_entries=8
+    ):
+        """
+        Args:
+            path: SQLite database file
+            language_detector: Used to detect the language of new documents
+            max_bytes: Budget for the stored text (UTF-8 bytes)
+            max_documents: Maximum number of stored documents
+            ttl: Seconds a document is kept after it was last used
+            memory_entries: Parsed documents kept in this process
+        """
+        self.path = path
+        self.language_detector = language_detector
+        self.max_bytes = max_bytes
+        self.max_documents = max_documents
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self.evictions = 0
+        self._totals = None  # estimated (documents, bytes) since the last check
+        self._writes = 0
+        self._recent = OrderedDict()
+        self._recent_lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS documents (
+                    id TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    metadata TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_accessed ON documents (accessed_at)")
+
+    def _connect(self):
+        """One connection per thread and per process (connections must not cross a fork)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def add(self, text, filename=None, sha256=None, language=None):
+        """
+        Store a document and compute its metadata
+
+        Args:
+            text: Extracted text
+            filename: Original file name, if it came from an upload
+            sha256: Hash of the uploaded file, if any
+            language: Detected language code (detected here when omitted)
+
+        Returns:
+            StoredDocument
+        """
+        document_id = document_id_for(text)
+        existing = self.get(document_id)
+        if existing is not None:
+            return existing
+
+        language_name = None
+        if self.language_detector is not None:
+            if language is None:
+                language = self.language_detector.detect_language(text)
+            language_name = self.language_detector.get_language_name(language)
+
+        metadata = {
+            'filename': filename,
+            'sha256': sha256,
+            'word_count': len(text.split()),
+            'char_count': len(text),
+            'language': language,
+            'language_name': language_name,
+            'sentence_spans': sentence_spans(text),
+            'created_at': time.time()
+        }
+        size = len(text.encode('utf-8'))
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO documents (id, text, metadata, size, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (document_id, text, json.dumps(metadata), size, now, now)
+        )
+        self._evict(conn, now, size)
+
+        document = StoredDocument(document_id, text, metadata)
+        self._remember(document)
+        return document
+
+    def get(self, document_id):
+        """The document, or None if it is unknown or expired"""
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute(
+            "SELECT accessed_at FROM documents WHERE id = ?", (document_id,)
+        ).fetchone()
+        if row is None or row[0] + self.ttl < now:
+            if row is not None:
+                conn.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+            self._forget(document_id)
+            return None
+        conn.execute("UPDATE documents SET accessed_at = ? WHERE id = ?", (now, document_id))
+
+        with self._recent_lock:
+            document = self._recent.get(document_id)
+            if document is not None:
+                self._recent.move_to_end(document_id)
+                return document
+
+        row = conn.execute(
+            "SELECT text, metadata FROM documents WHERE id = ?", (document_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        document = StoredDocument(document_id, row[0], json.loads(row[1]))
+        self._remember(document)
+        return document
+
+    def require(self, document_id):
+        """Like get, but raises DocumentNotFound"""
+        document = self.get(document_id)
+        if document is None:
+            raise DocumentNotFound(document_id)
+        return document
+
+    def delete(self, document_id):
+        self._forget(document_id)
+        cursor = self._connect().execute("DELETE FROM documents WHERE id = ?", (document_id,))
+        return cursor.rowcount > 0
+
+    def _remember(self, document):
+        with self._recent_lock:
+            self._recent[document.id] = document
+            self._recent.move_to_end(document.id)
+            while len(self._recent) > self.memory_entries:
+                self._recent.popitem(last=False)
+
+    def _forget(self, document_id):
+        with self._recent_lock:
+            self._recent.pop(document_id, None)
+
+    def _forget_many(self, document_ids):
+        with self._recent_lock:
+            for document_id in document_ids:
+                self._recent.pop(document_id, None)
+
+    def _evict(self, conn, now, added):
+        """
+        Drop idle documents, then least recently used ones until under both limits
+
+        The store is counted every EVICT_CHECK_INTERVAL additions, or sooner
+        when the documents added since the last check reach a limit.
+        """
+        self._writes += 1
+        if self._totals is not None:
+            count, total = self._totals[0] + 1, self._totals[1] + added
+            self._totals = (count, total)
+            if total <= self.max_bytes and count <= self.max_documents and self._writes % EVICT_CHECK_INTERVAL:
+                return
+
+        idle = [document_id for (document_id,) in conn.execute(
+            "SELECT id FROM documents WHERE accessed_at < ?", (now - self.ttl,)
+        )]
+        if idle:
+            conn.execute("DELETE FROM documents WHERE accessed_at < ?", (now - self.ttl,))
+            self._forget_many(idle)
+            self.evictions += len(idle)
+
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM documents"
+        ).fetchone()
+        while total > self.max_bytes or count > self.max_documents:
+            oldest = conn.execute(
+                "SELECT id, size FROM documents ORDER BY accessed_at LIMIT ?", (EVICT_BATCH,)
+            ).fetchall()
+            if not oldest:
+                break
+            evicted = []
+            for document_id, size in oldest:
+                evicted.append(document_id)
+                total -= size
+                count -= 1
+                if total <= self.max_bytes and count <= self.max_documents:
+                    break
+            placeholders = ','.join('?' * len(evicted))
+            conn.execute(f"DELETE FROM documents WHERE id IN ({placeholders})", evicted)
+            self._forget_many(evicted)
+            self.evictions += len(evicted)
+        self._totals = (count, total)
+
+    def get_stats(self):
+        documents, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM documents"
+        ).fetchone()
+        return {
+            'path': self.path,
+            'documents': documents,
+            'bytes': size,
+            'evictions': self.evictions
+        }
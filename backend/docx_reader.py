@@ -0,0 +1,192 @@
+"""
+Streaming DOCX text extraction straight from the zip, without python-docx
+"""
+
+from xml.etree.ElementTree import iterparse
+import posixpath
+import re
+import xml.etree.ElementTree as ElementTree
+import zipfile
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+RELS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+DOCUMENT_PART = 'word/document.xml'
+DOCUMENT_RELS = 'word/_rels/document.xml.rels'
+
+# Run content that stands for a character. Only counted inside a w:r:
+# w:tab also defines tab stops in paragraph properties (w:pPr/w:tabs)
+RUN_CHARACTERS = {
+    W + 'tab': '\t',
+    W + 'br': '\n',
+    W + 'cr': '\n',
+    W + 'noBreakHyphen': '-'
+}
+
+# Content inside these is skipped: Fallback repeats its AlternateContent
+# choice, and deleted or moved-away text is not part of the document
+SKIPPED = {MC + 'Fallback', W + 'del', W + 'moveFrom'}
+
+
+class _Table:
+    """Rows of a table being parsed; cells hold their paragraphs"""
+
+    def __init__(self):
+        self.cells = []
+        self.cell = None
+
+
+def iter_part_blocks(stream, keep_empty=True):
+    """
+    Yield the text blocks of one WordprocessingML part in document order
+
+    Paragraphs are yielded one by one. A table row is yielded as one block
+    with its cells separated by tabs; nested tables are folded into their
+    enclosing cell. Each finished element is cleared from the tree, so
+    memory stays bounded by the largest paragraph or table row.
+
+    Args:
+        stream: Binary file object with the part's XML
+        keep_empty: Also yield empty paragraphs (blank lines)
+    """
+    paragraphs = []  # text pieces of each open paragraph, innermost last
+    tables = []
+    runs = 0  # open w:r elements
+    skip_depth = 0
+    parents = []
+
+    for event, elem in iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if skip_depth or tag in SKIPPED:
+                skip_depth += 1
+            elif tag == W + 'p':
+                paragraphs.append([])
+            elif tag == W + 'r':
+                runs += 1
+            elif tag == W + 'tbl':
+                tables.append(_Table())
+            elif tag == W + 'tc' and tables:
+                tables[-1].cell = []
+            parents.append(elem)
+            continue
+
+        parents.pop()
+        if skip_depth:
+            skip_depth -= 1
+            elem.clear()
+            continue
+
+        block = None
+        if tag == W + 't':
+            if paragraphs and elem.text:
+                paragraphs[-1].append(elem.text)
+        elif tag in RUN_CHARACTERS:
+            if paragraphs and runs:
+                paragraphs[-1].append(RUN_CHARACTERS[tag])
+        elif tag == W + 'r':
+            runs -= 1
+        elif tag == W + 'p':
+            text = ''.join(paragraphs.pop())
+            if tables and tables[-1].cell is not None:
+                if text:
+                    tables[-1].cell.append(text)
+            elif paragraphs:
+                # A text box paragraph inside a run: keep it with its host
+                if text:
+                    paragraphs[-1].append(text + ' ')
+            elif text or keep_empty:
+                block = text
+        elif tag == W + 'tc':
+            if tables and tables[-1].cell is not None:
+                tables[-1].cells.append(' '.join(tables[-1].cell))
+                tables[-1].cell = None
+        elif tag == W + 'tr':
+            if tables:
+                row = '\t'.join(tables[-1].cells).strip()
+                tables[-1].cells = []
+                if row:
+                    if len(tables) > 1 and tables[-2].cell is not None:
+                        tables[-2].cell.append(' '.join(row.split('\t')))
+                    else:
+                        block = row
+        elif tag == W + 'tbl':
+            if tables:
+                tables.pop()
+
+        if tag in (W + 'p', W + 'tbl', W + 'tr', W + 'tc', W + 'r', W + 'sdt'):
+            elem.clear()
+            # Drop the emptied element from its parent as well
+            if parents:
+                parents[-1].remove(elem)
+        if block is not None:
+            yield block
+
+
+def _natural_key(name):
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)]
+
+
+def header_footer_parts(archive):
+    """
+    Zip member names of the document's headers and footers
+
+    Returns:
+        (headers, footers), each in part-name order (header1, header2, ...)
+    """
+    try:
+        with archive.open(DOCUMENT_RELS) as f:
+            relationships = ElementTree.parse(f).getroot()
+    except KeyError:
+        return [], []
+
+    parts = {'header': set(), 'footer': set()}
+    for relationship in relationships.iter(RELS + 'Relationship'):
+        kind = relationship.get('Type', '').rsplit('/', 1)[-1]
+        if kind not in parts or relationship.get('TargetMode') == 'External':
+            continue
+        target = relationship.get('Target', '')
+        if target.startswith('/'):
+            name = target.lstrip('/')
+        else:
+            name = posixpath.normpath(posixpath.join('word', target))
+        parts[kind].add(name)
+    names = set(archive.namelist())
+    return (
+        sorted(parts['header'] & names, key=_natural_key),
+        sorted(parts['footer'] & names, key=_natural_key)
+    )
+
+
+def iter_docx_blocks(source, headers_and_footers=True):
+    """
+    Yield the text of a DOCX file block by block
+
+    Header text comes first, then the body (paragraphs and table rows in
+    document order), then footer text. A header or footer that repeats
+    text already emitted (first-page and even-page variants often do) is
+    yielded once.
+
+    Args:
+        source: Path or seekable binary file object holding the DOCX
+        headers_and_footers: Include header and footer text
+    """
+    with zipfile.ZipFile(source) as archive:
+        if DOCUMENT_PART not in archive.namelist():
+            raise Exception("Not a Word document: word/document.xml is missing")
+        headers, footers = header_footer_parts(archive) if headers_and_footers else ([], [])
+        seen = set()
+
+        def margin_blocks(parts):
+            for name in parts:
+                with archive.open(name) as stream:
+                    for block in iter_part_blocks(stream, keep_empty=False):
+                        if block not in seen:
+                            seen.add(block)
+                            yield block
+
+        yield from margin_blocks(headers)
+        with archive.open(DOCUMENT_PART) as stream:
+            yield from iter_part_blocks(stream)
+        yield from margin_blocks(footers)
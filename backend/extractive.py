@@ -0,0 +1,137 @@
+"""
+Vectorized extractive scoring over a sparse term-sentence matrix
+"""
+
+import re
+
+# numpy and scipy are imported inside the methods: the scorer is only
+# needed on the extractive path, and scipy.sparse is slow to import
+
+# Approximates nltk's word_tokenize: runs of word characters, or runs of punctuation
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]+")
+
+
+def default_sentence_count(word_count):
+    """Sentences kept by the 'extractive' method for a text of this many words"""
+    return max(3, min(10, word_count // 50))
+
+
+class ExtractiveScorer:
+    """Score sentences with one tokenization pass and a single matrix product"""
+
+    SCORERS = ('frequency', 'tfidf', 'centroid')
+
+    def __init__(self, stop_words=None):
+        self.stop_words = frozenset(stop_words or ())
+
+    def build_matrix(self, sentences):
+        """
+        Tokenize every sentence exactly once
+
+        Args:
+            sentences: List of sentence strings
+
+        Returns:
+            (matrix, lengths) where matrix is a CSR sentence x term count
+            matrix over content words and lengths holds the total token
+            count of each sentence
+        """
+        import numpy as np
+        from scipy import sparse
+
+        vocabulary = {}
+        indices = []
+        indptr = [0]
+        lengths = np.zeros(len(sentences), dtype=np.float64)
+        stop_words = self.stop_words
+
+        for i, sentence in enumerate(sentences):
+            tokens = TOKEN_PATTERN.findall(sentence.lower())
+            lengths[i] = len(tokens)
+            for token in tokens:
+                if token.isalnum() and token not in stop_words:
+                    index = vocabulary.get(token)
+                    if index is None:
+                        index = vocabulary[token] = len(vocabulary)
+                    indices.append(index)
+            indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (
+                np.ones(len(indices), dtype=np.float64),
+                np.asarray(indices, dtype=np.int64),
+                np.asarray(indptr, dtype=np.int64)
+            ),
+            shape=(len(sentences), len(vocabulary))
+        )
+        # Repeated words inside one sentence become a single count entry
+        matrix.sum_duplicates()
+        return matrix, lengths
+
+    def score(self, sentences, scorer='frequency'):
+        """
+        Score sentences
+
+        Args:
+            sentences: List of sentence strings
+            scorer: 'frequency', 'tfidf' or 'centroid'
+
+        Returns:
+            numpy array with one score per sentence
+        """
+        if scorer not in self.SCORERS:
+            raise ValueError(f"Invalid scorer: {scorer}. Use one of {', '.join(self.SCORERS)}")
+        import numpy as np
+        from scipy import sparse
+
+        if not sentences:
+            return np.zeros(0)
+
+        matrix, lengths = self.build_matrix(sentences)
+        if matrix.shape[1] == 0:
+            return np.zeros(len(sentences))
+
+        # Normalize by sentence length to avoid bias toward long sentences
+        lengths = np.maximum(lengths, 1.0)
+        term_freq = np.asarray(matrix.sum(axis=0)).ravel()
+
+        if scorer == 'frequency':
+            return matrix @ term_freq / lengths
+
+        doc_freq = np.bincount(matrix.indices, minlength=matrix.shape[1])
+        idf = np.log((1.0 + len(sentences)) / (1.0 + doc_freq)) + 1.0
+
+        if scorer == 'tfidf':
+            return matrix @ (term_freq * idf) / lengths
+
+        # centroid: cosine similarity of each tf-idf row to the document centroid
+        weighted = sparse.csr_matrix(matrix.multiply(idf))
+        row_norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        row_norms[row_norms == 0] = 1.0
+        weighted = sparse.diags(1.0 / row_norms) @ weighted
+        centroid = np.asarray(weighted.mean(axis=0)).ravel()
+        centroid_norm = np.linalg.norm(centroid)
+        if centroid_norm == 0:
+            return np.zeros(len(sentences))
+        return weighted @ (centroid / centroid_norm)
+
+    def select(self, sentences, num_sentences, scorer='frequency'):
+        """
+        Pick the top sentences
+
+        Returns:
+            Indices of the selected sentences in original document order
+        """
+        if len(sentences) <= num_sentences:
+            return list(range(len(sentences)))
+
+        import numpy as np
+
+        scores = self.score(sentences, scorer)
+        # Stable sort keeps the earlier sentence on ties, like the old sorted() path
+        top = np.argsort(-scores, kind='stable')[:num_sentences]
+        return np.sort(top).tolist()
+
+    def summarize(self, sentences, num_sentences, scorer='frequency'):
+        """Join the selected sentences in original order"""
+        return ' '.join(sentences[i] for i in self.select(sentences, num_sentences, scorer))
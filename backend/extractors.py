@@ -0,0 +1,799 @@
+"""
+Format extractors: a registry keyed by file extension and sniffed MIME type
+
+Each extractor yields the text of a file block by block (pages, paragraphs,
+table rows). Heavy format libraries are imported the first time an
+extractor runs, not when this module is loaded.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from html.parser import HTMLParser
+from io import BytesIO
+import codecs
+import io
+import logging
+import mmap
+import multiprocessing
+import os
+import posixpath
+import re
+import threading
+import xml.etree.ElementTree as ElementTree
+import zipfile
+
+from docx_reader import iter_docx_blocks
+
+logger = logging.getLogger(__name__)
+
+PDF_MIME = 'application/pdf'
+DOCX_MIME = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+EPUB_MIME = 'application/epub+zip'
+HTML_MIME = 'text/html'
+MARKDOWN_MIME = 'text/markdown'
+TEXT_MIME = 'text/plain'
+
+# Types recognised by their magic bytes. When one of these disagrees with
+# the file extension, the content wins.
+SIGNATURE_TYPES = {PDF_MIME, DOCX_MIME, EPUB_MIME}
+
+SNIFF_BYTES = 4096
+READ_CHUNK = 1024 * 1024
+
+
+class MappedFile(io.RawIOBase):
+    """Seekable read-only file object over an mmap (zipfile and PyPDF2 need file methods)"""
+
+    def __init__(self, mapping):
+        self.mapping = mapping
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read(self, size=-1):
+        return self.mapping.read(None if size is None or size < 0 else size)
+
+    def readinto(self, buffer):
+        data = self.mapping.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        self.mapping.seek(offset, whence)
+        return self.mapping.tell()
+
+    def tell(self):
+        return self.mapping.tell()
+
+
+@contextmanager
+def mapped(file):
+    """
+    Memory-map a file that lives on disk, for reading
+
+    The extractors read through the mapping, so pages come from the OS
+    page cache instead of a private copy in this process. Objects
+    without a file descriptor (BytesIO) are yielded as they are.
+    """
+    try:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        # No descriptor, or an empty file (which cannot be mapped)
+        mapping = None
+
+    if mapping is None:
+        yield file
+        return
+    try:
+        yield MappedFile(mapping)
+    finally:
+        mapping.close()
+
+
+def disk_path(file):
+    """Path of the file behind an upload or open file, if there is one"""
+    stream = getattr(file, 'stream', file)
+    path = getattr(stream, 'path', None) or getattr(stream, 'name', None)
+    if isinstance(path, str) and os.path.isfile(path):
+        return path
+    return None
+
+
+def page_span(page_count, first_page=1, last_page=None, max_pages=None):
+    """
+    Zero-based [start, stop) page indices for a 1-based inclusive page range
+
+    Args:
+        page_count: Pages in the document
+        first_page: First page to read (1-based)
+        last_page: Last page to read, inclusive (default: last page)
+        max_pages: Read at most this many pages
+    """
+    start = max(1, int(first_page or 1)) - 1
+    stop = page_count if last_page is None else min(page_count, int(last_page))
+    if max_pages is not None:
+        stop = min(stop, start + max(0, int(max_pages)))
+    return start, max(start, stop)
+
+
+# ==================== Encoding detection ====================
+
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+)
+
+
+def detect_encoding(sample):
+    """
+    Best guess at the encoding of a text file from its first bytes
+
+    A byte order mark decides; otherwise UTF-8 is used when the sample
+    decodes as UTF-8. charset_normalizer is asked next if it is installed,
+    and cp1252 is the last resort.
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        # Not final: the sample may end in the middle of a character
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    try:
+        from charset_normalizer import from_bytes
+        matches = list(from_bytes(sample))
+    except ImportError:
+        matches = []
+    if matches:
+        best = min(matches, key=lambda match: match.chaos)
+        # Western European text scores about the same under several Latin
+        # code pages; prefer cp1252 (what such files usually are) when it is close
+        for match in matches:
+            if match.encoding == 'cp1252' and match.chaos <= best.chaos + 0.05:
+                return 'cp1252'
+        return best.encoding
+    return 'cp1252'
+
+
+def iter_decoded(file, encoding=None, chunk_size=READ_CHUNK):
+    """
+    Decode a binary file incrementally, yielding text chunks
+
+    Args:
+        file: Binary file object positioned at the start
+        encoding: Text encoding (detected from the first chunk when None)
+    """
+    decoder = None
+    while True:
+        data = file.read(chunk_size)
+        if decoder is None:
+            encoding = encoding or detect_encoding(data[:SNIFF_BYTES * 16])
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        if not data:
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                yield tail
+            return
+        text = decoder.decode(data)
+        if text:
+            yield text
+
+
+def iter_lines(chunks):
+    """Lines (without their line ending) from a stream of text chunks"""
+    pending = ''
+    for chunk in chunks:
+        lines = (pending + chunk).split('\n')
+        # The last line may continue in the next chunk
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip('\r')
+    if pending:
+        yield pending.rstrip('\r')
+
+
+# ==================== Extractors ====================
+
+class Extractor:
+    """
+    Base class for a format extractor
+
+    Subclasses list the extensions and MIME types they handle and
+    implement iter_blocks. Options an extractor does not use are ignored.
+    """
+
+    name = None
+    extensions = ()
+    mime_types = ()
+
+    def iter_blocks(self, file, **options):
+        """Yield the text of file block by block, in document order"""
+        raise NotImplementedError
+
+    def extract(self, file, **options):
+        """Full text of file, blocks joined by newlines"""
+        try:
+            return "\n".join(self.iter_blocks(file, **options)).strip()
+        except Exception as e:
+            if str(e).startswith(f"Error reading {self.name}"):
+                raise
+            raise Exception(f"Error reading {self.name}: {str(e)}")
+
+
+# Shared pool for parallel PDF extraction, created on first use
+_pdf_pool = None
+_pdf_pool_workers = 0
+_pdf_pool_lock = threading.Lock()
+
+
+def available_cpus():
+    """CPUs this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _get_pdf_pool(workers):
+    global _pdf_pool, _pdf_pool_workers
+    with _pdf_pool_lock:
+        if _pdf_pool is None or _pdf_pool_workers != workers:
+            if _pdf_pool is not None:
+                _pdf_pool.shutdown(wait=False)
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _pdf_pool_workers = workers
+        return _pdf_pool
+
+
+def _extract_pdf_page_range(source, start, stop):
+    """Process-pool entry point: text of pages [start, stop) of a PDF given as a path or bytes"""
+    import PyPDF2
+
+    if isinstance(source, bytes):
+        reader = PyPDF2.PdfReader(BytesIO(source))
+        return [reader.pages[i].extract_text() or '' for i in range(start, stop)]
+
+    with open(source, 'rb') as f, mapped(f) as source_file:
+        reader = PyPDF2.PdfReader(source_file)
+        return [reader.pages[i].extract_text() or '' for i in range(start, stop)]
+
+
+class PdfExtractor(Extractor):
+    """PDF pages via PyPDF2, optionally fanned out to a process pool"""
+
+    name = 'PDF'
+    extensions = ('pdf',)
+    mime_types = (PDF_MIME,)
+    PARALLEL_MIN_PAGES = 32  # Smaller PDFs are not worth a process round trip
+    # Every task re-parses the whole PDF, so ranges are one per worker, at least this long
+    MIN_PAGES_PER_TASK = 16
+
+    def iter_blocks(self, file, first_page=1, last_page=None, max_pages=None, pdf_workers=0, **options):
+        """
+        Yield the text of a PDF one page at a time, in page order
+
+        Args:
+            file: Binary file object
+            first_page, last_page, max_pages: Which pages to read (see page_span)
+            pdf_workers: Processes to spread page ranges across; 0 or 1 reads
+                pages in this thread. Documents shorter than
+                PARALLEL_MIN_PAGES are always read in this thread.
+        """
+        import PyPDF2
+
+        with mapped(file) as source:
+            try:
+                pdf_reader = PyPDF2.PdfReader(source)
+                start, stop = page_span(len(pdf_reader.pages), first_page, last_page, max_pages)
+            except Exception as e:
+                raise Exception(f"Error reading PDF: {str(e)}")
+
+            # Extra processes only help when there are CPUs to run them on
+            pdf_workers = min(pdf_workers or 0, available_cpus())
+            if pdf_workers > 1 and stop - start >= self.PARALLEL_MIN_PAGES:
+                yield from self._iter_pages_parallel(file, start, stop, pdf_workers)
+                return
+
+            for index in range(start, stop):
+                try:
+                    yield pdf_reader.pages[index].extract_text() or ''
+                except Exception as e:
+                    raise Exception(f"Error reading PDF page {index + 1}: {str(e)}")
+
+    def _iter_pages_parallel(self, file, start, stop, workers):
+        """Fan page ranges out to the process pool and yield pages back in order"""
+        # Workers open files on disk themselves; only in-memory files are shipped as bytes
+        data = disk_path(file)
+        if data is None:
+            file.seek(0)
+            data = file.read()
+        step = max(self.MIN_PAGES_PER_TASK, -(-(stop - start) // workers))
+        ranges = [(i, min(i + step, stop)) for i in range(start, stop, step)]
+        pool = _get_pdf_pool(workers)
+
+        # Keep a bounded window of ranges in flight so early pages come back
+        # first and a huge document does not queue every range at once
+        window = workers * 2
+        futures = [pool.submit(_extract_pdf_page_range, data, a, b) for a, b in ranges[:window]]
+        next_range = len(futures)
+
+        for position in range(len(ranges)):
+            try:
+                pages = futures[position].result()
+            except Exception as e:
+                raise Exception(f"Error reading PDF: {str(e)}")
+            futures[position] = None
+            if next_range < len(ranges):
+                a, b = ranges[next_range]
+                futures.append(pool.submit(_extract_pdf_page_range, data, a, b))
+                next_range += 1
+            yield from pages
+
+
+class DocxExtractor(Extractor):
+    """DOCX paragraphs, table rows, headers and footers (see docx_reader)"""
+
+    name = 'DOCX'
+    extensions = ('docx',)
+    mime_types = (DOCX_MIME,)
+
+    def iter_blocks(self, file, **options):
+        with mapped(file) as source:
+            yield from iter_docx_blocks(source)
+
+
+class TextExtractor(Extractor):
+    """Plain text in any encoding, decoded incrementally"""
+
+    name = 'TXT'
+    extensions = ('txt', 'text', 'log', 'csv')
+    mime_types = (TEXT_MIME,)
+
+    def iter_blocks(self, file, encoding=None, **options):
+        """Yield runs of whole lines, about READ_CHUNK bytes at a time"""
+        with mapped(file) as source:
+            source.seek(0)
+            pending = ''
+            for chunk in iter_decoded(source, encoding):
+                pending += chunk
+                cut = pending.rfind('\n')
+                if cut >= 0:
+                    yield pending[:cut]
+                    pending = pending[cut + 1:]
+            if pending:
+                yield pending
+
+
+# Elements whose content is never text
+HTML_SKIPPED = {'script', 'style', 'noscript', 'template', 'svg', 'math', 'iframe', 'object'}
+# Elements that start and end a block of text
+HTML_BLOCKS = {
+    'address', 'article', 'aside', 'blockquote', 'body', 'caption', 'dd', 'details', 'dialog',
+    'div', 'dl', 'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section',
+    'summary', 'table', 'title', 'tr', 'ul'
+}
+HTML_CELLS = {'td', 'th'}
+HTML_ROWS = {'tr', 'table'}
+HTML_BREAK = '\x0b'  # <br>, kept apart from newlines in the source
+HTML_VOID = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+
+
+class _HTMLTextParser(HTMLParser):
+    """Collects block text from HTML fed in pieces; finished blocks wait in self.blocks"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self._parts = []
+        self._cells = None
+        self._skip = 0
+        self._pre = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in HTML_SKIPPED:
+            if tag not in HTML_VOID:
+                self._skip += 1
+            return
+        if self._skip:
+            return
+        if tag == 'br':
+            self._parts.append(HTML_BREAK)
+        elif tag in HTML_CELLS:
+            self._end_cell()
+            if self._cells is None:
+                self._cells = []
+        elif tag in HTML_BLOCKS:
+            self._block_boundary(tag)
+            if tag == 'pre':
+                self._pre += 1
+        elif tag == 'img':
+            alt = dict(attrs).get('alt')
+            if alt:
+                self._parts.append(f" {alt} ")
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in HTML_SKIPPED:
+            self._skip = max(0, self._skip - 1)
+            return
+        if self._skip:
+            return
+        if tag in HTML_CELLS:
+            self._end_cell()
+        elif tag in HTML_BLOCKS:
+            self._block_boundary(tag)
+            if tag == 'pre':
+                self._pre = max(0, self._pre - 1)
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._parts.append(data)
+
+    def _block_boundary(self, tag):
+        if self._cells is not None and tag not in HTML_ROWS:
+            # Paragraphs and lists inside a table cell stay in that cell
+            self._parts.append(' ')
+        else:
+            self._end_block()
+
+    def _text(self):
+        text = ''.join(self._parts)
+        self._parts = []
+        if self._pre:
+            return text.replace(HTML_BREAK, '\n').strip('\n')
+        return '\n'.join(' '.join(line.split()) for line in text.split(HTML_BREAK)).strip()
+
+    def _end_cell(self):
+        if self._cells is not None and self._parts:
+            self._cells.append(self._text())
+
+    def _end_block(self):
+        if self._cells is not None:
+            self._end_cell()
+            row = '\t'.join(cell for cell in self._cells if cell)
+            self._cells = None
+            if row:
+                self.blocks.append(row)
+        text = self._text()
+        if text:
+            self.blocks.append(text)
+
+    def close(self):
+        super().close()
+        self._end_block()
+
+
+def iter_html_blocks(chunks):
+    """Text blocks of an HTML document given as a stream of text chunks"""
+    parser = _HTMLTextParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.blocks:
+            yield from parser.blocks
+            parser.blocks = []
+    parser.close()
+    yield from parser.blocks
+
+
+def html_encoding(sample):
+    """Charset declared in an HTML <meta> tag, or None"""
+    match = META_CHARSET.search(sample)
+    if match is None:
+        return None
+    try:
+        return codecs.lookup(match.group(1).decode('ascii')).name
+    except (LookupError, UnicodeDecodeError):
+        return None
+
+
+class HtmlExtractor(Extractor):
+    """HTML text, parsed incrementally with the standard library parser"""
+
+    name = 'HTML'
+    extensions = ('html', 'htm', 'xhtml')
+    mime_types = (HTML_MIME, 'application/xhtml+xml')
+
+    def iter_blocks(self, file, encoding=None, **options):
+        with mapped(file) as source:
+            source.seek(0)
+            if encoding is None:
+                sample = source.read(SNIFF_BYTES)
+                source.seek(0)
+                if not any(sample.startswith(bom) for bom, _ in BOMS):
+                    encoding = html_encoding(sample)
+            yield from iter_html_blocks(iter_decoded(source, encoding))
+
+
+MARKDOWN_FENCE = re.compile(r'^\s*(```|~~~)')
+MARKDOWN_RULE = re.compile(r'^\s*([-*_])(\s*\1){2,}\s*$')
+MARKDOWN_SETEXT = re.compile(r'^\s*(=+|-+)\s*$')
+MARKDOWN_PREFIX = re.compile(r'^\s{0,3}(?:>\s?)*(?:#{1,6}\s+|[-*+]\s+(?:\[[ xX]\]\s+)?|\d+[.)]\s+)?')
+MARKDOWN_TABLE_RULE = re.compile(r'^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$')
+MARKDOWN_INLINE = (
+    (re.compile(r'!\[([^\]]*)\]\([^)]*\)'), r'\1'),     # images: alt text
+    (re.compile(r'\[([^\]]+)\]\([^)]*\)'), r'\1'),      # links: link text
+    (re.compile(r'\[([^\]]+)\]\[[^\]]*\]'), r'\1'),     # reference links
+    (re.compile(r'</?[A-Za-z][^>\n]*>'), ''),           # inline HTML
+    (re.compile(r'`+([^`]*)`+'), r'\1'),                 # code spans
+    (re.compile(r'\*\*(?=\S)(.+?)(?<=\S)\*\*'), r'\1'),
+    (re.compile(r'(?<!\w)__(?=\S)(.+?)(?<=\S)__(?!\w)'), r'\1'),
+    (re.compile(r'\*(?=\S)(.+?)(?<=\S)\*'), r'\1'),
+    (re.compile(r'(?<!\w)_(?=\S)(.+?)(?<=\S)_(?!\w)'), r'\1'),
+    (re.compile(r'~~(.+?)~~'), r'\1')
+)
+
+
+def markdown_inline(text):
+    """Markdown line with links, emphasis and code markers replaced by their text"""
+    for pattern, replacement in MARKDOWN_INLINE:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def iter_markdown_blocks(lines):
+    """
+    Text blocks of a Markdown document given line by line
+
+    Paragraph lines are joined with spaces; headings, list items and table
+    rows are blocks of their own. Fenced code, front matter, link
+    definitions and horizontal rules are dropped.
+    """
+    paragraph = []
+    fence = None
+
+    def flush():
+        if paragraph:
+            text = ' '.join(paragraph).strip()
+            paragraph.clear()
+            if text:
+                return text
+        return None
+
+    for number, line in enumerate(lines):
+        if fence is not None:
+            if line.strip().startswith(fence):
+                fence = None
+            continue
+        if number == 0 and line.strip() == '---':
+            fence = '---'  # YAML front matter
+            continue
+        match = MARKDOWN_FENCE.match(line)
+        if match:
+            block = flush()
+            if block:
+                yield block
+            fence = match.group(1)
+            continue
+
+        stripped = line.strip()
+        if not stripped or MARKDOWN_RULE.match(line) or re.match(r'^\s*\[[^\]]+\]:\s*\S', line):
+            block = flush()
+            if block:
+                yield block
+            continue
+        if MARKDOWN_SETEXT.match(line) and paragraph:
+            # The paragraph so far was a heading underlined with === or ---
+            block = flush()
+            if block:
+                yield block
+            continue
+        if '|' in stripped and (stripped.startswith('|') or stripped.endswith('|')):
+            block = flush()
+            if block:
+                yield block
+            if not MARKDOWN_TABLE_RULE.match(stripped):
+                cells = [markdown_inline(cell.strip()) for cell in stripped.strip('|').split('|')]
+                row = '\t'.join(cell for cell in cells if cell)
+                if row:
+                    yield row
+            continue
+
+        prefix = MARKDOWN_PREFIX.match(line).group(0)
+        text = markdown_inline(line[len(prefix):].strip())
+        if '#' in prefix:
+            text = text.rstrip('# ')
+        if prefix.strip(' >'):
+            # Heading or list item: its own block
+            block = flush()
+            if block:
+                yield block
+            if text:
+                yield text
+            continue
+        paragraph.append(text)
+
+    block = flush()
+    if block:
+        yield block
+
+
+class MarkdownExtractor(Extractor):
+    """Markdown as plain text, line by line"""
+
+    name = 'Markdown'
+    extensions = ('md', 'markdown', 'mdown', 'mkd')
+    mime_types = (MARKDOWN_MIME, 'text/x-markdown')
+
+    def iter_blocks(self, file, encoding=None, **options):
+        with mapped(file) as source:
+            source.seek(0)
+            yield from iter_markdown_blocks(iter_lines(iter_decoded(source, encoding)))
+
+
+EPUB_CONTAINER = 'META-INF/container.xml'
+CONTAINER_NS = '{urn:oasis:names:tc:opendocument:xmlns:container}'
+OPF_NS = '{http://www.idpf.org/2007/opf}'
+EPUB_DOCUMENT_TYPES = {'application/xhtml+xml', 'text/html'}
+
+
+def epub_spine(archive):
+    """Zip member names of an EPUB's content documents in reading order"""
+    with archive.open(EPUB_CONTAINER) as f:
+        rootfile = ElementTree.parse(f).getroot().find(f'.//{CONTAINER_NS}rootfile')
+    if rootfile is None:
+        raise Exception("EPUB container has no rootfile")
+    opf_path = rootfile.get('full-path')
+    with archive.open(opf_path) as f:
+        package = ElementTree.parse(f).getroot()
+
+    base = posixpath.dirname(opf_path)
+    manifest = {}
+    for item in package.iter(f'{OPF_NS}item'):
+        manifest[item.get('id')] = (item.get('href', ''), item.get('media-type'))
+    names = []
+    for itemref in package.iter(f'{OPF_NS}itemref'):
+        href, media_type = manifest.get(itemref.get('idref'), (None, None))
+        if href and media_type in EPUB_DOCUMENT_TYPES:
+            names.append(posixpath.normpath(posixpath.join(base, href.split('#')[0])))
+    return names
+
+
+class EpubExtractor(Extractor):
+    """EPUB chapters in spine order, each parsed incrementally as HTML"""
+
+    name = 'EPUB'
+    extensions = ('epub',)
+    mime_types = (EPUB_MIME,)
+
+    def iter_blocks(self, file, **options):
+        with mapped(file) as source, zipfile.ZipFile(source) as archive:
+            for name in epub_spine(archive):
+                try:
+                    member = archive.open(name)
+                except KeyError:
+                    logger.warning(f"EPUB spine item missing from archive: {name}")
+                    continue
+                with member:
+                    yield from iter_html_blocks(iter_decoded(member, chunk_size=64 * 1024))
+
+
+# ==================== Registry ====================
+
+class ExtractorRegistry:
+    """Extractors by file extension and MIME type"""
+
+    def __init__(self):
+        self._by_extension = {}
+        self._by_mime = {}
+
+    def register(self, extractor):
+        """Add an extractor; later registrations win for shared keys"""
+        for ext in extractor.extensions:
+            self._by_extension[ext.lower()] = extractor
+        for mime_type in extractor.mime_types:
+            self._by_mime[mime_type] = extractor
+        return extractor
+
+    @property
+    def extensions(self):
+        return sorted(self._by_extension)
+
+    def for_extension(self, filename):
+        """Extractor for the extension of filename, or None"""
+        if not filename or '.' not in filename:
+            return None
+        return self._by_extension.get(filename.rsplit('.', 1)[1].lower())
+
+    def for_mime(self, mime_type):
+        return self._by_mime.get(mime_type)
+
+    def resolve(self, file, filename):
+        """
+        Pick the extractor for an uploaded file
+
+        The extension decides, except when the content starts with the
+        signature of another supported format (a PDF saved as .txt). Files
+        without a known extension are handled by their sniffed type.
+
+        Raises:
+            Exception: No extractor handles the file
+        """
+        by_extension = self.for_extension(filename)
+        mime_type = sniff_mime(file)
+        by_content = self.for_mime(mime_type) if mime_type else None
+
+        if by_extension is None:
+            if by_content is None:
+                raise Exception("Unsupported file type")
+            return by_content
+        if by_content is not None and by_content is not by_extension and mime_type in SIGNATURE_TYPES:
+            logger.info(f"{filename} looks like {mime_type}; using the {by_content.name} extractor")
+            return by_content
+        return by_extension
+
+
+def sniff_mime(file):
+    """
+    MIME type of a file from its first bytes, or None for unknown binary data
+
+    Reads from the current position and seeks back afterwards.
+    """
+    try:
+        position = file.tell()
+        sample = file.read(SNIFF_BYTES)
+        file.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return None
+    if not sample:
+        return None
+
+    if b'%PDF-' in sample[:1024]:
+        return PDF_MIME
+    if sample.startswith(b'PK\x03\x04'):
+        try:
+            with zipfile.ZipFile(file) as archive:
+                names = set(archive.namelist())
+                if 'mimetype' in names and archive.read('mimetype').strip() == EPUB_MIME.encode('ascii'):
+                    return EPUB_MIME
+                if 'word/document.xml' in names:
+                    return DOCX_MIME
+            return 'application/zip'
+        except (zipfile.BadZipFile, OSError):
+            return None
+        finally:
+            file.seek(position)
+
+    has_bom = any(sample.startswith(bom) for bom, _ in BOMS)
+    if b'\x00' in sample and not has_bom:
+        return None
+    head = sample[:1024].decode(detect_encoding(sample), errors='replace').lstrip('﻿ \t\r\n').lower()
+    if head.startswith('<!doctype html') or head.startswith('<html') or '<body' in head:
+        return HTML_MIME
+    return TEXT_MIME
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Process-wide registry with the built-in extractors"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ExtractorRegistry()
+            for extractor in (
+                PdfExtractor(),
+                DocxExtractor(),
+                TextExtractor(),
+                HtmlExtractor(),
+                MarkdownExtractor(),
+                EpubExtractor()
+            ):
+                _registry.register(extractor)
+        return _registry
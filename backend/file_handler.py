@@ -1,191 +1,146 @@
 """
-File handling utilities for PDF and DOCX files
+File handling utilities: upload validation, text extraction and PDF reports
+
+Text extraction is delegated to the format extractors in extractors.py.
 """
 
-import PyPDF2
-from docx import Document
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.enums import TA_JUSTIFY, TA_LEFT
 from io import BytesIO
 import os
 
+from extractors import (
+    DOCX_MIME, PDF_MIME, TEXT_MIME, disk_path, get_registry, mapped, page_span, sniff_mime
+)
+
+
 class FileHandler:
     """Handle file operations for text extraction and PDF generation"""
     
-    ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
     
     @staticmethod
     def allowed_file(filename):
-        """Check if file extension is allowed"""
-        return '.' in filename and \
-               filename.rsplit('.', 1)[1].lower() in FileHandler.ALLOWED_EXTENSIONS
+        """Check if an extractor is registered for the file extension"""
+        return get_registry().for_extension(filename) is not None
+    
+    @staticmethod
+    def mapped(file):
+        """Memory-map a file that lives on disk, for reading (see extractors.mapped)"""
+        return mapped(file)
+    
+    @staticmethod
+    def disk_path(file):
+        """Path of the file behind an upload or open file, if there is one"""
+        return disk_path(file)
+    
+    @staticmethod
+    def page_span(page_count, first_page=1, last_page=None, max_pages=None):
+        """Zero-based [start, stop) page indices for a 1-based inclusive page range"""
+        return page_span(page_count, first_page, last_page, max_pages)
+    
+    @staticmethod
+    def iter_pdf_pages(file, first_page=1, last_page=None, max_pages=None, workers=0):
+        """
+        Yield the text of a PDF one page at a time, in page order
+        
+        Args:
+            file: Binary file object
+            first_page, last_page, max_pages: Which pages to read (see page_span)
+            workers: Processes to spread page ranges across (see PdfExtractor)
+        """
+        return get_registry().for_mime(PDF_MIME).iter_blocks(
+            file, first_page=first_page, last_page=last_page, max_pages=max_pages, pdf_workers=workers
+        )
     
     @staticmethod
-    def extract_text_from_pdf(file):
+    def extract_text_from_pdf(file, first_page=1, last_page=None, max_pages=None, workers=0):
         """Extract text from PDF file"""
-        try:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            
-            return text.strip()
-        except Exception as e:
-            raise Exception(f"Error reading PDF: {str(e)}")
+        return "\n".join(
+            FileHandler.iter_pdf_pages(file, first_page, last_page, max_pages, workers)
+        ).strip()
     
     @staticmethod
-    def extract_text_from_docx(file):
-        """Extract text from DOCX file"""
+    def iter_docx_blocks(file):
+        """
+        Yield the text of a DOCX file one paragraph or table row at a time
+        
+        Headers come first and footers last; see docx_reader.iter_docx_blocks.
+        """
+        extractor = get_registry().for_mime(DOCX_MIME)
         try:
-            doc = Document(file)
-            text = ""
-            
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            return text.strip()
+            yield from extractor.iter_blocks(file)
         except Exception as e:
             raise Exception(f"Error reading DOCX: {str(e)}")
     
+    @staticmethod
+    def extract_text_from_docx(file):
+        """Extract text from DOCX file, including tables, headers and footers"""
+        return "\n".join(FileHandler.iter_docx_blocks(file)).strip()
+    
     @staticmethod
     def extract_text_from_txt(file):
-        """Extract text from TXT file"""
-        try:
-            text = file.read().decode('utf-8')
-            return text.strip()
-        except Exception as e:
-            raise Exception(f"Error reading TXT: {str(e)}")
+        """Extract text from TXT file in whatever encoding it was saved in"""
+        return get_registry().for_mime(TEXT_MIME).extract(file)
     
     @staticmethod
-    def extract_text(file, filename):
-        """Extract text from file based on extension"""
-        ext = filename.rsplit('.', 1)[1].lower()
-        
-        if ext == 'pdf':
-            return FileHandler.extract_text_from_pdf(file)
-        elif ext == 'docx':
-            return FileHandler.extract_text_from_docx(file)
-        elif ext == 'txt':
-            return FileHandler.extract_text_from_txt(file)
-        else:
-            raise Exception("Unsupported file type")
+    def extract_text(file, filename, first_page=1, last_page=None, max_pages=None, pdf_workers=0):
+        """
+        Extract text from file with the extractor registered for its type
+        
+        The extension picks the extractor unless the content is clearly
+        another supported format (see ExtractorRegistry.resolve). The page
+        options only apply to PDFs (see iter_pdf_pages).
+        """
+        extractor = get_registry().resolve(file, filename)
+        return extractor.extract(
+            file,
+            first_page=first_page,
+            last_page=last_page,
+            max_pages=max_pages,
+            pdf_workers=pdf_workers
+        )
     
     @staticmethod
     def generate_pdf(original_text, summary, stats):
         """Generate PDF with original text and summary"""
-        buffer = BytesIO()
-        
-        # Create PDF document
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=letter,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=18
-        )
-        
-        # Container for PDF elements
-        elements = []
-        
-        # Define styles
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor='#667eea',
-            spaceAfter=30,
-            alignment=TA_LEFT
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor='#764ba2',
-            spaceAfter=12,
-            spaceBefore=12
-        )
-        
-        body_style = ParagraphStyle(
-            'CustomBody',
-            parent=styles['BodyText'],
-            fontSize=11,
-            alignment=TA_JUSTIFY,
-            spaceAfter=12,
-            leading=16
-        )
+        from pdf_report import write_report
         
-        stats_style = ParagraphStyle(
-            'StatsStyle',
-            parent=styles['BodyText'],
-            fontSize=10,
-            textColor='#666666',
-            spaceAfter=6
-        )
-        
-        # Add title
-        elements.append(Paragraph("📄 Text Summarization Report", title_style))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Add statistics
-        elements.append(Paragraph("📊 Summary Statistics", heading_style))
-        elements.append(Paragraph(f"<b>Original Length:</b> {stats['original_length']} words", stats_style))
-        elements.append(Paragraph(f"<b>Summary Length:</b> {stats['summary_length']} words", stats_style))
-        elements.append(Paragraph(f"<b>Compression Ratio:</b> {stats['compression_ratio']}", stats_style))
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Add summary
-        elements.append(Paragraph("✨ Summary", heading_style))
-        summary_text = summary.replace('\n', '<br/>')
-        elements.append(Paragraph(summary_text, body_style))
-        elements.append(Spacer(1, 0.4*inch))
-        
-        # Add original text
-        elements.append(Paragraph("📝 Original Text", heading_style))
-        
-        # Split original text into paragraphs for better formatting
-        original_paragraphs = original_text.split('\n')
-        for para in original_paragraphs:
-            if para.strip():
-                para_text = para.replace('\n', '<br/>')
-                elements.append(Paragraph(para_text, body_style))
-        
-        # Build PDF
-        doc.build(elements)
-        
-        # Get PDF data
-        pdf_data = buffer.getvalue()
-        buffer.close()
+        buffer = BytesIO()
+        write_report(buffer, original_text, summary, stats)
+        return buffer.getvalue()
+
+    @staticmethod
+    def stream_pdf(original_text, summary, stats):
+        """Generate the same PDF as generate_pdf, yielded in chunks for a streamed response"""
+        from pdf_report import iter_report
         
-        return pdf_data
+        return iter_report(original_text, summary, stats)
     
     @staticmethod
-    def validate_file(file):
-        """Validate uploaded file"""
+    def validate_file(file, max_size=None):
+        """
+        Validate uploaded file
+        
+        Args:
+            file: Uploaded file
+            max_size: Size limit in bytes (default: MAX_FILE_SIZE)
+        """
         if not file:
             raise Exception("No file provided")
         
         if file.filename == '':
             raise Exception("No file selected")
         
-        if not FileHandler.allowed_file(file.filename):
-            raise Exception(f"File type not allowed. Allowed types: {', '.join(FileHandler.ALLOWED_EXTENSIONS)}")
+        # Files without a known extension are accepted if their content is a supported type
+        if not FileHandler.allowed_file(file.filename) and get_registry().for_mime(sniff_mime(file)) is None:
+            raise Exception(f"File type not allowed. Allowed types: {', '.join(get_registry().extensions)}")
         
         # Check file size
         file.seek(0, os.SEEK_END)
         file_size = file.tell()
         file.seek(0)
         
-        if file_size > FileHandler.MAX_FILE_SIZE:
-            raise Exception(f"File size exceeds maximum allowed size of 10MB")
+        max_size = max_size or FileHandler.MAX_FILE_SIZE
+        if file_size > max_size:
+            raise Exception(f"File size exceeds maximum allowed size of {max_size // (1024 * 1024)}MB")
         
         return True
\ No newline at end of file
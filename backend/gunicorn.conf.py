@@ -0,0 +1,30 @@
+"""
+gunicorn settings (from the backend directory):
+    gunicorn -c gunicorn.conf.py app:app
+
+With PRELOAD_MODELS set the app is imported in the master, which loads the
+models before forking, so every worker shares one copy of the weights.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import get_config
+
+settings = get_config()
+
+bind = f"{settings.API_HOST}:{settings.API_PORT}"
+workers = int(os.environ.get('WEB_CONCURRENCY') or 2)
+timeout = int(os.environ.get('GUNICORN_TIMEOUT') or 300)  # Long documents take minutes on CPU
+preload_app = bool(settings.PRELOAD_MODELS)
+
+# Lets /api/memory in a worker find the master and its other workers
+os.environ['GUNICORN_MASTER_PID'] = str(os.getpid())
+
+
+def post_fork(server, worker):
+    """Give each worker its share of the CPU threads (preloading ran torch single-threaded)"""
+    if 'torch' in sys.modules:
+        import torch
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
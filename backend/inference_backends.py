@@ -0,0 +1,198 @@
+"""
+Inference backends for the seq2seq models: fp32, dynamic int8 and ONNX Runtime
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('fp32', 'int8', 'onnx')
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+INT8_WEIGHTS = 'quantized_int8.pt'
+MMAP_WEIGHTS = 'weights_mmap.pt'
+
+
+def registry_key(model_name, backend):
+    """Registry name for a model loaded with a given backend"""
+    return model_name if backend == 'fp32' else f"{model_name}:{backend}"
+
+
+def artifact_dir(model_name, backend, models_dir=MODELS_DIR):
+    """Where prepared artifacts for a model/backend pair live"""
+    return os.path.join(models_dir, f"{model_name.replace('/', '--')}-{backend}")
+
+
+def quantize_int8(model):
+    """Dynamic int8 quantization of every nn.Linear (weights int8, activations fp32)"""
+    import torch
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_onnx_class():
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError:
+        raise Exception(
+            "The 'onnx' backend needs optimum[onnxruntime]: pip install optimum[onnxruntime]"
+        )
+    return ORTModelForSeq2SeqLM
+
+
+def mmap_weights_path(model_name, models_dir=MODELS_DIR):
+    """Prepared fp32 state dict that load_seq2seq can memory-map"""
+    return os.path.join(artifact_dir(model_name, 'mmap', models_dir), MMAP_WEIGHTS)
+
+
+def load_mmap_model(model_name, models_dir=MODELS_DIR):
+    """
+    Build an fp32 model whose weights are pages of a memory-mapped file
+
+    The model is created on the meta device (no weight memory at all) and
+    every parameter is then assigned a tensor backed by the mapped file.
+    The weights live in the page cache, so all processes that map the
+    same file share one copy, forked or not.
+
+    Returns:
+        The model, or None when no mmap artifact has been prepared
+    """
+    import torch
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM
+
+    path = mmap_weights_path(model_name, models_dir)
+    if not os.path.exists(path):
+        return None
+
+    config = AutoConfig.from_pretrained(os.path.dirname(path))
+    with torch.device('meta'):
+        model = AutoModelForSeq2SeqLM.from_config(config)
+    state_dict = torch.load(path, mmap=True, weights_only=True)
+    model.load_state_dict(state_dict, assign=True)
+    model.tie_weights()
+
+    missing = [name for name, tensor in model.state_dict().items() if tensor.is_meta]
+    if missing:
+        raise Exception(f"Memory-mapped weights for {model_name} are missing {', '.join(missing[:5])}")
+    logger.info(f"Memory-mapped fp32 weights from {path}")
+    return model.eval()
+
+
+def load_seq2seq(model_name, backend='fp32', tokenizer_class=None, models_dir=MODELS_DIR, mmap_weights=False):
+    """
+    Load a seq2seq model and tokenizer with the selected backend
+
+    Prepared artifacts in models_dir are used when present; otherwise the
+    backend is built from the original checkpoint at load time.
+
+    Args:
+        model_name: Hugging Face model id
+        backend: 'fp32', 'int8' or 'onnx'
+        tokenizer_class: Tokenizer class (default: AutoTokenizer)
+        models_dir: Directory holding prepared artifacts
+        mmap_weights: For fp32, map the weights from the prepared 'mmap'
+            artifact instead of reading them into process memory
+
+    Returns:
+        (model, tokenizer)
+    """
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM, AutoTokenizer
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Invalid inference backend: {backend}. Use one of {', '.join(BACKENDS)}")
+
+    tokenizer_class = tokenizer_class or AutoTokenizer
+    prepared = artifact_dir(model_name, backend, models_dir)
+    has_artifacts = os.path.isdir(prepared)
+    source = prepared if has_artifacts else model_name
+
+    if backend == 'fp32':
+        model = load_mmap_model(model_name, models_dir) if mmap_weights else None
+        if model is None:
+            if mmap_weights:
+                logger.warning(
+                    f"No memory-mapped weights for {model_name}, loading a private copy. "
+                    f"Run: python prepare_models.py --backend mmap"
+                )
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+            model.eval()
+        return model, tokenizer_class.from_pretrained(model_name)
+
+    if backend == 'int8':
+        import torch
+        if has_artifacts:
+            logger.info(f"Loading prepared int8 weights from {prepared}")
+            model = AutoModelForSeq2SeqLM.from_config(AutoConfig.from_pretrained(prepared))
+            model = quantize_int8(model.eval())
+            model.load_state_dict(torch.load(os.path.join(prepared, INT8_WEIGHTS)))
+        else:
+            logger.info(f"No prepared int8 artifacts for {model_name}, quantizing at load time")
+            model = quantize_int8(AutoModelForSeq2SeqLM.from_pretrained(model_name).eval())
+        model.eval()
+        return model, tokenizer_class.from_pretrained(source)
+
+    # onnx
+    ort_class = _load_onnx_class()
+    if has_artifacts:
+        model = ort_class.from_pretrained(prepared)
+    else:
+        logger.info(f"No prepared ONNX export for {model_name}, exporting at load time")
+        model = ort_class.from_pretrained(model_name, export=True)
+    return model, tokenizer_class.from_pretrained(source)
+
+
+def load_summarization_pipeline(model_name, backend='fp32', models_dir=MODELS_DIR, mmap_weights=False):
+    """Build a Hugging Face summarization pipeline on top of the selected backend"""
+    from transformers import pipeline
+
+    model, tokenizer = load_seq2seq(model_name, backend, models_dir=models_dir, mmap_weights=mmap_weights)
+    return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+
+def prepare_artifacts(model_name, backend, tokenizer_class=None, models_dir=MODELS_DIR):
+    """
+    Write quantized or exported artifacts for a model into models_dir
+
+    backend 'mmap' writes the fp32 weights as a state dict that
+    load_seq2seq(..., mmap_weights=True) maps instead of copying.
+
+    Returns:
+        Path of the artifact directory
+    """
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+    if backend == 'fp32':
+        raise ValueError("fp32 uses the original checkpoint, nothing to prepare")
+    if backend not in BACKENDS + ('mmap',):
+        raise ValueError(f"Invalid inference backend: {backend}. Use one of {', '.join(BACKENDS)}")
+
+    tokenizer_class = tokenizer_class or AutoTokenizer
+    target = artifact_dir(model_name, backend, models_dir)
+    os.makedirs(target, exist_ok=True)
+
+    if backend == 'int8':
+        import torch
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name).eval()
+        model.config.save_pretrained(target)
+        torch.save(quantize_int8(model).state_dict(), os.path.join(target, INT8_WEIGHTS))
+    elif backend == 'onnx':
+        model = _load_onnx_class().from_pretrained(model_name, export=True)
+        model.save_pretrained(target)
+    else:  # mmap
+        import torch
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name).eval()
+        model.config.save_pretrained(target)
+        # torch.save keeps tied tensors as one storage, so they stay shared after mapping
+        torch.save(model.state_dict(), os.path.join(target, MMAP_WEIGHTS))
+
+    tokenizer_class.from_pretrained(model_name).save_pretrained(target)
+    logger.info(f"Prepared {backend} artifacts for {model_name} in {target}")
+    return target
+
+
+def directory_bytes(path):
+    """Total size of the files under path"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
@@ -0,0 +1,406 @@
+"""
+Background jobs for file summarization and large PDF reports
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from uploads import save_upload
+
+logger = logging.getLogger(__name__)
+
+# Progress reported at each stage; summarization reports language_detected and summarizing
+STAGE_PROGRESS = {
+    'queued': 0.0,
+    'extracting': 0.1,
+    'language_detected': 0.3,
+    'summarizing': 0.7,
+    'rendering': 0.5,
+    'done': 1.0
+}
+
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled')
+
+# Seconds between cancellation lookups in a running job
+CANCEL_CHECK_INTERVAL = 1.0
+# Seconds between purges of expired jobs (run on submit and on poll)
+PURGE_INTERVAL = 60.0
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when the job was cancelled"""
+
+
+class JobStore:
+    """SQLite-backed job table shared by the web and worker processes"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    progress REAL NOT NULL,
+                    filename TEXT,
+                    upload_path TEXT,
+                    options TEXT,
+                    result TEXT,
+                    error TEXT,
+                    cancel_requested INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    expires_at REAL
+                )"""
+            )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create(self, filename, upload_path, options):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, stage, progress, filename, upload_path, options, "
+                "created_at, updated_at) VALUES (?, 'queued', 'queued', 0.0, ?, ?, ?, ?, ?)",
+                (job_id, filename, upload_path, json.dumps(options), now, now)
+            )
+        return job_id
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['options'] = json.loads(job['options']) if job['options'] else {}
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        return job
+
+    def update(self, job_id, **fields):
+        fields['updated_at'] = time.time()
+        if 'result' in fields and fields['result'] is not None:
+            fields['result'] = json.dumps(fields['result'], ensure_ascii=False)
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                list(fields.values()) + [job_id]
+            )
+
+    def set_stage(self, job_id, stage, status='running'):
+        self.update(job_id, status=status, stage=stage, progress=STAGE_PROGRESS.get(stage, 0.0))
+
+    def finish(self, job_id, status, ttl, result=None, error=None):
+        fields = {
+            'status': status,
+            'stage': status,
+            'result': result,
+            'error': error,
+            'expires_at': time.time() + ttl
+        }
+        if status == 'completed':
+            fields['progress'] = 1.0
+        self.update(job_id, **fields)
+
+    def request_cancel(self, job_id):
+        self.update(job_id, cancel_requested=1)
+
+    def is_cancel_requested(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def purge_expired(self):
+        """Delete finished jobs past their expiry; returns their upload paths"""
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, upload_path FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (now,)
+            ).fetchall()
+            conn.execute("DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+        return [row['upload_path'] for row in rows if row['upload_path']]
+
+
+# Per-worker-process components, built on the first job the process runs
+_worker_service = None
+_worker_file_handler = None
+
+
+def _get_worker_components(settings):
+    global _worker_service, _worker_file_handler
+    if _worker_service is None:
+        from file_handler import FileHandler
+        from summary_service import build_summary_service
+        import nltk_support
+
+        nltk_support.configure(settings['NLTK_DATA_DIR'], allow_download=settings['NLTK_DOWNLOAD'])
+
+        _worker_service = build_summary_service(settings)
+        _worker_file_handler = FileHandler()
+    return _worker_service, _worker_file_handler
+
+
+def run_file_job(settings, job_id, upload_path, filename, options):
+    """
+    Worker-process entry point: extract, summarize and record the result
+
+    The job runs SummaryService.summarize, so it gets the same beam-search
+    summary (and shares the cache) as /api/summarize. Cancellation is
+    checked at every stage boundary, at most once per CANCEL_CHECK_INTERVAL
+    seconds; a generate call that is already running is not interrupted.
+    """
+    store = JobStore(settings['JOB_DB_PATH'])
+    result_ttl = settings['JOB_RESULT_TTL']
+    last_check = [0.0]
+
+    def check_cancelled(force=False):
+        now = time.monotonic()
+        if not force and now - last_check[0] < CANCEL_CHECK_INTERVAL:
+            return
+        last_check[0] = now
+        if store.is_cancel_requested(job_id):
+            raise JobCancelled()
+
+    def on_stage(stage):
+        check_cancelled()
+        store.set_stage(job_id, stage)
+
+    try:
+        check_cancelled(force=True)
+        service, file_handler = _get_worker_components(settings)
+
+        store.set_stage(job_id, 'extracting')
+        with open(upload_path, 'rb') as f:
+            text = file_handler.extract_text(
+                f,
+                filename,
+                first_page=options.get('first_page', 1),
+                last_page=options.get('last_page'),
+                max_pages=options.get('max_pages')
+            )
+        if not text or len(text.strip()) == 0:
+            raise Exception("No text could be extracted from the file")
+        check_cancelled(force=True)
+
+        result = service.summarize(
+            text,
+            method=options.get('method', 'transformer'),
+            max_length=options.get('max_length', 150),
+            min_length=options.get('min_length', 50),
+            target_lang=options.get('target_lang', 'auto'),
+            multilingual_mode=options.get('multilingual_mode', 'translate'),
+            on_stage=on_stage
+        )
+        if not result:
+            raise Exception("Summarization finished without a result")
+        check_cancelled(force=True)
+
+        # The result may be the cached dict itself; add the job fields to a copy.
+        # The extracted text is not stored: results are returned on every poll
+        result = dict(result, filename=filename)
+        store.finish(job_id, 'completed', result_ttl, result=result)
+
+    except JobCancelled:
+        logger.info(f"Job {job_id} cancelled")
+        store.finish(job_id, 'cancelled', result_ttl)
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {e}")
+        store.finish(job_id, 'failed', result_ttl, error=str(e))
+    finally:
+        if os.path.exists(upload_path):
+            os.remove(upload_path)
+
+
+def run_report_job(settings, job_id, path):
+    """
+    Worker-process entry point: render a PDF report
+
+    The job's payload file (original_text, summary and stats as JSON) is
+    replaced by the rendered PDF, which stays until the job expires.
+    """
+    store = JobStore(settings['JOB_DB_PATH'])
+    result_ttl = settings['JOB_RESULT_TTL']
+    rendered_path = path + '.pdf'
+
+    try:
+        if store.is_cancel_requested(job_id):
+            raise JobCancelled()
+        from pdf_report import write_report
+
+        store.set_stage(job_id, 'rendering')
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        with open(rendered_path, 'wb') as f:
+            write_report(f, payload['original_text'], payload['summary'], payload.get('stats', {}))
+        os.replace(rendered_path, path)
+
+        store.finish(job_id, 'completed', result_ttl, result={
+            'download_url': f'/api/jobs/{job_id}/download',
+            'bytes': os.path.getsize(path)
+        })
+
+    except JobCancelled:
+        logger.info(f"Job {job_id} cancelled")
+        store.finish(job_id, 'cancelled', result_ttl)
+    except Exception as e:
+        logger.error(f"Report job {job_id} failed: {e}")
+        store.finish(job_id, 'failed', result_ttl, error=str(e))
+    finally:
+        if os.path.exists(rendered_path):
+            os.remove(rendered_path)
+
+
+class JobManager:
+    """Submit, track and cancel file summarization and PDF report jobs"""
+
+    def __init__(self, settings):
+        """
+        Args:
+            settings: Mapping of config.py names to values; JOB_DB_PATH,
+                JOB_UPLOAD_DIR, JOB_WORKERS and JOB_RESULT_TTL control the
+                job system and the rest configures the worker summarizers
+        """
+        # Plain dict so it can be pickled to worker processes
+        self.settings = {name: settings[name] for name in settings if name.isupper()}
+        self.store = JobStore(self.settings['JOB_DB_PATH'])
+        self.upload_dir = self.settings['JOB_UPLOAD_DIR']
+        self.workers = self.settings['JOB_WORKERS']
+        self.result_ttl = self.settings['JOB_RESULT_TTL']
+        self._executor = None
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        os.makedirs(self.upload_dir, exist_ok=True)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that holds torch threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def submit_file(self, file, filename, options):
+        """
+        Queue a file upload for summarization
+
+        Args:
+            file: Werkzeug FileStorage; spooled uploads are moved, not copied
+            filename: Original file name (used to pick the extractor)
+            options: method, max_length, min_length, target_lang, multilingual_mode
+
+        Returns:
+            Job id
+        """
+        self.purge_expired()
+        upload_path = os.path.join(self.upload_dir, uuid.uuid4().hex)
+        save_upload(file, upload_path)
+
+        job_id = self.store.create(filename, upload_path, options)
+        future = self._get_executor().submit(
+            run_file_job, self.settings, job_id, upload_path, filename, options
+        )
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._forget(job_id))
+        return job_id
+
+    def submit_report(self, original_text, summary, stats):
+        """
+        Queue a PDF report for rendering in a worker process
+
+        Returns:
+            Job id; the finished job's result has a download_url
+        """
+        self.purge_expired()
+        path = os.path.join(self.upload_dir, uuid.uuid4().hex)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'original_text': original_text, 'summary': summary, 'stats': stats}, f)
+
+        job_id = self.store.create('report.pdf', path, {'kind': 'report'})
+        future = self._get_executor().submit(run_report_job, self.settings, job_id, path)
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._forget(job_id))
+        return job_id
+
+    def report_path(self, job_id):
+        """Path of a completed report job's PDF, or None"""
+        job = self.store.get(job_id)
+        if job is None or job['options'].get('kind') != 'report' or job['status'] != 'completed':
+            return None
+        path = job['upload_path']
+        return path if path and os.path.exists(path) else None
+
+    def _forget(self, job_id):
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def get(self, job_id):
+        """Job record without internal fields, or None"""
+        self.purge_expired(throttled=True)
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        job.pop('upload_path', None)
+        return job
+
+    def cancel(self, job_id):
+        """
+        Cancel a job
+
+        Queued jobs are dropped immediately; running jobs stop at their next
+        stage boundary.
+
+        Returns:
+            Updated job record, or None if the job does not exist
+        """
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        if job['status'] in FINISHED_STATUSES:
+            return self.get(job_id)
+
+        self.store.request_cancel(job_id)
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            self.store.finish(job_id, 'cancelled', self.result_ttl)
+            if job['upload_path'] and os.path.exists(job['upload_path']):
+                os.remove(job['upload_path'])
+        return self.get(job_id)
+
+    def purge_expired(self, throttled=False):
+        """
+        Drop expired jobs and any uploads they left behind
+
+        Args:
+            throttled: Skip the purge if the last one was less than
+                PURGE_INTERVAL seconds ago
+        """
+        now = time.monotonic()
+        with self._lock:
+            if throttled and now - self._last_purge < PURGE_INTERVAL:
+                return
+            self._last_purge = now
+        for path in self.store.purge_expired():
+            if os.path.exists(path):
+                os.remove(path)
@@ -2,11 +2,80 @@
 Language detection and translation utilities
 """
 
-from langdetect import detect, DetectorFactory
-from langdetect.lang_detect_exception import LangDetectException
+from collections import OrderedDict
+import hashlib
+import re
+import threading
 
-# Set seed for consistent results
-DetectorFactory.seed = 0
+_langdetect = None
+
+# Detection reads at most SAMPLE_SPANS spans of SPAN_CHARS characters, spread
+# evenly over the text, so its cost does not grow with the text. (langdetect
+# itself would clean the whole text and then only look at the first 10000
+# characters.)
+SAMPLE_SPANS = 8
+SPAN_CHARS = 400
+SEGMENT_CHARS = 2000
+CACHE_SIZE = 4096
+
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _load_langdetect():
+    """Import langdetect on first use (its language profiles load on the first detect)"""
+    global _langdetect
+    if _langdetect is None:
+        import langdetect
+        from langdetect import DetectorFactory
+        # Set seed for consistent results
+        DetectorFactory.seed = 0
+        _langdetect = langdetect
+    return _langdetect
+
+def sample_text(text, spans=SAMPLE_SPANS, span_chars=SPAN_CHARS):
+    """
+    Evenly spaced spans of text, cut at whitespace, joined by newlines
+
+    Texts shorter than spans * span_chars are returned whole.
+    """
+    if len(text) <= spans * span_chars:
+        return text
+    step = (len(text) - span_chars) / max(1, spans - 1)
+    pieces = []
+    for i in range(spans):
+        start = int(i * step)
+        if start:
+            # Start after the next whitespace so no span begins mid-word
+            space = text.find(' ', start, start + 50)
+            start = space + 1 if space != -1 else start
+        end = text.rfind(' ', start, start + span_chars)
+        pieces.append(text[start:end if end > start else start + span_chars])
+    return '\n'.join(pieces)
+
+def _detect_sample(sample):
+    """(language, confidence) for a bounded sample, cached by its hash"""
+    key = hashlib.blake2b(sample.encode('utf-8'), digest_size=16).digest()
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    langdetect = _load_langdetect()
+    try:
+        best = langdetect.detect_langs(sample)[0]
+        result = (best.lang, round(best.prob, 3))
+    except langdetect.LangDetectException:
+        # Default to English if detection fails
+        result = ('en', 0.0)
+
+    with _cache_lock:
+        _cache[key] = result
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
 
 class LanguageDetector:
     """Detect and manage language operations"""
@@ -53,12 +122,63 @@ class LanguageDetector:
         Returns:
             Language code (e.g., 'en', 'es', 'fr')
         """
-        try:
-            lang_code = detect(text)
-            return lang_code
-        except LangDetectException:
-            # Default to English if detection fails
-            return 'en'
+        return _detect_sample(sample_text(text))[0]
+    
+    @staticmethod
+    def detect_with_confidence(text):
+        """
+        Detect the language of a sample of text
+        
+        Returns:
+            dict with language, confidence (langdetect's probability for
+            it, 0.0 when detection failed) and sampled_chars
+        """
+        sample = sample_text(text)
+        language, confidence = _detect_sample(sample)
+        return {'language': language, 'confidence': confidence, 'sampled_chars': len(sample)}
+    
+    @staticmethod
+    def detect_segments(text, segment_chars=SEGMENT_CHARS):
+        """
+        Label a possibly mixed-language text segment by segment
+        
+        Paragraphs are grouped into segments of about segment_chars, each
+        segment is detected separately, and neighbours in the same
+        language are merged.
+        
+        Returns:
+            List of {'start', 'end', 'language', 'confidence'} with
+            character offsets into text
+        """
+        bounds = []
+        start = 0
+        for match in PARAGRAPH_BREAK.finditer(text):
+            if match.start() - start >= segment_chars:
+                bounds.append((start, match.start()))
+                start = match.end()
+        if start < len(text.rstrip()):
+            bounds.append((start, len(text.rstrip())))
+        
+        segments = []
+        for start, end in bounds:
+            # A paragraph far longer than segment_chars is split at whitespace
+            while end - start > 2 * segment_chars:
+                cut = text.rfind(' ', start, start + segment_chars)
+                cut = cut if cut > start else start + segment_chars
+                segments.append((start, cut))
+                start = cut + 1
+            segments.append((start, end))
+        
+        labelled = []
+        for start, end in segments:
+            language, confidence = _detect_sample(sample_text(text[start:end]))
+            if labelled and labelled[-1]['language'] == language:
+                previous = labelled[-1]
+                previous['confidence'] = min(previous['confidence'], confidence)
+                previous['end'] = end
+            else:
+                labelled.append({'start': start, 'end': end, 'language': language, 'confidence': confidence})
+        return labelled
     
     @staticmethod
     def get_language_name(lang_code):
@@ -0,0 +1,154 @@
+"""
+Hierarchical map-reduce summarization for long documents
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+from chunking import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class MapReduceSummarizer:
+    """
+    Summarize documents longer than one model pass
+
+    The document is packed into token-budgeted chunks, every chunk is
+    summarized (in batches, several batches in parallel), and the joined
+    partial summaries are summarized again, fan_out at a time, until a
+    single pass covers everything.
+    """
+
+    def __init__(
+        self,
+        summarize_batch,
+        count_tokens=None,
+        chunk_tokens=900,
+        fan_out=8,
+        max_workers=2,
+        batch_size=4,
+        max_levels=6
+    ):
+        """
+        Args:
+            summarize_batch: Callable(texts, max_length, min_length) -> list of summaries
+            count_tokens: Callable(list of texts) -> list of token counts
+            chunk_tokens: Token budget for a single model input
+            fan_out: Maximum partial summaries merged by one reduce step
+            max_workers: Batches generated concurrently
+            batch_size: Chunks per generate call
+            max_levels: Safety limit on reduce depth
+        """
+        self.summarize_batch = summarize_batch
+        self.count_tokens = count_tokens or estimate_tokens
+        self.chunk_tokens = chunk_tokens
+        self.fan_out = max(2, fan_out)
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+        self.max_levels = max_levels
+
+    def pack(self, pieces, budget, max_items=None, token_counts=None):
+        """
+        Greedily pack consecutive pieces into groups under a token budget
+
+        Args:
+            pieces: List of text pieces (sentences or partial summaries)
+            budget: Token budget per group
+            max_items: Optional cap on pieces per group
+            token_counts: Token count of each piece, if already known
+
+        Returns:
+            List of joined group strings
+        """
+        groups = []
+        current = []
+        current_tokens = 0
+
+        if token_counts is None:
+            token_counts = self.count_tokens(pieces)
+        for piece, tokens in zip(pieces, token_counts):
+            full = current and (
+                current_tokens + tokens > budget or
+                (max_items is not None and len(current) >= max_items)
+            )
+            if full:
+                groups.append(' '.join(current))
+                current = []
+                current_tokens = 0
+            current.append(piece)
+            current_tokens += tokens
+
+        if current:
+            groups.append(' '.join(current))
+        return groups
+
+    def _map(self, texts, max_length, min_length):
+        """Summarize texts in batches, running up to max_workers batches at once"""
+        batches = [
+            texts[i:i + self.batch_size]
+            for i in range(0, len(texts), self.batch_size)
+        ]
+        if len(batches) == 1 or self.max_workers == 1:
+            results = [self.summarize_batch(batch, max_length, min_length) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as pool:
+                results = list(pool.map(
+                    lambda batch: self.summarize_batch(batch, max_length, min_length),
+                    batches
+                ))
+        return [summary for batch in results for summary in batch]
+
+    def reduce(self, sentences, max_length, min_length, token_counts=None):
+        """
+        Pack sentences into chunks and run the map and reduce levels
+
+        Args:
+            token_counts: Token count of each sentence, if already known
+
+        Returns:
+            Text that fits a single final summarization pass
+        """
+        chunks = self.pack(sentences, self.chunk_tokens, token_counts=token_counts)
+        return self.reduce_chunks(chunks, max_length, min_length)
+
+    def reduce_chunks(self, chunks, max_length, min_length):
+        """
+        Run the map and intermediate reduce levels over prepared chunks
+
+        Args:
+            chunks: Chunks of at most chunk_tokens each (see chunking.TextChunker)
+
+        Returns:
+            Text that fits a single final summarization pass
+        """
+        # Partial summaries must be short enough that fan_out of them fit one pass
+        partial_max = max(32, min(max_length, self.chunk_tokens // self.fan_out))
+        partial_min = min(min_length, partial_max // 2)
+
+        level = 0
+        while len(chunks) > 1 and level < self.max_levels:
+            logger.info(f"Map-reduce level {level}: {len(chunks)} chunks")
+            partials = self._map(chunks, partial_max, partial_min)
+            chunks = self.pack(partials, self.chunk_tokens, max_items=self.fan_out)
+            level += 1
+
+        if len(chunks) > 1:
+            logger.warning(f"Map-reduce stopped after {level} levels with {len(chunks)} chunks")
+
+        return ' '.join(chunks)
+
+    def summarize(self, sentences, max_length, min_length):
+        """
+        Summarize a sentence-split document
+
+        Args:
+            sentences: Document sentences in order
+            max_length: Maximum length of the final summary
+            min_length: Minimum length of the final summary
+
+        Returns:
+            Summary text
+        """
+        final_input = self.reduce(sentences, max_length, min_length)
+        return self.summarize_batch([final_input], max_length, min_length)[0]
@@ -0,0 +1,197 @@
+"""
+Process-wide registry of loaded models
+"""
+
+from contextlib import contextmanager
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_model_bytes(obj):
+    """
+    Estimate the memory held by a loaded model
+
+    Understands torch modules, Hugging Face pipelines (via .model) and
+    tuples/lists of either. Anything else counts as zero.
+    """
+    if obj is None:
+        return 0
+    if isinstance(obj, (tuple, list)):
+        return sum(estimate_model_bytes(item) for item in obj)
+    if hasattr(obj, 'model') and not callable(getattr(obj, 'parameters', None)):
+        return estimate_model_bytes(obj.model)
+
+    parameters = getattr(obj, 'parameters', None)
+    if not callable(parameters):
+        return 0
+    total = sum(p.numel() * p.element_size() for p in parameters())
+    buffers = getattr(obj, 'buffers', None)
+    if callable(buffers):
+        total += sum(b.numel() * b.element_size() for b in buffers())
+    return total
+
+
+class _Entry:
+    """Bookkeeping for one registered model"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.model = None
+        self.bytes = 0
+        self.loaded_at = None
+        self.load_seconds = None
+        self.last_used = 0.0
+        self.in_use = 0
+        self.loads = 0
+
+
+class ModelRegistry:
+    """
+    Keep one loaded copy of each model per process
+
+    Models are loaded on first use under a per-model lock, so concurrent
+    first requests wait for a single load instead of loading twice. When a
+    memory ceiling is set, least recently used models that are not in use
+    are unloaded to make room.
+    """
+
+    def __init__(self, max_memory_bytes=None):
+        self.max_memory_bytes = max_memory_bytes
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def configure(self, max_memory_bytes=None):
+        """Update the memory ceiling (None or 0 disables it)"""
+        self.max_memory_bytes = max_memory_bytes or None
+        self._enforce_ceiling()
+
+    def _entry(self, name):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = self._entries[name] = _Entry()
+            return entry
+
+    def get(self, name, loader):
+        """
+        Return the model registered under name, loading it if needed
+
+        Args:
+            name: Registry key, usually the model id
+            loader: Zero-argument callable that loads the model
+
+        Returns:
+            The loaded model object
+        """
+        entry = self._entry(name)
+        entry.last_used = time.monotonic()
+        if entry.model is not None:
+            return entry.model
+
+        with entry.lock:
+            if entry.model is None:
+                logger.info(f"Loading model {name}...")
+                started = time.monotonic()
+                model = loader()
+                entry.load_seconds = time.monotonic() - started
+                entry.bytes = estimate_model_bytes(model)
+                entry.loaded_at = time.time()
+                entry.loads += 1
+                entry.model = model
+                logger.info(
+                    f"Model {name} loaded in {entry.load_seconds:.1f}s "
+                    f"({entry.bytes / (1024 * 1024):.0f} MB)"
+                )
+            model = entry.model
+
+        self._enforce_ceiling(keep=name)
+        return model
+
+    @contextmanager
+    def use(self, name, loader):
+        """Hold a model for the duration of a block so it cannot be unloaded"""
+        entry = self._entry(name)
+        with self._lock:
+            entry.in_use += 1
+        try:
+            yield self.get(name, loader)
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+
+    def is_loaded(self, name):
+        entry = self._entries.get(name)
+        return entry is not None and entry.model is not None
+
+    def unload(self, name):
+        """Drop a model so its memory can be reclaimed"""
+        entry = self._entries.get(name)
+        if entry is None:
+            return False
+        with entry.lock:
+            if entry.model is None:
+                return False
+            entry.model = None
+            entry.bytes = 0
+        logger.info(f"Unloaded model {name}")
+        return True
+
+    def total_bytes(self):
+        return sum(entry.bytes for entry in list(self._entries.values()))
+
+    def _enforce_ceiling(self, keep=None):
+        """Unload idle models, least recently used first, until under the ceiling"""
+        if not self.max_memory_bytes:
+            return
+        with self._lock:
+            candidates = sorted(
+                (
+                    (entry.last_used, name)
+                    for name, entry in self._entries.items()
+                    if entry.model is not None and entry.in_use == 0 and name != keep
+                )
+            )
+        for _, name in candidates:
+            if self.total_bytes() <= self.max_memory_bytes:
+                break
+            self.unload(name)
+        if self.total_bytes() > self.max_memory_bytes:
+            logger.warning(
+                f"Loaded models use {self.total_bytes() / (1024 * 1024):.0f} MB, "
+                f"above the {self.max_memory_bytes / (1024 * 1024):.0f} MB ceiling"
+            )
+
+    def get_stats(self):
+        """Per-model memory and usage report"""
+        now = time.monotonic()
+        models = {}
+        for name, entry in list(self._entries.items()):
+            models[name] = {
+                'loaded': entry.model is not None,
+                'memory_bytes': entry.bytes,
+                'memory_mb': round(entry.bytes / (1024 * 1024), 1),
+                'load_seconds': entry.load_seconds,
+                'loads': entry.loads,
+                'in_use': entry.in_use,
+                'idle_seconds': round(now - entry.last_used, 1) if entry.last_used else None
+            }
+        return {
+            'models': models,
+            'total_memory_mb': round(self.total_bytes() / (1024 * 1024), 1),
+            'max_memory_mb': (
+                round(self.max_memory_bytes / (1024 * 1024), 1) if self.max_memory_bytes else None
+            )
+        }
+
+
+# Shared by every component in the process
+registry = ModelRegistry()
+
+
+def get_registry():
+    """Return the process-wide model registry"""
+    return registry
@@ -2,34 +2,93 @@
 Multilingual text summarization with translation support - FULLY FIXED
 """
 
-from transformers import pipeline, MBartForConditionalGeneration, MBart50TokenizerFast
 from language_detector import LanguageDetector
 from translator import TextTranslator
+from translation_backends import MBART_LANG_CODES, MBART_MODEL_NAME, MBART_TOKENIZER_LOCK
+from model_registry import get_registry
+from inference_backends import load_seq2seq, registry_key
+from streaming import stream_generate
+from document import Document, as_document
+from chunking import TextChunker, estimate_tokens
+from batching import BatchScheduler
+from map_reduce import MapReduceSummarizer
 import logging
-import re
 
 class MultilingualSummarizer:
     """Handle summarization in multiple languages"""
     
-    def __init__(self):
-        self.translator = TextTranslator()
+    MBART_LANG_CODES = MBART_LANG_CODES
+    
+    # Shared with the mBART translation backend, which uses the same tokenizer
+    _tokenizer_lock = MBART_TOKENIZER_LOCK
+    
+    def __init__(
+        self,
+        summarizer=None,
+        inference_backend='fp32',
+        mmap_weights=False,
+        segment_detection=False,
+        translator=None,
+        translation_chunk_tokens=512,
+        native_chunk_tokens=900,
+        native_beams=4,
+        batching=False,
+        batch_max_wait_ms=20,
+        batch_max_size=8,
+        map_reduce_fan_out=8,
+        map_reduce_workers=2
+    ):
+        self.translator = translator or TextTranslator()
         self.language_detector = LanguageDetector()
         self.logger = logging.getLogger(__name__)
+        self.registry = get_registry()
+        self.inference_backend = inference_backend
+        self.mmap_weights = mmap_weights
+        # Detect each translation chunk's language and leave English chunks as they are
+        self.segment_detection = segment_detection
+        # Translation input is cut at sentence boundaries of any script, under an estimated token budget
+        self.chunker = TextChunker(max_tokens=translation_chunk_tokens)
+        self.mbart_key = registry_key(MBART_MODEL_NAME, inference_backend)
+        
+        # Native mode: long inputs are chunked in mBART tokens and reduced chunk by chunk
+        self.native_chunker = TextChunker(max_tokens=native_chunk_tokens, count_tokens=self._count_mbart_tokens)
+        self.native_beams = native_beams
+        self.batch_max_size = max(1, batch_max_size)
+        self.map_reduce_fan_out = map_reduce_fan_out
+        self.map_reduce_workers = map_reduce_workers
+        # Concurrent native requests with the same target language share padded batches
+        self.batch_scheduler = None
+        if batching:
+            self.batch_scheduler = BatchScheduler(
+                self._generate_mbart_batch,
+                max_wait_ms=batch_max_wait_ms,
+                max_batch_size=batch_max_size,
+                name='mbart'
+            )
         
-        # Multilingual model (lazy loading)
-        self.mbart_model = None
-        self.mbart_tokenizer = None
+        # English summarizer shared across calls (created lazily if not given)
+        self._summarizer = summarizer
+    
+    @property
+    def summarizer(self):
+        """English TextSummarizer reused by every call"""
+        if self._summarizer is None:
+            from summarizer import TextSummarizer
+            self._summarizer = TextSummarizer()
+        return self._summarizer
+    
+    def _load_mbart(self):
+        from transformers import MBart50TokenizerFast
+        return load_seq2seq(
+            MBART_MODEL_NAME,
+            self.inference_backend,
+            MBart50TokenizerFast,
+            mmap_weights=self.mmap_weights
+        )
     
     def _load_mbart_model(self):
-        """Load mBART multilingual model"""
-        if self.mbart_model is None:
-            self.logger.info("Loading mBART multilingual model...")
-            self.mbart_model = MBartForConditionalGeneration.from_pretrained(
-                "facebook/mbart-large-50-many-to-many-mmt"
-            )
-            self.mbart_tokenizer = MBart50TokenizerFast.from_pretrained(
-                "facebook/mbart-large-50-many-to-many-mmt"
-            )
+        """Load mBART multilingual model through the process-wide registry"""
+        return self.registry.get(self.mbart_key, self._load_mbart)
     
     def summarize_multilingual(
         self, 
@@ -43,7 +102,7 @@ class MultilingualSummarizer:
         Summarize text in any language
         
         Args:
-            text: Input text in any language
+            text: Input text in any language (string or Document)
             target_lang: Language for summary output
             method: 'translate' or 'native'
             max_length: Maximum summary length
@@ -53,16 +112,17 @@ class MultilingualSummarizer:
             dict with summary and language info
         """
         try:
-            # Detect input language
-            detected_lang = self.language_detector.detect_language(text)
+            # Language detection runs here only if the caller has not done it
+            document = as_document(text, language_detector=self.language_detector)
+            detected_lang = document.language
             lang_name = self.language_detector.get_language_name(detected_lang)
             
             self.logger.info(f"Detected language: {lang_name} ({detected_lang})")
-            self.logger.info(f"Input text length: {len(text)} chars, {len(text.split())} words")
+            self.logger.info(f"Input text length: {document.char_count} chars, {document.word_count} words")
             
             if method == 'translate':
                 return self._translate_and_summarize(
-                    text, 
+                    document, 
                     detected_lang, 
                     target_lang,
                     max_length,
@@ -70,7 +130,7 @@ class MultilingualSummarizer:
                 )
             else:
                 return self._native_summarize(
-                    text,
+                    document,
                     detected_lang,
                     target_lang,
                     max_length,
@@ -83,89 +143,127 @@ class MultilingualSummarizer:
             self.logger.error(traceback.format_exc())
             raise
     
-    def _chunk_text(self, text, max_words=400):
-        """Split text into manageable chunks"""
-        # Split by sentences
-        sentences = re.split(r'[.!?]+\s+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        chunks = []
-        current_chunk = []
-        current_word_count = 0
-        
-        for sentence in sentences:
-            words_in_sentence = len(sentence.split())
+    def _chunk_text(self, text):
+        """Split text (string or Document) into chunks of whole sentences under the token budget"""
+        return self.chunker.chunk(text)
+    
+    def _translate_to_english(self, document, source_lang):
+        """
+        Translate input to English, chunk by chunk for long texts
+        
+        Returns:
+            Document for the English text (the input itself when it already is English)
+        """
+        text = document.text
+        if source_lang != 'en':
+            self.logger.info(f"Translating from {source_lang} to English...")
             
-            if current_word_count + words_in_sentence > max_words and current_chunk:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = [sentence]
-                current_word_count = words_in_sentence
+            if document.token_count(self.chunker.count_tokens) > self.chunker.max_tokens:
+                self.logger.info("Text is long, chunking for translation...")
+                chunks = self._chunk_text(document)
+                
+                chunk_langs = [source_lang] * len(chunks)
+                if self.segment_detection:
+                    # Mixed-language documents: label each chunk itself
+                    chunk_langs = [self.language_detector.detect_language(chunk) for chunk in chunks]
+                pending = [i for i, lang in enumerate(chunk_langs) if lang != 'en']
+                if len(pending) < len(chunks):
+                    self.logger.info(f"{len(chunks) - len(pending)}/{len(chunks)} chunks are already English, keeping them")
+                
+                # Translated concurrently; results come back in chunk order
+                self.logger.info(f"Translating {len(pending)} chunks...")
+                translations = self.translator.translate_chunks(
+                    [chunks[i] for i in pending],
+                    'en',
+                    [chunk_langs[i] for i in pending]
+                )
+                translated_chunks = list(chunks)
+                for i, translated in zip(pending, translations):
+                    if translated and len(translated.strip()) > 20:
+                        translated_chunks[i] = translated
+                        self.logger.info(f"✓ Chunk {i+1} translated ({len(translated.split())} words)")
+                    else:
+                        self.logger.warning(f"✗ Chunk {i+1} not translated, using original")
+                
+                text_en = ' '.join(translated_chunks)
             else:
-                current_chunk.append(sentence)
-                current_word_count += words_in_sentence
+                try:
+                    text_en = self.translator.translate(text, 'en', source_lang)
+                except Exception as e:
+                    self.logger.error(f"Translation failed: {e}")
+                    return document
+        else:
+            return document
         
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
+        return Document(text_en, language='en')
+    
+    def _translate_summary(self, summary_en, source_lang, target_lang):
+        """
+        Translate an English summary to the target language
+        
+        Returns:
+            (summary, language the summary is actually in)
+        """
+        if target_lang != 'en' and target_lang != source_lang:
+            self.logger.info(f"Translating summary to {target_lang}...")
+            try:
+                summary_final = self.translator.translate(summary_en, target_lang, 'en')
+                if not summary_final or len(summary_final.strip()) < 20:
+                    self.logger.warning("Target translation too short, using English")
+                    summary_final = summary_en
+                    target_lang = 'en'
+                else:
+                    self.logger.info(f"✓ Translated to {target_lang}")
+            except Exception as e:
+                self.logger.error(f"Target translation failed: {e}")
+                summary_final = summary_en
+                target_lang = 'en'
+                
+        elif target_lang == source_lang and source_lang != 'en':
+            self.logger.info(f"Translating summary back to {source_lang}...")
+            try:
+                summary_final = self.translator.translate(summary_en, source_lang, 'en')
+                if not summary_final or len(summary_final.strip()) < 20:
+                    self.logger.warning("Back-translation too short, using English")
+                    summary_final = summary_en
+                    target_lang = 'en'
+                else:
+                    self.logger.info(f"✓ Translated back to {source_lang}")
+            except Exception as e:
+                self.logger.error(f"Back-translation failed: {e}")
+                summary_final = summary_en
+                target_lang = 'en'
+        else:
+            summary_final = summary_en
         
-        self.logger.info(f"Split into {len(chunks)} chunks")
-        return chunks
+        return summary_final, target_lang
     
     def _translate_and_summarize(
         self,
-        text,
+        document,
         source_lang,
         target_lang,
         max_length,
         min_length
     ):
         """Translate, summarize, and translate back"""
-        from summarizer import TextSummarizer
-        summarizer = TextSummarizer()
+        summarizer = self.summarizer
         
-        word_count = len(text.split())
+        word_count = document.word_count
         self.logger.info(f"Starting summarization: {word_count} words")
         
         # STEP 1: Translate to English if needed
-        if source_lang != 'en':
-            self.logger.info(f"Translating from {source_lang} to English...")
-            
-            if word_count > 500:
-                self.logger.info("Text is long, chunking for translation...")
-                chunks = self._chunk_text(text, max_words=400)
-                translated_chunks = []
-                
-                for i, chunk in enumerate(chunks):
-                    self.logger.info(f"Translating chunk {i+1}/{len(chunks)} ({len(chunk.split())} words)...")
-                    try:
-                        translated = self.translator.translate(chunk, 'en', source_lang)
-                        if translated and len(translated.strip()) > 20:
-                            translated_chunks.append(translated)
-                            self.logger.info(f"✓ Chunk {i+1} translated ({len(translated.split())} words)")
-                        else:
-                            self.logger.warning(f"✗ Chunk {i+1} translation too short, using original")
-                            translated_chunks.append(chunk)
-                    except Exception as e:
-                        self.logger.error(f"✗ Chunk {i+1} translation failed: {e}")
-                        translated_chunks.append(chunk)
-                
-                text_en = ' '.join(translated_chunks)
-            else:
-                try:
-                    text_en = self.translator.translate(text, 'en', source_lang)
-                except Exception as e:
-                    self.logger.error(f"Translation failed: {e}")
-                    text_en = text
-        else:
-            text_en = text
+        english = self._translate_to_english(document, source_lang)
         
         # VALIDATE: Ensure we have content
-        text_en_words = len(text_en.split())
+        text_en_words = english.word_count
         self.logger.info(f"English text ready: {text_en_words} words")
         
         if text_en_words < 30:
             self.logger.error(f"Text too short after translation: {text_en_words} words")
-            text_en = text  # Use original
+            english = document  # Use original
             text_en_words = word_count
+        text_en = english.text
         
         # STEP 2: Summarize in English
         self.logger.info(f"Generating summary from {text_en_words} words...")
@@ -175,7 +273,7 @@ class MultilingualSummarizer:
                 self.logger.info("Using two-stage summarization...")
                 # Stage 1: Extractive reduction
                 intermediate = summarizer.summarize(
-                    text_en,
+                    english,
                     method='extractive',
                     max_length=350,
                     min_length=100
@@ -192,7 +290,7 @@ class MultilingualSummarizer:
             else:
                 # Direct summarization
                 summary_en = summarizer.summarize(
-                    text_en,
+                    english,
                     method='transformer',
                     max_length=max_length,
                     min_length=min_length
@@ -207,7 +305,7 @@ class MultilingualSummarizer:
             self.logger.info("Falling back to extractive...")
             try:
                 summary_en = summarizer.summarize(
-                    text_en,
+                    english,
                     method='extractive',
                     max_length=max_length,
                     min_length=min_length
@@ -230,37 +328,7 @@ class MultilingualSummarizer:
             self.logger.warning(f"Using fallback summary: {summary_en[:100]}...")
         
         # STEP 3: Translate summary to target language
-        if target_lang != 'en' and target_lang != source_lang:
-            self.logger.info(f"Translating summary to {target_lang}...")
-            try:
-                summary_final = self.translator.translate(summary_en, target_lang, 'en')
-                if not summary_final or len(summary_final.strip()) < 20:
-                    self.logger.warning("Target translation too short, using English")
-                    summary_final = summary_en
-                    target_lang = 'en'
-                else:
-                    self.logger.info(f"✓ Translated to {target_lang}")
-            except Exception as e:
-                self.logger.error(f"Target translation failed: {e}")
-                summary_final = summary_en
-                target_lang = 'en'
-                
-        elif target_lang == source_lang and source_lang != 'en':
-            self.logger.info(f"Translating summary back to {source_lang}...")
-            try:
-                summary_final = self.translator.translate(summary_en, source_lang, 'en')
-                if not summary_final or len(summary_final.strip()) < 20:
-                    self.logger.warning("Back-translation too short, using English")
-                    summary_final = summary_en
-                    target_lang = 'en'
-                else:
-                    self.logger.info(f"✓ Translated back to {source_lang}")
-            except Exception as e:
-                self.logger.error(f"Back-translation failed: {e}")
-                summary_final = summary_en
-                target_lang = 'en'
-        else:
-            summary_final = summary_en
+        summary_final, target_lang = self._translate_summary(summary_en, source_lang, target_lang)
         
         # FINAL VALIDATION
         final_words = len(summary_final.split())
@@ -270,72 +338,236 @@ class MultilingualSummarizer:
         if not summary_final or final_words < 5:
             raise Exception("Failed to generate valid summary")
         
-        return {
-            'summary': summary_final,
-            'source_language': source_lang,
-            'source_language_name': self.language_detector.get_language_name(source_lang),
-            'target_language': target_lang,
-            'target_language_name': self.language_detector.get_language_name(target_lang),
-            'method': 'translate',
-            'original_length': word_count,
-            'summary_length': final_words
-        }
+        return self._build_result(summary_final, source_lang, target_lang, 'translate', word_count)
     
     def _native_summarize(
         self,
-        text,
+        document,
         source_lang,
         target_lang,
         max_length,
         min_length
     ):
-        """Summarize directly using mBART"""
-        self._load_mbart_model()
-        
-        lang_map = {
-            'en': 'en_XX', 'es': 'es_XX', 'fr': 'fr_XX', 'de': 'de_DE',
-            'it': 'it_IT', 'pt': 'pt_XX', 'ru': 'ru_RU', 'zh-cn': 'zh_CN',
-            'ja': 'ja_XX', 'ko': 'ko_KR', 'ar': 'ar_AR', 'hi': 'hi_IN',
-            'tr': 'tr_TR', 'nl': 'nl_XX', 'pl': 'pl_PL'
-        }
+        """Summarize directly using mBART, map-reducing inputs longer than one pass"""
+        text = self._native_input(document, source_lang, max_length, min_length)
+        summary = self._mbart_summarize([text], source_lang, target_lang, max_length, min_length)[0]
+        return self._build_result(summary, source_lang, target_lang, 'native', document.word_count)
+    
+    def _count_mbart_tokens(self, texts):
+        """Count mBART tokens for a list of texts"""
+        _, mbart_tokenizer = self._load_mbart_model()
+        # The tokenizer is shared with generation and translation threads
+        with self._tokenizer_lock:
+            encoded = mbart_tokenizer(list(texts), add_special_tokens=False)
+        return [len(ids) for ids in encoded['input_ids']]
+    
+    def _native_input(self, document, source_lang, max_length, min_length):
+        """
+        Bring a long document down to one mBART pass
         
-        mbart_src = lang_map.get(source_lang, 'en_XX')
-        mbart_tgt = lang_map.get(target_lang, 'en_XX')
+        The document is chunked at sentence boundaries under
+        native_chunk_tokens, and the chunks are summarized and merged (in
+        the source language) by MapReduceSummarizer until one pass covers
+        everything.
+        """
+        if document.token_count(self._count_mbart_tokens) <= self.native_chunker.max_tokens:
+            return document.text
         
-        self.mbart_tokenizer.src_lang = mbart_src
-        encoded = self.mbart_tokenizer(
-            text,
-            return_tensors="pt",
-            max_length=1024,
-            truncation=True
+        chunks = self.native_chunker.chunk(document)
+        self.logger.info(f"Text too long for one mBART pass, map-reducing {len(chunks)} chunks...")
+        map_reduce = MapReduceSummarizer(
+            lambda texts, max_len, min_len: self._mbart_summarize(texts, source_lang, source_lang, max_len, min_len),
+            count_tokens=self._count_mbart_tokens,
+            chunk_tokens=self.native_chunker.max_tokens,
+            fan_out=self.map_reduce_fan_out,
+            max_workers=self.map_reduce_workers,
+            batch_size=self.batch_max_size
         )
+        return map_reduce.reduce_chunks(chunks, max_length, min_length)
+    
+    def _mbart_summarize(self, texts, source_lang, target_lang, max_length, min_length):
+        """
+        Summarize texts with mBART, through the cross-request batcher when enabled
         
-        generated = self.mbart_model.generate(
-            **encoded,
-            forced_bos_token_id=self.mbart_tokenizer.lang_code_to_id[mbart_tgt],
-            max_length=max_length,
-            min_length=min_length,
-            num_beams=4,
-            length_penalty=2.0,
-            early_stopping=True
-        )
+        Returns:
+            List of summaries in input order
+        """
+        items = [(text, source_lang) for text in texts]
+        if self.batch_scheduler is None:
+            return self._generate_mbart_batch(items, max_length, min_length, target_lang=target_lang)
+        futures = [
+            self.batch_scheduler.submit(item, max_length, min_length, length, target_lang=target_lang)
+            for item, length in zip(items, estimate_tokens(texts))
+        ]
+        return [future.result(timeout=self.batch_scheduler.result_timeout) for future in futures]
+    
+    def _generate_mbart_batch(self, items, max_length, min_length, target_lang='en'):
+        """
+        Run one padded mBART generate call
         
-        summary = self.mbart_tokenizer.batch_decode(
-            generated,
-            skip_special_tokens=True
-        )[0]
+        Args:
+            items: (text, source language) pairs; sources may differ because
+                each input is tokenized with its own language code
+            target_lang: Output language, shared by the batch (forced BOS token)
         
+        Returns:
+            List of summaries in input order
+        """
+        mbart_tgt = self.MBART_LANG_CODES.get(target_lang, 'en_XX')
+        
+        with self.registry.use(self.mbart_key, self._load_mbart) as (mbart_model, mbart_tokenizer):
+            with self._tokenizer_lock:
+                features = []
+                for text, source_lang in items:
+                    mbart_tokenizer.src_lang = self.MBART_LANG_CODES.get(source_lang, 'en_XX')
+                    features.append(mbart_tokenizer(text, max_length=1024, truncation=True))
+            encoded = mbart_tokenizer.pad(features, return_tensors="pt")
+            
+            generated = mbart_model.generate(
+                **encoded,
+                forced_bos_token_id=mbart_tokenizer.lang_code_to_id[mbart_tgt],
+                max_length=max_length,
+                min_length=min_length,
+                num_beams=self.native_beams,
+                length_penalty=2.0,
+                early_stopping=True
+            )
+            
+            return mbart_tokenizer.batch_decode(
+                generated,
+                skip_special_tokens=True
+            )
+    
+    def _build_result(self, summary, source_lang, target_lang, method, original_length):
         return {
             'summary': summary,
             'source_language': source_lang,
             'source_language_name': self.language_detector.get_language_name(source_lang),
             'target_language': target_lang,
             'target_language_name': self.language_detector.get_language_name(target_lang),
-            'method': 'native',
-            'original_length': len(text.split()),
+            'method': method,
+            'original_length': original_length,
             'summary_length': len(summary.split())
         }
     
+    def stream_multilingual(
+        self,
+        text,
+        source_lang,
+        target_lang='en',
+        method='translate',
+        max_length=150,
+        min_length=50
+    ):
+        """
+        Streaming counterpart of summarize_multilingual
+        
+        Args:
+            text: Input text (string or Document)
+            source_lang: Language already detected by the caller
+            target_lang: Language for summary output
+            method: 'translate' or 'native'
+            
+        Yields:
+            stage and token events, then {'event': 'result', 'result': {...}}
+            carrying the same fields summarize_multilingual returns
+        """
+        document = as_document(text, language=source_lang)
+        if method == 'translate':
+            yield from self._stream_translate_and_summarize(
+                document, source_lang, target_lang, max_length, min_length
+            )
+        else:
+            yield from self._stream_native(
+                document, source_lang, target_lang, max_length, min_length
+            )
+    
+    def _stream_translate_and_summarize(self, document, source_lang, target_lang, max_length, min_length):
+        summarizer = self.summarizer
+        
+        english = self._translate_to_english(document, source_lang)
+        if english.word_count < 30:
+            english = document
+        text_en = english.text
+        if source_lang != 'en':
+            yield {'event': 'stage', 'stage': 'translation_done', 'words': english.word_count}
+        
+        model_input = english
+        if english.word_count > 700:
+            model_input = summarizer.summarize(english, method='extractive')
+            yield {'event': 'stage', 'stage': 'extractive_reduction_done', 'words': len(model_input.split())}
+        
+        pieces = []
+        try:
+            for event in summarizer.stream_summarize(
+                model_input,
+                max_length=max_length,
+                min_length=min_length
+            ):
+                if event['event'] == 'token':
+                    pieces.append(event['text'])
+                yield event
+        except Exception as e:
+            self.logger.error(f"Streaming summarization failed: {e}")
+            if pieces:
+                raise
+            fallback = summarizer.summarize(english, method='extractive')
+            pieces.append(fallback)
+            yield {'event': 'token', 'text': fallback}
+        
+        summary_en = ''.join(pieces).strip()
+        if not summary_en or len(summary_en) < 20:
+            sentences = text_en.split('.')[:5]
+            summary_en = '. '.join([s.strip() for s in sentences if s.strip()]) + '.'
+        
+        summary_final, target_lang = self._translate_summary(summary_en, source_lang, target_lang)
+        if summary_final != summary_en:
+            yield {'event': 'stage', 'stage': 'summary_translated', 'language': target_lang}
+        
+        yield {
+            'event': 'result',
+            'result': self._build_result(summary_final, source_lang, target_lang, 'translate', document.word_count)
+        }
+    
+    def _stream_native(self, document, source_lang, target_lang, max_length, min_length):
+        mbart_src = self.MBART_LANG_CODES.get(source_lang, 'en_XX')
+        mbart_tgt = self.MBART_LANG_CODES.get(target_lang, 'en_XX')
+        pieces = []
+        
+        text = self._native_input(document, source_lang, max_length, min_length)
+        if text is not document.text:
+            yield {'event': 'stage', 'stage': 'map_reduce_done', 'words': len(text.split())}
+        
+        with self.registry.use(self.mbart_key, self._load_mbart) as (mbart_model, mbart_tokenizer):
+            with self._tokenizer_lock:
+                mbart_tokenizer.src_lang = mbart_src
+                encoded = mbart_tokenizer(
+                    text,
+                    return_tensors="pt",
+                    max_length=1024,
+                    truncation=True
+                )
+            
+            for piece in stream_generate(
+                mbart_model,
+                mbart_tokenizer,
+                encoded,
+                forced_bos_token_id=mbart_tokenizer.lang_code_to_id[mbart_tgt],
+                max_length=max_length,
+                min_length=min_length,
+                num_beams=1,
+                do_sample=False
+            ):
+                pieces.append(piece)
+                yield {'event': 'token', 'text': piece}
+        
+        yield {
+            'event': 'result',
+            'result': self._build_result(
+                ''.join(pieces).strip(), source_lang, target_lang, 'native', document.word_count
+            )
+        }
+    
     def translate_text(self, text, target_lang, source_lang='auto'):
         """Translation wrapper"""
         return self.translator.translate(text, target_lang, source_lang)
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+NLTK data from a bundled local directory, imported on first use
+
+Importing nltk costs about two seconds (it pulls in scipy.stats), so
+nothing here imports it until a sentence tokenizer or stopword list is
+actually needed. Missing data is an error unless downloads were allowed
+with configure(); there is no network access by default.
+"""
+
+import logging
+import os
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nltk_data')
+
+_data_dir = None
+_allow_download = False
+_ready = set()
+_stop_words = {}
+_sentence_tokenizer = None
+_lock = threading.Lock()
+
+
+def configure(data_dir=None, allow_download=False):
+    """
+    Set where NLTK data is read from
+
+    Args:
+        data_dir: Directory searched before NLTK's default locations. It is
+            also exported as NLTK_DATA so spawned worker processes use it.
+        allow_download: Download missing resources into data_dir
+    """
+    global _data_dir, _allow_download
+    _data_dir = data_dir
+    _allow_download = allow_download
+    if data_dir:
+        os.environ['NLTK_DATA'] = data_dir
+        if 'nltk' in sys.modules:
+            # nltk was already imported and read NLTK_DATA; add the directory now
+            import nltk
+            if data_dir not in nltk.data.path:
+                nltk.data.path.insert(0, data_dir)
+
+
+def _punkt_package():
+    """NLTK 3.9 moved sentence tokenization to the pickle-free punkt_tab data"""
+    import nltk
+    version = tuple(int(part) for part in nltk.__version__.split('.')[:2] if part.isdigit())
+    return 'punkt_tab' if version >= (3, 9) else 'punkt'
+
+
+def ensure(resource, package):
+    """
+    Make sure an NLTK resource can be loaded
+
+    Args:
+        resource: nltk.data path, e.g. 'corpora/stopwords'
+        package: Downloader package that provides it
+
+    Raises:
+        LookupError: Not installed and downloads are not allowed
+    """
+    if resource in _ready:
+        return
+    import nltk
+
+    with _lock:
+        if resource in _ready:
+            return
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            target = _data_dir or DEFAULT_DATA_DIR
+            if not _allow_download:
+                raise LookupError(
+                    f"NLTK data '{package}' is not installed. "
+                    f"Run: python -m nltk.downloader -d {target} {package}"
+                )
+            logger.warning(f"NLTK data '{package}' not found, downloading to {target}...")
+            nltk.download(package, download_dir=target, quiet=True)
+            if target not in nltk.data.path:
+                nltk.data.path.insert(0, target)
+            nltk.data.find(resource)
+        _ready.add(resource)
+
+
+def sent_tokenize(text):
+    """nltk.tokenize.sent_tokenize, importing NLTK and checking punkt on first use"""
+    package = _punkt_package()
+    ensure(f'tokenizers/{package}', package)
+    from nltk.tokenize import sent_tokenize as nltk_sent_tokenize
+    return nltk_sent_tokenize(text)
+
+
+def sentence_spans(text):
+    """(start, end) offsets of the sentences sent_tokenize would return"""
+    global _sentence_tokenizer
+    if _sentence_tokenizer is None:
+        package = _punkt_package()
+        ensure(f'tokenizers/{package}', package)
+        if package == 'punkt_tab':
+            from nltk.tokenize.punkt import PunktTokenizer
+            _sentence_tokenizer = PunktTokenizer('english')
+        else:
+            import nltk
+            _sentence_tokenizer = nltk.data.load('tokenizers/punkt/english.pickle')
+    return list(_sentence_tokenizer.span_tokenize(text))
+
+
+def stop_words(language='english'):
+    """Stopword set for a language (loaded once per process)"""
+    words = _stop_words.get(language)
+    if words is None:
+        ensure('corpora/stopwords', 'stopwords')
+        from nltk.corpus import stopwords
+        words = _stop_words[language] = frozenset(stopwords.words(language))
+    return words
@@ -0,0 +1,194 @@
+"""
+PDF summary reports: shared styles, bulk body layout and streamed output
+"""
+
+from functools import lru_cache
+from queue import Full, Queue
+from xml.sax.saxutils import escape
+import logging
+import threading
+
+from reportlab.lib.enums import TA_JUSTIFY, TA_LEFT
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+logger = logging.getLogger(__name__)
+
+# Body text is laid out in Paragraph blocks of about this many characters.
+# One Paragraph per line costs a parse per line; one huge Paragraph is split
+# across pages in quadratic time. Bounded blocks keep layout linear.
+BLOCK_CHARS = 3000
+
+
+@lru_cache(maxsize=1)
+def report_styles():
+    """Paragraph styles for the report, built once per process"""
+    styles = getSampleStyleSheet()
+    body = ParagraphStyle(
+        'CustomBody',
+        parent=styles['BodyText'],
+        fontSize=11,
+        alignment=TA_JUSTIFY,
+        spaceAfter=12,
+        leading=16
+    )
+    return {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor='#667eea',
+            spaceAfter=30,
+            alignment=TA_LEFT
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor='#764ba2',
+            spaceAfter=12,
+            spaceBefore=12
+        ),
+        'body': body,
+        # Used for every block of a long paragraph except its last
+        'body_continued': ParagraphStyle('CustomBodyContinued', parent=body, spaceAfter=0),
+        'stats': ParagraphStyle(
+            'StatsStyle',
+            parent=styles['BodyText'],
+            fontSize=10,
+            textColor='#666666',
+            spaceAfter=6
+        )
+    }
+
+
+def body_blocks(text, block_chars=BLOCK_CHARS):
+    """
+    Split text into (markup, is_paragraph_end) blocks for Paragraph layout
+
+    Each non-empty line is a paragraph, as before. Paragraphs longer than
+    block_chars are cut at whitespace into several blocks.
+    """
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        while len(line) > block_chars:
+            cut = line.rfind(' ', 0, block_chars)
+            if cut <= 0:
+                cut = block_chars
+            yield escape(line[:cut]), False
+            line = line[cut:].lstrip()
+        if line:
+            yield escape(line), True
+
+
+def report_elements(original_text, summary, stats):
+    """Platypus flowables for a summary report"""
+    styles = report_styles()
+    elements = [
+        Paragraph("📄 Text Summarization Report", styles['title']),
+        Spacer(1, 0.2 * inch),
+        Paragraph("📊 Summary Statistics", styles['heading']),
+        Paragraph(f"<b>Original Length:</b> {stats.get('original_length', '-')} words", styles['stats']),
+        Paragraph(f"<b>Summary Length:</b> {stats.get('summary_length', '-')} words", styles['stats']),
+        Paragraph(f"<b>Compression Ratio:</b> {stats.get('compression_ratio', '-')}", styles['stats']),
+        Spacer(1, 0.3 * inch),
+        Paragraph("✨ Summary", styles['heading']),
+        Paragraph(escape(summary).replace('\n', '<br/>'), styles['body']),
+        Spacer(1, 0.4 * inch),
+        Paragraph("📝 Original Text", styles['heading'])
+    ]
+    for markup, paragraph_end in body_blocks(original_text):
+        elements.append(Paragraph(markup, styles['body'] if paragraph_end else styles['body_continued']))
+    return elements
+
+
+def write_report(output, original_text, summary, stats):
+    """Render a report into a writable binary file object"""
+    doc = SimpleDocTemplate(
+        output,
+        pagesize=letter,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=18
+    )
+    doc.build(report_elements(original_text, summary, stats))
+
+
+CHUNK_BYTES = 64 * 1024
+
+
+class _QueueWriter:
+    """File object that hands what is written to a bounded queue in small chunks"""
+
+    def __init__(self, queue, cancelled):
+        self.queue = queue
+        self.cancelled = cancelled
+
+    def put(self, item):
+        while True:
+            if self.cancelled.is_set():
+                raise Exception("PDF download cancelled")
+            try:
+                self.queue.put(item, timeout=0.5)
+                return
+            except Full:
+                continue
+
+    def write(self, data):
+        view = memoryview(data)
+        for offset in range(0, len(view), CHUNK_BYTES):
+            self.put(bytes(view[offset:offset + CHUNK_BYTES]))
+        return len(view)
+
+    def flush(self):
+        pass
+
+
+_DONE = object()
+
+
+def iter_report(original_text, summary, stats, max_pending_chunks=16):
+    """
+    Render a report in a background thread and yield its bytes in chunks
+
+    reportlab serializes the finished document in one write, so the first
+    chunk arrives once layout is done. The bytes then go to the client in
+    CHUNK_BYTES pieces through a bounded queue, with no BytesIO copy of the
+    whole file. If the client goes away, rendering stops at the next chunk.
+    """
+    queue = Queue(maxsize=max_pending_chunks)
+    cancelled = threading.Event()
+    writer = _QueueWriter(queue, cancelled)
+    failure = []
+
+    def render():
+        try:
+            write_report(writer, original_text, summary, stats)
+        except Exception as e:
+            if not cancelled.is_set():
+                logger.error(f"PDF generation failed: {e}")
+                failure.append(e)
+        finally:
+            try:
+                writer.put(_DONE)
+            except Exception:
+                pass
+
+    thread = threading.Thread(target=render, daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk = queue.get()
+            if chunk is _DONE:
+                break
+            yield chunk
+    finally:
+        cancelled.set()
+    thread.join()
+    if failure:
+        raise failure[0]
@@ -0,0 +1,162 @@
+"""
+Prepare quantized/ONNX model artifacts and compare them against fp32
+
+Usage (from the backend directory):
+    python prepare_models.py --backend int8
+    python prepare_models.py --backend all --model bart --compare
+    python prepare_models.py --backend mmap     # fp32 weights for MMAP_WEIGHTS
+"""
+
+import argparse
+import difflib
+import json
+import os
+import re
+import time
+
+from inference_backends import (
+    BACKENDS, MODELS_DIR, artifact_dir, directory_bytes, load_seq2seq, prepare_artifacts
+)
+from model_registry import estimate_model_bytes
+
+MODELS = {
+    'bart': 'facebook/bart-large-cnn',
+    'mbart': 'facebook/mbart-large-50-many-to-many-mmt'
+}
+
+SAMPLE_TEXTS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'sample_texts.txt'
+)
+
+
+def load_samples(path=SAMPLE_TEXTS):
+    """Return the '## Sample' sections of the sample text file"""
+    with open(path, encoding='utf-8') as f:
+        content = f.read()
+    sections = re.split(r'^## .*$', content, flags=re.MULTILINE)[1:]
+    return [section.strip() for section in sections if section.strip()]
+
+
+def _tokenizer_class(model_key):
+    if model_key == 'mbart':
+        from transformers import MBart50TokenizerFast
+        return MBart50TokenizerFast
+    return None
+
+
+def _summarize(model_key, model, tokenizer, text, max_length=150, min_length=50):
+    """One summary with the same generation settings the app uses"""
+    kwargs = {}
+    if model_key == 'mbart':
+        tokenizer.src_lang = 'en_XX'
+        kwargs['forced_bos_token_id'] = tokenizer.lang_code_to_id['en_XX']
+    encoded = tokenizer(text, return_tensors='pt', max_length=1024, truncation=True)
+    generated = model.generate(
+        **encoded,
+        max_length=max_length,
+        min_length=min_length,
+        num_beams=4,
+        early_stopping=True,
+        **kwargs
+    )
+    return tokenizer.batch_decode(generated, skip_special_tokens=True)[0]
+
+
+def _model_bytes(model, model_name, backend):
+    if backend == 'onnx':
+        return directory_bytes(artifact_dir(model_name, backend))
+    return estimate_model_bytes(model)
+
+
+def compare(model_key, backends, samples):
+    """
+    Measure latency, model memory and output drift for each backend
+
+    Drift is reported as the mean token-level similarity to the fp32 summary
+    (1.0 = identical) and the share of samples with identical output.
+    """
+    model_name = MODELS[model_key]
+    report = {}
+    reference = None
+
+    for backend in ['fp32'] + [b for b in backends if b != 'fp32']:
+        load_started = time.perf_counter()
+        model, tokenizer = load_seq2seq(model_name, backend, _tokenizer_class(model_key))
+        load_seconds = time.perf_counter() - load_started
+
+        summaries = []
+        latencies = []
+        for text in samples:
+            started = time.perf_counter()
+            summaries.append(_summarize(model_key, model, tokenizer, text))
+            latencies.append(time.perf_counter() - started)
+
+        if reference is None:
+            reference = summaries
+
+        similarities = [
+            difflib.SequenceMatcher(None, ref.split(), out.split()).ratio()
+            for ref, out in zip(reference, summaries)
+        ]
+        report[backend] = {
+            'load_seconds': round(load_seconds, 2),
+            'mean_latency_seconds': round(sum(latencies) / len(latencies), 3),
+            'model_memory_mb': round(_model_bytes(model, model_name, backend) / (1024 * 1024), 1),
+            'mean_similarity_to_fp32': round(sum(similarities) / len(similarities), 3),
+            'identical_to_fp32': round(
+                sum(ref == out for ref, out in zip(reference, summaries)) / len(summaries), 3
+            )
+        }
+        del model
+
+    fp32_latency = report['fp32']['mean_latency_seconds']
+    for stats in report.values():
+        stats['speedup_vs_fp32'] = round(fp32_latency / stats['mean_latency_seconds'], 2)
+    return report
+
+
+def print_report(model_key, report):
+    print(f"\n{MODELS[model_key]}")
+    print(f"{'backend':<8} {'latency(s)':>11} {'speedup':>8} {'memory(MB)':>11} {'similarity':>11} {'identical':>10}")
+    for backend, stats in report.items():
+        print(
+            f"{backend:<8} {stats['mean_latency_seconds']:>11.3f} {stats['speedup_vs_fp32']:>8.2f} "
+            f"{stats['model_memory_mb']:>11.1f} {stats['mean_similarity_to_fp32']:>11.3f} "
+            f"{stats['identical_to_fp32']:>10.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=['int8', 'onnx', 'mmap', 'all'], default='int8')
+    parser.add_argument('--model', choices=list(MODELS) + ['all'], default='all')
+    parser.add_argument('--compare', action='store_true', help='Benchmark against fp32 on the sample texts')
+    parser.add_argument('--skip-prepare', action='store_true', help='Only run the comparison')
+    parser.add_argument('--report', default=os.path.join(MODELS_DIR, 'backend_report.json'))
+    args = parser.parse_args()
+
+    backends = [b for b in BACKENDS if b != 'fp32'] if args.backend == 'all' else [args.backend]
+    model_keys = list(MODELS) if args.model == 'all' else [args.model]
+
+    if not args.skip_prepare:
+        for model_key in model_keys:
+            for backend in backends:
+                print(f"Preparing {backend} artifacts for {MODELS[model_key]}...")
+                path = prepare_artifacts(MODELS[model_key], backend, _tokenizer_class(model_key))
+                print(f"  -> {path} ({directory_bytes(path) / (1024 * 1024):.0f} MB)")
+
+    if args.compare:
+        samples = load_samples()
+        full_report = {}
+        # mmap holds the fp32 weights unchanged, so there is nothing to compare
+        compared = [b for b in backends if b in BACKENDS]
+        for model_key in model_keys:
+            full_report[MODELS[model_key]] = compare(model_key, compared, samples)
+            print_report(model_key, full_report[MODELS[model_key]])
+        with open(args.report, 'w') as f:
+            json.dump(full_report, f, indent=2)
+        print(f"\nReport written to {args.report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Shared versus unique memory of the server processes (Linux /proc)
+
+Usage (from the backend directory):
+    python process_memory.py <gunicorn master pid>
+    python process_memory.py <pid> --json memory.json
+
+Weights loaded in the gunicorn master before it forks, or mapped from a
+file, are counted as shared in every worker. Unique memory is what a
+worker would free if it exited; the PSS total is what the whole server
+really uses.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+MB = 1024 * 1024
+
+# Set by gunicorn.conf.py in the master, inherited by the workers
+MASTER_PID_ENV = 'GUNICORN_MASTER_PID'
+
+# smaps fields (kB) used by the report
+FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty', 'Swap')
+
+
+def parse_smaps(content):
+    """
+    Sum the memory fields of /proc/<pid>/smaps or smaps_rollup
+
+    Returns:
+        Dict of field name to bytes
+    """
+    totals = dict.fromkeys(FIELDS, 0)
+    for line in content.splitlines():
+        name, _, value = line.partition(':')
+        if name in totals:
+            totals[name] += int(value.split()[0]) * 1024
+    return totals
+
+
+def read_smaps(pid):
+    """Memory fields of one process (smaps_rollup, or the full smaps on older kernels)"""
+    for name in ('smaps_rollup', 'smaps'):
+        path = f'/proc/{pid}/{name}'
+        if os.path.exists(path):
+            with open(path) as f:
+                return parse_smaps(f.read())
+    raise Exception(f"No memory map for process {pid} (needs Linux /proc)")
+
+
+def process_memory(pid):
+    """
+    Shared and unique memory of one process
+
+    Returns:
+        Dict with rss_mb, pss_mb, shared_mb (pages other processes map
+        too), unique_mb (private pages) and swap_mb
+    """
+    smaps = read_smaps(pid)
+    return {
+        'pid': pid,
+        'rss_mb': round(smaps['Rss'] / MB, 1),
+        'pss_mb': round(smaps['Pss'] / MB, 1),
+        'shared_mb': round((smaps['Shared_Clean'] + smaps['Shared_Dirty']) / MB, 1),
+        'unique_mb': round((smaps['Private_Clean'] + smaps['Private_Dirty']) / MB, 1),
+        'swap_mb': round(smaps['Swap'] / MB, 1)
+    }
+
+
+def child_pids(pid):
+    """Direct children of a process"""
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name is in parentheses and may itself contain spaces
+        parent = int(stat.rsplit(')', 1)[1].split()[1])
+        if parent == pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def memory_report(master_pid=None):
+    """
+    Memory of a server master and each of its workers
+
+    Args:
+        master_pid: gunicorn master; None reports only the current process
+
+    Returns:
+        Dict with the master, every worker and totals. total_rss_mb counts
+        shared pages once per process; total_pss_mb splits them between the
+        processes that map them, so the difference is the saving.
+    """
+    if master_pid is None:
+        master, workers = process_memory(os.getpid()), []
+    else:
+        master = process_memory(master_pid)
+        workers = []
+        for pid in child_pids(master_pid):
+            try:
+                workers.append(process_memory(pid))
+            except Exception:
+                continue  # Exited while we were reading
+    processes = [master] + workers
+    total_rss = sum(p['rss_mb'] for p in processes)
+    total_pss = sum(p['pss_mb'] for p in processes)
+    return {
+        'master': master,
+        'workers': workers,
+        'total_rss_mb': round(total_rss, 1),
+        'total_pss_mb': round(total_pss, 1),
+        'total_unique_mb': round(sum(p['unique_mb'] for p in processes), 1),
+        'shared_saving_mb': round(total_rss - total_pss, 1)
+    }
+
+
+def format_report(report):
+    lines = [f"{'process':<16} {'rss':>9} {'pss':>9} {'shared':>9} {'unique':>9}"]
+    rows = [('master', report['master'])] + [('worker', worker) for worker in report['workers']]
+    for role, entry in rows:
+        lines.append(
+            f"{role + ' ' + str(entry['pid']):<16} {entry['rss_mb']:>9.1f} {entry['pss_mb']:>9.1f} "
+            f"{entry['shared_mb']:>9.1f} {entry['unique_mb']:>9.1f}"
+        )
+    lines.append('')
+    lines.append(f"RSS summed over processes: {report['total_rss_mb']:.1f} MB")
+    lines.append(f"Actual use (PSS total):    {report['total_pss_mb']:.1f} MB")
+    lines.append(f"Saved by sharing:          {report['shared_saving_mb']:.1f} MB")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pid', type=int, help='gunicorn master process id')
+    parser.add_argument('--json', dest='json_path', help='Also write the report to this file')
+    args = parser.parse_args(argv)
+
+    report = memory_report(args.pid)
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Startup time: optional eager warm-up, model preloading for forked workers and
+an import-time report checked against a budget
+
+Usage (from the backend directory):
+    python startup.py                     # report for `import app`, budget from config
+    python startup.py --budget 800 --top 20
+    python startup.py --json report.json
+
+Exits with status 1 when importing the module takes longer than the budget.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Libraries that should only be imported by the requests that need them
+HEAVY_PACKAGES = (
+    'torch', 'transformers', 'nltk', 'scipy', 'numpy', 'sklearn', 'googletrans',
+    'langdetect', 'PyPDF2', 'reportlab', 'docx'
+)
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+
+def warm_up(service):
+    """
+    Import the heavy libraries and load the English model now
+
+    Used when LAZY_STARTUP is off, so the first request does not pay for
+    it. Failures are logged; the same work is retried on first use.
+    """
+    from nltk_support import sent_tokenize
+
+    def load_pdf_libraries():
+        import PyPDF2
+        import pdf_report
+        return PyPDF2, pdf_report
+
+    started = time.perf_counter()
+    steps = (
+        ('NLTK data', lambda: (service.summarizer.extractive_engine, sent_tokenize('Warm up.'))),
+        ('language detection', lambda: service.language_detector.detect_language('Warm up the detector.')),
+        ('summarization model', lambda: service.summarizer.transformer_summarizer),
+        ('PDF libraries', load_pdf_libraries)
+    )
+    for name, step in steps:
+        try:
+            step()
+        except Exception as e:
+            logger.warning(f"Warm-up of {name} failed: {e}")
+    logger.info(f"Warm-up finished in {time.perf_counter() - started:.1f}s")
+
+
+def preload_models(service, names):
+    """
+    Load models now, in the gunicorn master when preload_app is on
+
+    Workers forked afterwards share the weight pages copy-on-write, since
+    inference only reads them. torch runs single-threaded here so the
+    master starts no OpenMP threads that would break in forked children;
+    gunicorn.conf.py sets each worker's thread count after the fork.
+
+    Args:
+        service: SummaryService whose summarizers own the models
+        names: Models to load: 'bart' and/or 'mbart'
+    """
+    loaders = {
+        'bart': lambda: service.summarizer.transformer_summarizer,
+        'mbart': service.multilingual_summarizer._load_mbart_model
+    }
+    unknown = [name for name in names if name not in loaders]
+    if unknown:
+        raise ValueError(f"Unknown model in PRELOAD_MODELS: {', '.join(unknown)}. Use bart or mbart")
+
+    import torch
+    torch.set_num_threads(1)
+    for name in names:
+        loaders[name]()
+    # Keep the garbage collector from writing to (and so copying) the preloaded objects
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Preloaded {', '.join(names)} before forking workers")
+
+
+def parse_importtime(output):
+    """
+    Parse the stderr of `python -X importtime`
+
+    Returns:
+        List of {'module', 'self_ms', 'cumulative_ms', 'depth'} in the
+        order Python reports them (a module after everything it imported)
+    """
+    modules = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append({
+            'module': name,
+            'self_ms': int(self_us) / 1000.0,
+            'cumulative_ms': int(cumulative_us) / 1000.0,
+            'depth': max(0, (len(indent) - 1) // 2)
+        })
+    return modules
+
+
+def import_report(module='app', cwd=BACKEND_DIR, top=15, env=None):
+    """
+    Import module in a fresh interpreter and break down where the time went
+
+    Returns:
+        Dict with total_ms (cumulative time of the import, module-level code
+        included), the slowest modules, self time per top-level package and
+        which HEAVY_PACKAGES were imported
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise Exception(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    modules = parse_importtime(result.stderr)
+    target = next((m for m in reversed(modules) if m['module'] == module and m['depth'] == 0), None)
+    total_ms = target['cumulative_ms'] if target else sum(m['self_ms'] for m in modules)
+
+    packages = {}
+    for entry in modules:
+        package = entry['module'].split('.')[0]
+        packages[package] = packages.get(package, 0.0) + entry['self_ms']
+    imported = {entry['module'].split('.')[0] for entry in modules}
+
+    return {
+        'module': module,
+        'total_ms': round(total_ms, 1),
+        'slowest_modules': [
+            {'module': m['module'], 'cumulative_ms': round(m['cumulative_ms'], 1), 'self_ms': round(m['self_ms'], 1)}
+            for m in sorted(modules, key=lambda m: m['cumulative_ms'], reverse=True)[:top]
+        ],
+        'packages': [
+            {'package': name, 'self_ms': round(ms, 1)}
+            for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+        'heavy_imports': sorted(name for name in HEAVY_PACKAGES if name in imported)
+    }
+
+
+def format_report(report, budget_ms):
+    lines = [f"import {report['module']}: {report['total_ms']:.1f} ms (budget {budget_ms} ms)", '']
+    lines.append(f"{'slowest modules (cumulative)':<48} {'ms':>9}")
+    for entry in report['slowest_modules']:
+        lines.append(f"{entry['module']:<48} {entry['cumulative_ms']:>9.1f}")
+    lines.append('')
+    lines.append(f"{'packages (self time)':<48} {'ms':>9}")
+    for entry in report['packages']:
+        lines.append(f"{entry['package']:<48} {entry['self_ms']:>9.1f}")
+    lines.append('')
+    heavy = ', '.join(report['heavy_imports']) or 'none'
+    lines.append(f"heavy libraries imported at startup: {heavy}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    sys.path.append(os.path.dirname(BACKEND_DIR))
+    from config import get_config
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='app', help='Module to import (default: app)')
+    parser.add_argument('--budget', type=float, default=None, help='Budget in ms (default: STARTUP_BUDGET_MS)')
+    parser.add_argument('--top', type=int, default=15, help='Rows in each table')
+    parser.add_argument('--json', dest='json_path', help='Also write the report to this file')
+    args = parser.parse_args(argv)
+
+    budget_ms = args.budget if args.budget is not None else get_config().STARTUP_BUDGET_MS
+    report = import_report(args.module, top=args.top)
+    report['budget_ms'] = budget_ms
+    print(format_report(report, budget_ms))
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if report['total_ms'] > budget_ms:
+        print(f"\nOver budget by {report['total_ms'] - budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
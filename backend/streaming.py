@@ -0,0 +1,69 @@
+"""
+Token streaming helpers for Hugging Face generate
+"""
+
+import json
+import threading
+
+
+def stream_generate(model, tokenizer, encoded, timeout=300, **generate_kwargs):
+    """
+    Run generate in a background thread and yield text as it is decoded
+
+    Streaming requires greedy or sampled decoding; generate rejects a
+    streamer together with num_beams > 1. When the caller stops iterating
+    (for example because the client disconnected), generate stops at its
+    next step instead of running on to max_length.
+
+    Args:
+        model: Seq2seq model with a generate method
+        tokenizer: Tokenizer used to decode the new tokens
+        encoded: Tokenized model inputs
+        timeout: Seconds to wait for the next token before giving up
+        **generate_kwargs: Passed through to generate
+
+    Yields:
+        Decoded text pieces
+    """
+    from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+
+    stop = threading.Event()
+
+    class StopWhenAbandoned(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            return stop.is_set()
+
+    streamer = TextIteratorStreamer(tokenizer, skip_special_tokens=True, timeout=timeout)
+    errors = []
+
+    def run():
+        try:
+            model.generate(
+                **encoded,
+                streamer=streamer,
+                stopping_criteria=StoppingCriteriaList([StopWhenAbandoned()]),
+                **generate_kwargs
+            )
+        except Exception as e:
+            errors.append(e)
+            streamer.end()
+
+    thread = threading.Thread(target=run, name='generate-stream', daemon=True)
+    thread.start()
+
+    try:
+        for piece in streamer:
+            if piece:
+                yield piece
+    finally:
+        stop.set()
+
+    thread.join()
+    if errors:
+        raise errors[0]
+
+
+def to_ndjson(events):
+    """Encode an event stream as newline-delimited JSON"""
+    for event in events:
+        yield json.dumps(event, ensure_ascii=False) + '\n'
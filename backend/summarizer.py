@@ -2,54 +2,119 @@
 Text summarization using transformer and extractive methods
 """
 
-from transformers import pipeline
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize, word_tokenize
-from collections import Counter
+from nltk_support import stop_words
+from document import Document, as_document
+from extractive import ExtractiveScorer, default_sentence_count
+from batching import BatchScheduler
+from map_reduce import MapReduceSummarizer
+from chunking import TextChunker
+from model_registry import get_registry
+from inference_backends import load_summarization_pipeline, registry_key
+from streaming import stream_generate
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# The registry shares one BART pipeline per process and its fast tokenizer
+# cannot be called from two threads while one changes truncation or padding
+BART_TOKENIZER_LOCK = threading.Lock()
+
 class TextSummarizer:
     """Handle text summarization"""
     
-    def __init__(self):
-        self.transformer_summarizer = None
-        try:
-            self.stop_words = set(stopwords.words('english'))
-        except LookupError:
-            logger.warning("Stopwords not found, downloading...")
-            nltk.download('stopwords')
-            self.stop_words = set(stopwords.words('english'))
+    _tokenizer_lock = BART_TOKENIZER_LOCK
+    
+    def __init__(
+        self,
+        model_name='facebook/bart-large-cnn',
+        inference_backend='fp32',
+        mmap_weights=False,
+        extractive_scorer='frequency',
+        batching=False,
+        batch_max_wait_ms=20,
+        batch_max_size=8,
+        long_text_mode='extractive',
+        map_reduce_fan_out=8,
+        map_reduce_workers=2,
+        map_reduce_chunk_tokens=900,
+        map_reduce_overlap_tokens=0
+    ):
+        self.model_name = model_name
+        # 'fp32', 'int8' (dynamic quantization) or 'onnx'
+        self.inference_backend = inference_backend
+        self.model_key = registry_key(model_name, inference_backend)
+        # Map fp32 weights from a prepared file so processes share one copy
+        self.mmap_weights = mmap_weights
+        self.registry = get_registry()
+        self.extractive_scorer = extractive_scorer
         
-        # Download punkt if not available
+        # 'extractive' pre-reduces long inputs, 'map_reduce' summarizes every chunk
+        self.long_text_mode = long_text_mode
+        self.map_reduce = MapReduceSummarizer(
+            self._generate_map_batch,
+            count_tokens=self._count_tokens,
+            chunk_tokens=map_reduce_chunk_tokens,
+            fan_out=map_reduce_fan_out,
+            max_workers=map_reduce_workers
+        )
+        # Map inputs are budgeted in BART tokens, so none is truncated
+        self.chunker = TextChunker(
+            max_tokens=map_reduce_chunk_tokens,
+            count_tokens=self._count_tokens,
+            overlap_tokens=map_reduce_overlap_tokens
+        )
+        
+        # Concurrent transformer requests share padded batches when enabled
+        self.batch_scheduler = None
+        if batching:
+            self.batch_scheduler = BatchScheduler(
+                self._generate_batch,
+                max_wait_ms=batch_max_wait_ms,
+                max_batch_size=batch_max_size
+            )
+        # NLTK data and the scorer are loaded on first use, not at startup
+        self._extractive_engine = None
+    
+    @property
+    def stop_words(self):
+        return stop_words('english')
+    
+    @property
+    def extractive_engine(self):
+        """Extractive scorer with the English stopword list (built on first use)"""
+        if self._extractive_engine is None:
+            self._extractive_engine = ExtractiveScorer(self.stop_words)
+        return self._extractive_engine
+    
+    @property
+    def transformer_summarizer(self):
+        """The shared BART pipeline (loaded on first access)"""
+        return self._load_transformer()
+    
+    def _load_pipeline(self):
         try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            logger.warning("Punkt tokenizer not found, downloading...")
-            nltk.download('punkt')
+            summarization_pipeline = load_summarization_pipeline(
+                self.model_name,
+                self.inference_backend,
+                mmap_weights=self.mmap_weights
+            )
+            logger.info(f"BART model loaded successfully ({self.inference_backend})")
+            return summarization_pipeline
+        except Exception as e:
+            logger.error(f"Failed to load BART model: {e}")
+            raise
     
     def _load_transformer(self):
-        """Lazy load the transformer model"""
-        if self.transformer_summarizer is None:
-            logger.info("Loading BART summarization model...")
-            try:
-                self.transformer_summarizer = pipeline(
-                    "summarization",
-                    model="facebook/bart-large-cnn"
-                )
-                logger.info("BART model loaded successfully")
-            except Exception as e:
-                logger.error(f"Failed to load BART model: {e}")
-                raise
+        """Lazy load the transformer model through the process-wide registry"""
+        return self.registry.get(self.model_key, self._load_pipeline)
     
     def summarize(self, text, method='transformer', max_length=150, min_length=50):
         """
         Summarize text using specified method
         
         Args:
-            text: Input text to summarize
+            text: Input text to summarize (string or Document)
             method: 'transformer' or 'extractive'
             max_length: Maximum length of summary
             min_length: Minimum length of summary
@@ -57,100 +122,200 @@ class TextSummarizer:
         Returns:
             Summary text
         """
-        if not text or len(text.strip()) == 0:
+        document = as_document(text)
+        if not document.text:
             raise ValueError("Text cannot be empty")
         
         if method == 'transformer':
-            return self._transformer_summarize(text, max_length, min_length)
+            return self._transformer_summarize(document, max_length, min_length)
         elif method == 'extractive':
             # Calculate number of sentences based on length
-            num_sentences = max(3, min(10, len(text.split()) // 50))
-            return self._extractive_summarize(text, num_sentences=num_sentences)
+            num_sentences = default_sentence_count(document.word_count)
+            return self._extractive_summarize(document, num_sentences=num_sentences)
         else:
             raise ValueError(f"Invalid method: {method}. Use 'transformer' or 'extractive'")
     
-    def _transformer_summarize(self, text, max_length, min_length):
+    def _transformer_summarize(self, document, max_length, min_length):
         """
         Abstractive summarization using BART transformer
         """
         self._load_transformer()
         
-        # Check text length
-        word_count = len(text.split())
+        text = self._prepare_long_input(document, max_length, min_length)
+        
+        try:
+            if self.batch_scheduler is not None:
+                return self.batch_scheduler.summarize(text, max_length, min_length)
+            return self._generate_batch([text], max_length, min_length)[0]
+        except Exception as e:
+            logger.error(f"Transformer summarization failed: {e}")
+            # Fallback to extractive if transformer fails
+            logger.info("Falling back to extractive method...")
+            return self._extractive_summarize(text, num_sentences=5)
+    
+    def _prepare_long_input(self, document, max_length, min_length):
+        """Bring inputs over 1000 words down to something one BART pass can read"""
+        document = as_document(document)
+        word_count = document.word_count
+        if word_count <= 1000:
+            return document.text
+        
+        if self.long_text_mode == 'map_reduce':
+            logger.info(f"Text too long ({word_count} words), using map-reduce summarization...")
+            try:
+                return self._map_reduce(document, max_length, min_length)
+            except Exception as e:
+                logger.error(f"Map-reduce summarization failed: {e}")
+                logger.info("Falling back to extractive pre-processing...")
+        
+        logger.info(f"Text too long ({word_count} words), pre-processing with extractive method...")
+        # Use extractive to get it down to ~500 words first
+        num_sentences = min(20, word_count // 25)
+        text = self._extractive_summarize(document, num_sentences=num_sentences)
+        logger.info(f"Pre-processed to {len(text.split())} words")
+        return text
+    
+    def _map_reduce(self, document, max_length, min_length):
+        """Map-reduce over token-budgeted chunks (the document's memoized token counts are reused)"""
+        return self.map_reduce.reduce_chunks(self.chunker.chunk(document), max_length, min_length)
+    
+    def summarize_batch(self, texts, max_length=150, min_length=50, batch_size=8):
+        """
+        Abstractive summaries for many texts using padded batched generate calls
+        
+        Inputs are sorted by length before batching so each batch pads little.
         
-        # If text is too long, use extractive first to reduce it
-        if word_count > 1000:
-            logger.info(f"Text too long ({word_count} words), pre-processing with extractive method...")
-            # Use extractive to get it down to ~500 words first
+        Args:
+            texts: Strings or Documents
+        
+        Returns:
+            List of summaries in input order
+        """
+        self._load_transformer()
+        prepared = [self._prepare_long_input(text, max_length, min_length) for text in texts]
+        order = sorted(range(len(prepared)), key=lambda i: len(prepared[i]))
+        
+        summaries = [None] * len(prepared)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            results = self._generate_batch([prepared[i] for i in batch], max_length, min_length)
+            for i, summary in zip(batch, results):
+                summaries[i] = summary
+        return summaries
+    
+    def stream_summarize(self, text, method='transformer', max_length=150, min_length=50):
+        """
+        Summarize text, yielding progress events as the summary is produced
+        
+        Streaming decodes greedily (num_beams=1) because generate cannot
+        stream beam search.
+        
+        Yields:
+            {'event': 'stage', 'stage': ...} for long-input reduction, then
+            {'event': 'token', 'text': ...} pieces of the summary
+        """
+        document = as_document(text)
+        if not document.text:
+            raise ValueError("Text cannot be empty")
+        
+        if method == 'extractive':
+            yield {'event': 'token', 'text': self.summarize(document, method='extractive')}
+            return
+        if method != 'transformer':
+            raise ValueError(f"Invalid method: {method}. Use 'transformer' or 'extractive'")
+        
+        word_count = document.word_count
+        if word_count > 1000 and self.long_text_mode == 'map_reduce':
+            try:
+                document = Document(self._map_reduce(document, max_length, min_length))
+                yield {'event': 'stage', 'stage': 'map_reduce_done', 'words': document.word_count}
+            except Exception as e:
+                logger.error(f"Map-reduce summarization failed: {e}")
+        
+        if document.word_count > 1000:
             num_sentences = min(20, word_count // 25)
-            text = self._extractive_summarize(text, num_sentences=num_sentences)
-            logger.info(f"Pre-processed to {len(text.split())} words")
+            document = Document(self._extractive_summarize(document, num_sentences=num_sentences))
+            yield {'event': 'stage', 'stage': 'extractive_reduction_done', 'words': document.word_count}
         
-        try:
+        with self.registry.use(self.model_key, self._load_pipeline) as summarization_pipeline:
+            tokenizer = summarization_pipeline.tokenizer
+            with self._tokenizer_lock:
+                encoded = tokenizer(document.text, return_tensors='pt', max_length=1024, truncation=True)
+            for piece in stream_generate(
+                summarization_pipeline.model,
+                tokenizer,
+                encoded,
+                max_length=max_length,
+                min_length=min_length,
+                num_beams=1,
+                do_sample=False
+            ):
+                yield {'event': 'token', 'text': piece}
+    
+    def _generate_map_batch(self, texts, max_length, min_length):
+        """
+        Summarize map-reduce chunks
+        
+        With batching on, chunks go through the scheduler like any other
+        request: the model keeps running one generate call at a time and
+        chunks share padded batches with concurrent requests.
+        """
+        if self.batch_scheduler is None:
+            return self._generate_batch(texts, max_length, min_length)
+        futures = [self.batch_scheduler.submit(text, max_length, min_length) for text in texts]
+        return [future.result(timeout=self.batch_scheduler.result_timeout) for future in futures]
+    
+    def _generate_batch(self, texts, max_length, min_length):
+        """
+        Run one padded generate call over several texts
+        
+        Returns:
+            List of summaries in input order
+        """
+        with self.registry.use(self.model_key, self._load_pipeline) as summarization_pipeline, \
+                self._tokenizer_lock:
             # BART has a max input length of 1024 tokens
-            result = self.transformer_summarizer(
-                text,
+            results = summarization_pipeline(
+                texts,
                 max_length=max_length,
                 min_length=min_length,
                 do_sample=False,
-                truncation=True  # Truncate if still too long
+                truncation=True,  # Truncate if still too long
+                batch_size=len(texts)
             )
-            return result[0]['summary_text']
-        except Exception as e:
-            logger.error(f"Transformer summarization failed: {e}")
-            # Fallback to extractive if transformer fails
-            logger.info("Falling back to extractive method...")
-            return self._extractive_summarize(text, num_sentences=5)
+        return [result['summary_text'] for result in results]
+    
+    def _count_tokens(self, texts):
+        """Count BART tokens for a list of texts"""
+        tokenizer = self._load_transformer().tokenizer
+        # The tokenizer is shared with generation and streaming threads
+        with self._tokenizer_lock:
+            encoded = tokenizer(list(texts), add_special_tokens=False)
+        return [len(ids) for ids in encoded['input_ids']]
     
-    def _extractive_summarize(self, text, num_sentences=3):
+    def _extractive_summarize(self, text, num_sentences=3, scorer=None):
         """
-        Extractive summarization using word frequency
+        Extractive summarization over a sparse term-sentence matrix
+        
+        Args:
+            text: Input text (string or Document)
+            num_sentences: Number of sentences to keep
+            scorer: 'frequency', 'tfidf' or 'centroid' (default: self.extractive_scorer)
         """
+        document = as_document(text)
+        text = document.text
         try:
-            # Tokenize into sentences
-            sentences = sent_tokenize(text)
+            sentences = document.sentences
             
             if len(sentences) <= num_sentences:
                 return text
             
-            # Calculate word frequencies
-            word_freq = Counter()
-            for sentence in sentences:
-                words = word_tokenize(sentence.lower())
-                for word in words:
-                    if word.isalnum() and word not in self.stop_words:
-                        word_freq[word] += 1
-            
-            # Score sentences based on word frequencies
-            sentence_scores = {}
-            for sentence in sentences:
-                words = word_tokenize(sentence.lower())
-                score = sum(
-                    word_freq[word] for word in words 
-                    if word.isalnum() and word not in self.stop_words
-                )
-                # Normalize by sentence length to avoid bias toward long sentences
-                if len(words) > 0:
-                    sentence_scores[sentence] = score / len(words)
-                else:
-                    sentence_scores[sentence] = 0
-            
-            # Get top sentences
-            top_sentences = sorted(
-                sentence_scores.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:num_sentences]
-            
-            # Sort by original order to maintain coherence
-            summary_sentences = sorted(
-                top_sentences,
-                key=lambda x: sentences.index(x[0])
+            return self.extractive_engine.summarize(
+                sentences,
+                num_sentences,
+                scorer=scorer or self.extractive_scorer
             )
             
-            summary = ' '.join([s[0] for s in summary_sentences])
-            return summary
-            
         except Exception as e:
             logger.error(f"Extractive summarization failed: {e}")
             # Return first few sentences as last resort
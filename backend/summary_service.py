@@ -0,0 +1,312 @@
+"""
+Summarization flow shared by the API endpoints
+"""
+
+from cache import make_cache_key
+from document import as_document
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Settings that change what a summary looks like; all are part of the cache key
+OUTPUT_SETTINGS = (
+    'DEFAULT_MODEL',
+    'INFERENCE_BACKEND',
+    'EXTRACTIVE_SCORER',
+    'LONG_TEXT_MODE',
+    'MAP_REDUCE_FAN_OUT',
+    'MAP_REDUCE_CHUNK_TOKENS',
+    'MAP_REDUCE_OVERLAP_TOKENS',
+    'NATIVE_CHUNK_TOKENS',
+    'NATIVE_BEAMS',
+    'LANGUAGE_SEGMENTS',
+    'TRANSLATION_BACKEND',
+    'TRANSLATION_BEAMS',
+    'TRANSLATION_CHUNK_TOKENS'
+)
+
+
+def output_model_id(settings):
+    """Cache key component describing the models and settings behind a summary"""
+    return ':'.join(f"{name}={settings.get(name)}" for name in OUTPUT_SETTINGS)
+
+
+class SummaryService:
+    """Detect language, pick the right summarizer and cache the result"""
+
+    def __init__(self, summarizer, multilingual_summarizer, language_detector, cache=None, model_id=None):
+        self.summarizer = summarizer
+        self.multilingual_summarizer = multilingual_summarizer
+        self.language_detector = language_detector
+        self.cache = cache
+        self.model_id = model_id
+
+    def summarize(
+        self,
+        text,
+        method='transformer',
+        max_length=150,
+        min_length=50,
+        target_lang='auto',
+        multilingual_mode='translate',
+        detected_lang=None,
+        on_stage=None
+    ):
+        """
+        Summarize text with multilingual support
+
+        Args:
+            text: String or Document; analysed once and shared with the summarizers
+            detected_lang: Language already known for text (e.g. from the
+                document store); detected here when None
+            on_stage: Optional callable(stage) called when language detection
+                is done ('language_detected') and before the model runs
+                ('summarizing'); not called on a cache hit
+
+        Returns:
+            dict with the /api/summarize response fields
+        """
+        document = as_document(text, language=detected_lang, language_detector=self.language_detector)
+        if self.cache is None:
+            return self._summarize(
+                document, method, max_length, min_length, target_lang, multilingual_mode, on_stage
+            )
+
+        key = make_cache_key(
+            document.raw_text, method, max_length, min_length, target_lang, multilingual_mode, self.model_id
+        )
+        return self.cache.get_or_compute(
+            key,
+            lambda: self._summarize(
+                document, method, max_length, min_length, target_lang, multilingual_mode, on_stage
+            )
+        )
+
+    def _summarize(self, document, method, max_length, min_length, target_lang, multilingual_mode, on_stage=None):
+        on_stage = on_stage or (lambda stage: None)
+        detected_lang = document.language
+        on_stage('language_detected')
+
+        # If target language is auto, use detected language
+        if target_lang == 'auto':
+            target_lang = detected_lang
+
+        on_stage('summarizing')
+
+        # Use multilingual summarizer if needed
+        if detected_lang != 'en' or target_lang != 'en':
+            result = self.multilingual_summarizer.summarize_multilingual(
+                document,
+                target_lang=target_lang,
+                method=multilingual_mode,
+                max_length=max_length,
+                min_length=min_length
+            )
+            return self.multilingual_response(result, detected_lang)
+
+        # Standard English summarization
+        summary = self.summarizer.summarize(
+            document,
+            method=method,
+            max_length=max_length,
+            min_length=min_length
+        )
+        return self.english_response(document, summary, detected_lang)
+
+    def stream(
+        self,
+        text,
+        method='transformer',
+        max_length=150,
+        min_length=50,
+        target_lang='auto',
+        multilingual_mode='translate',
+        detected_lang=None
+    ):
+        """
+        Summarize text as a stream of events
+
+        Yields:
+            {'event': 'stage', ...} progress events, {'event': 'token', 'text': ...}
+            summary pieces, and finally {'event': 'done', ...} with the same
+            fields summarize returns (or {'event': 'error', 'error': ...})
+        """
+        document = as_document(text, language=detected_lang, language_detector=self.language_detector)
+        if self.cache is not None:
+            key = make_cache_key(
+                document.raw_text, method, max_length, min_length, target_lang, multilingual_mode, self.model_id
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield {'event': 'token', 'text': cached['summary']}
+                yield dict(cached, event='done', cached=True)
+                return
+
+        try:
+            detected_lang = document.language
+            yield {
+                'event': 'stage',
+                'stage': 'language_detected',
+                'language': detected_lang,
+                'language_name': self.language_detector.get_language_name(detected_lang)
+            }
+
+            if target_lang == 'auto':
+                target_lang = detected_lang
+
+            if detected_lang != 'en' or target_lang != 'en':
+                result = None
+                for event in self.multilingual_summarizer.stream_multilingual(
+                    document,
+                    detected_lang,
+                    target_lang=target_lang,
+                    method=multilingual_mode,
+                    max_length=max_length,
+                    min_length=min_length
+                ):
+                    if event['event'] == 'result':
+                        result = event['result']
+                    else:
+                        yield event
+                response = self.multilingual_response(result, detected_lang)
+            else:
+                pieces = []
+                for event in self.summarizer.stream_summarize(
+                    document,
+                    method=method,
+                    max_length=max_length,
+                    min_length=min_length
+                ):
+                    if event['event'] == 'token':
+                        pieces.append(event['text'])
+                    yield event
+                response = self.english_response(document, ''.join(pieces).strip(), detected_lang)
+        except Exception as e:
+            logger.error(f"Streaming summarization error: {e}")
+            yield {'event': 'error', 'error': str(e)}
+            return
+
+        # Streamed output is greedy-decoded, so it is served from the cache
+        # but never stored where it would replace a beam-search result
+        yield dict(response, event='done')
+
+    def multilingual_response(self, result, detected_lang):
+        """Response fields for a MultilingualSummarizer result"""
+        return {
+            'summary': result['summary'],
+            'original_length': result['original_length'],
+            'summary_length': result['summary_length'],
+            'compression_ratio': f"{(result['summary_length'] / result['original_length'] * 100):.1f}%",
+            'source_language': result['source_language'],
+            'source_language_name': result['source_language_name'],
+            'target_language': result['target_language'],
+            'target_language_name': result['target_language_name'],
+            'detected_language': detected_lang,
+            'detected_language_name': self.language_detector.get_language_name(detected_lang)
+        }
+
+    def english_response(self, text, summary, detected_lang):
+        """Response fields for an English summary of text (string or Document)"""
+        document = as_document(text)
+        return {
+            'summary': summary,
+            'original_length': document.word_count,
+            'summary_length': len(summary.split()),
+            'compression_ratio': f"{(len(summary) / document.char_count * 100):.1f}%",
+            'detected_language': detected_lang,
+            'detected_language_name': self.language_detector.get_language_name(detected_lang),
+            'source_language': 'en',
+            'target_language': 'en'
+        }
+
+
+def build_summary_service(settings):
+    """
+    Build the summarizers, cache and SummaryService from configuration
+
+    Args:
+        settings: Mapping of config.py names to values (e.g. app.config)
+    """
+    from language_detector import LanguageDetector
+    from model_registry import get_registry
+    from multilingual_summarizer import MultilingualSummarizer
+    from summarizer import TextSummarizer
+    from cache import SummaryCache
+    from translator import TextTranslator
+    from translation_memory import TranslationMemory
+    from translation_backends import make_translation_backend
+
+    get_registry().configure(max_memory_bytes=settings['MODEL_MEMORY_LIMIT_MB'] * 1024 * 1024)
+
+    summarizer = TextSummarizer(
+        model_name=settings['DEFAULT_MODEL'],
+        inference_backend=settings['INFERENCE_BACKEND'],
+        mmap_weights=settings['MMAP_WEIGHTS'],
+        extractive_scorer=settings['EXTRACTIVE_SCORER'],
+        batching=settings['BATCH_ENABLED'],
+        batch_max_wait_ms=settings['BATCH_MAX_WAIT_MS'],
+        batch_max_size=settings['BATCH_MAX_SIZE'],
+        long_text_mode=settings['LONG_TEXT_MODE'],
+        map_reduce_fan_out=settings['MAP_REDUCE_FAN_OUT'],
+        map_reduce_workers=settings['MAP_REDUCE_WORKERS'],
+        map_reduce_chunk_tokens=settings['MAP_REDUCE_CHUNK_TOKENS'],
+        map_reduce_overlap_tokens=settings['MAP_REDUCE_OVERLAP_TOKENS']
+    )
+    if settings['TRANSLATION_BACKEND'] == 'mbart':
+        backend_options = {
+            'inference_backend': settings['INFERENCE_BACKEND'],
+            'mmap_weights': settings['MMAP_WEIGHTS'],
+            'batch_size': settings['TRANSLATION_BATCH_SIZE'],
+            'num_beams': settings['TRANSLATION_BEAMS']
+        }
+    elif settings['TRANSLATION_BACKEND'] == 'http':
+        backend_options = {'url': settings['TRANSLATION_HTTP_URL'], 'api_key': settings['TRANSLATION_HTTP_API_KEY']}
+    else:
+        backend_options = {}
+    translation_backend = make_translation_backend(
+        settings['TRANSLATION_BACKEND'],
+        timeout=settings['TRANSLATION_TIMEOUT'],
+        **backend_options
+    )
+    multilingual_summarizer = MultilingualSummarizer(
+        summarizer=summarizer,
+        inference_backend=settings['INFERENCE_BACKEND'],
+        mmap_weights=settings['MMAP_WEIGHTS'],
+        segment_detection=settings['LANGUAGE_SEGMENTS'],
+        translation_chunk_tokens=settings['TRANSLATION_CHUNK_TOKENS'],
+        native_chunk_tokens=settings['NATIVE_CHUNK_TOKENS'],
+        native_beams=settings['NATIVE_BEAMS'],
+        batching=settings['BATCH_ENABLED'],
+        batch_max_wait_ms=settings['BATCH_MAX_WAIT_MS'],
+        batch_max_size=settings['BATCH_MAX_SIZE'],
+        map_reduce_fan_out=settings['MAP_REDUCE_FAN_OUT'],
+        map_reduce_workers=settings['MAP_REDUCE_WORKERS'],
+        translator=TextTranslator(
+            workers=settings['TRANSLATION_WORKERS'],
+            timeout=settings['TRANSLATION_TIMEOUT'],
+            retries=settings['TRANSLATION_RETRIES'],
+            backoff=settings['TRANSLATION_BACKOFF'],
+            backend=translation_backend,
+            memory=TranslationMemory(
+                settings['TRANSLATION_MEMORY_PATH'],
+                max_bytes=settings['TRANSLATION_MEMORY_MAX_MB'] * 1024 * 1024
+            ) if settings['TRANSLATION_MEMORY_ENABLED'] else None
+        )
+    )
+    cache = SummaryCache(
+        enabled=settings['CACHE_ENABLED'],
+        cache_type=settings['CACHE_TYPE'],
+        default_timeout=settings['CACHE_DEFAULT_TIMEOUT'],
+        max_entries=settings['CACHE_MAX_ENTRIES'],
+        max_bytes=settings['CACHE_MAX_BYTES'],
+        disk_path=settings['CACHE_DIR'] and os.path.join(settings['CACHE_DIR'], 'summaries.sqlite3'),
+        disk_max_bytes=settings['CACHE_DISK_MAX_BYTES']
+    )
+    return SummaryService(
+        summarizer,
+        multilingual_summarizer,
+        LanguageDetector(),
+        cache=cache,
+        model_id=output_model_id(settings)
+    )
@@ -0,0 +1,334 @@
+"""
+Translation backends behind TextTranslator
+
+Every backend translates a list of texts from one language to another:
+
+    backend.translate_batch(texts, source_lang, target_lang) -> list of str
+
+- googletrans: Google's web endpoint (the default; needs network access)
+- mbart: the local mBART-50 checkpoint the multilingual summarizer already
+  loads, run as padded batches of sentences (works air-gapped)
+- http: a self-hosted service speaking the LibreTranslate /translate API
+
+A backend's `concurrent` flag tells TextTranslator whether to spread
+chunks over its thread pool (network round trips) or to hand them all
+over in one call so the backend can batch them itself.
+"""
+
+import json
+import logging
+import threading
+import urllib.request
+
+from document import as_document
+from inference_backends import load_seq2seq, registry_key
+from model_registry import get_registry
+
+logger = logging.getLogger(__name__)
+
+MBART_MODEL_NAME = "facebook/mbart-large-50-many-to-many-mmt"
+
+# mBART-50 language codes
+MBART_LANG_CODES = {
+    'en': 'en_XX', 'es': 'es_XX', 'fr': 'fr_XX', 'de': 'de_DE',
+    'it': 'it_IT', 'pt': 'pt_XX', 'ru': 'ru_RU', 'zh-cn': 'zh_CN',
+    'ja': 'ja_XX', 'ko': 'ko_KR', 'ar': 'ar_AR', 'hi': 'hi_IN',
+    'bn': 'bn_IN', 'te': 'te_IN', 'ta': 'ta_IN', 'mr': 'mr_IN',
+    'ur': 'ur_PK', 'tr': 'tr_TR', 'nl': 'nl_XX', 'pl': 'pl_PL'
+}
+
+# The registry shares one mBART tokenizer per process and its src_lang is mutable state
+MBART_TOKENIZER_LOCK = threading.Lock()
+
+# googletrans: texts are sent one per line in requests of at most this many characters
+MAX_REQUEST_CHARS = 4500
+
+
+def split_sentences(text):
+    """
+    Sentences of a text and where they sit in it
+
+    Returns:
+        (normalized text, sentence spans, sentences with whitespace collapsed)
+    """
+    document = as_document(text)
+    spans = document.sentence_spans
+    sentences = [' '.join(document.text[start:end].split()) for start, end in spans]
+    return document.text, spans, sentences
+
+
+def join_sentences(text, spans, translations):
+    """Put translated sentences back between the original separators"""
+    parts = []
+    position = 0
+    for (start, end), translation in zip(spans, translations):
+        parts.append(text[position:start])
+        parts.append(translation)
+        position = end
+    parts.append(text[position:])
+    return ''.join(parts)
+
+
+def _googletrans_client(timeout):
+    from googletrans import Translator
+    return Translator(timeout=timeout)
+
+
+class GoogletransBackend:
+    """googletrans, with one client per thread (clients are not shared between threads)"""
+
+    name = 'googletrans'
+    concurrent = True
+
+    def __init__(self, timeout=10.0, client_factory=None):
+        """
+        Args:
+            timeout: Seconds allowed for one request
+            client_factory: Callable(timeout) -> client with googletrans'
+                translate/detect interface (default: googletrans.Translator)
+        """
+        self.timeout = timeout
+        self.client_factory = client_factory or _googletrans_client
+        self._local = threading.local()
+
+    @property
+    def client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.client_factory(self.timeout)
+        return client
+
+    def set_client_factory(self, client_factory):
+        """Use another client from now on (threads create a new one on their next call)"""
+        self.client_factory = client_factory
+        self._local = threading.local()
+
+    def translate_batch(self, texts, source_lang, target_lang):
+        """
+        Translate texts in as few requests as MAX_REQUEST_CHARS allows
+
+        Single-line texts are joined one per line. If the service merges or
+        splits lines, that request's texts are sent again one at a time.
+        Texts with line breaks of their own always go alone.
+        """
+        groups = [[]]
+        size = 0
+        for index, text in enumerate(texts):
+            if groups[-1] and ('\n' in text or size + len(text) + 1 > MAX_REQUEST_CHARS):
+                groups.append([])
+                size = 0
+            groups[-1].append(index)
+            size += len(text) + 1
+            if '\n' in text:
+                groups.append([])
+                size = 0
+
+        results = [None] * len(texts)
+        for group in filter(None, groups):
+            if len(group) == 1:
+                results[group[0]] = self._translate(texts[group[0]], source_lang, target_lang)
+                continue
+            lines = self._translate('\n'.join(texts[i] for i in group), source_lang, target_lang).split('\n')
+            if len(lines) == len(group):
+                for index, line in zip(group, lines):
+                    results[index] = line.strip()
+            else:
+                logger.warning(f"Expected {len(group)} translated lines, got {len(lines)}; sending them one by one")
+                for index in group:
+                    results[index] = self._translate(texts[index], source_lang, target_lang)
+        return results
+
+    def _translate(self, text, source_lang, target_lang):
+        return self.client.translate(text, src=source_lang, dest=target_lang).text
+
+    def detect_language(self, text):
+        return self.client.detect(text).lang
+
+    @staticmethod
+    def supported_languages():
+        from googletrans import LANGUAGES
+        return LANGUAGES
+
+
+class MBartTranslationBackend:
+    """
+    Local translation with mBART-50, sentence by sentence in padded batches
+
+    The model comes from the process-wide registry under the same key the
+    MultilingualSummarizer uses, so native summarization and translation
+    share one copy of the weights.
+    """
+
+    name = 'mbart'
+    concurrent = False
+
+    def __init__(self, inference_backend='fp32', mmap_weights=False, batch_size=8, num_beams=2, max_input_tokens=256):
+        """
+        Args:
+            inference_backend: 'fp32', 'int8' or 'onnx' (see inference_backends)
+            mmap_weights: Map fp32 weights from the prepared file
+            batch_size: Sentences per generate() call
+            num_beams: Beam width (1 is greedy and fastest)
+            max_input_tokens: Longer sentences are truncated
+        """
+        self.inference_backend = inference_backend
+        self.mmap_weights = mmap_weights
+        self.batch_size = max(1, batch_size)
+        self.num_beams = num_beams
+        self.max_input_tokens = max_input_tokens
+        self.registry = get_registry()
+        self.mbart_key = registry_key(MBART_MODEL_NAME, inference_backend)
+        self.language_detector = None
+
+    def _load_mbart(self):
+        from transformers import MBart50TokenizerFast
+        return load_seq2seq(
+            MBART_MODEL_NAME,
+            self.inference_backend,
+            MBart50TokenizerFast,
+            mmap_weights=self.mmap_weights
+        )
+
+    def translate_batch(self, texts, source_lang, target_lang):
+        """
+        Translate texts sentence by sentence
+
+        Sentences of all texts are pooled, deduplicated and sorted by length
+        so each padded batch holds sentences of similar size.
+        """
+        if target_lang not in MBART_LANG_CODES:
+            raise Exception(f"mBART cannot translate into '{target_lang}'")
+        sources = [self._source_language(text, source_lang) for text in texts]
+
+        split = [split_sentences(text) for text in texts]
+        translations = {}
+        for language in set(sources):
+            pending = {
+                sentence
+                for (_, _, sentences), source in zip(split, sources) if source == language
+                for sentence in sentences
+            }
+            if language == target_lang:
+                translations.update({(language, sentence): sentence for sentence in pending})
+                continue
+            ordered = sorted(pending, key=len)
+            for start in range(0, len(ordered), self.batch_size):
+                batch = ordered[start:start + self.batch_size]
+                for sentence, translated in zip(batch, self._generate(batch, language, target_lang)):
+                    translations[(language, sentence)] = translated
+
+        return [
+            join_sentences(text, spans, [translations[(source, sentence)] for sentence in sentences])
+            for (text, spans, sentences), source in zip(split, sources)
+        ]
+
+    def _source_language(self, text, source_lang):
+        if source_lang == 'auto':
+            if self.language_detector is None:
+                from language_detector import LanguageDetector
+                self.language_detector = LanguageDetector()
+            source_lang = self.language_detector.detect_language(text)
+        if source_lang not in MBART_LANG_CODES:
+            raise Exception(f"mBART cannot translate from '{source_lang}'")
+        return source_lang
+
+    def _generate(self, sentences, source_lang, target_lang):
+        with self.registry.use(self.mbart_key, self._load_mbart) as (mbart_model, mbart_tokenizer):
+            with MBART_TOKENIZER_LOCK:
+                mbart_tokenizer.src_lang = MBART_LANG_CODES[source_lang]
+                encoded = mbart_tokenizer(
+                    sentences,
+                    return_tensors="pt",
+                    padding=True,
+                    max_length=self.max_input_tokens,
+                    truncation=True
+                )
+            longest = max(len(ids) for ids in encoded['input_ids'])
+            generated = mbart_model.generate(
+                **encoded,
+                forced_bos_token_id=mbart_tokenizer.lang_code_to_id[MBART_LANG_CODES[target_lang]],
+                max_length=min(1024, 2 * longest + 16),
+                num_beams=self.num_beams,
+                early_stopping=True
+            )
+            return [text.strip() for text in mbart_tokenizer.batch_decode(generated, skip_special_tokens=True)]
+
+    def detect_language(self, text):
+        return self._source_language(text, 'auto')
+
+    def supported_languages(self):
+        from language_detector import LanguageDetector
+        names = LanguageDetector.SUPPORTED_LANGUAGES
+        return {code: names.get(code, code) for code in MBART_LANG_CODES}
+
+
+class HttpTranslationBackend:
+    """
+    Self-hosted translation service with the LibreTranslate /translate API
+
+    One POST translates a whole batch: {"q": [...], "source", "target",
+    "format": "text"} returns {"translatedText": [...]}.
+    """
+
+    name = 'http'
+    concurrent = True
+
+    def __init__(self, url, timeout=10.0, api_key=None):
+        """
+        Args:
+            url: Base URL of the service (the /translate endpoint is added)
+            timeout: Seconds allowed for one request
+            api_key: Sent as api_key when the service requires one
+        """
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.api_key = api_key
+
+    def _post(self, path, payload):
+        if self.api_key:
+            payload = dict(payload, api_key=self.api_key)
+        request = urllib.request.Request(
+            self.url + path,
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def translate_batch(self, texts, source_lang, target_lang):
+        result = self._post('/translate', {
+            'q': list(texts),
+            'source': source_lang,
+            'target': target_lang,
+            'format': 'text'
+        })
+        translations = result.get('translatedText')
+        if not isinstance(translations, list) or len(translations) != len(texts):
+            raise Exception(f"Translation service returned {len(translations or [])} texts for {len(texts)}")
+        return translations
+
+    def detect_language(self, text):
+        return self._post('/detect', {'q': text})[0]['language']
+
+    def supported_languages(self):
+        request = urllib.request.Request(self.url + '/languages')
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return {entry['code']: entry['name'] for entry in json.loads(response.read().decode('utf-8'))}
+
+
+def make_translation_backend(name, timeout=10.0, **options):
+    """
+    Build the backend selected by TRANSLATION_BACKEND
+
+    Args:
+        name: 'googletrans', 'mbart' or 'http'
+        timeout: Request timeout for the network backends
+        options: Backend settings (see each backend's constructor)
+    """
+    if name == 'googletrans':
+        return GoogletransBackend(timeout=timeout)
+    if name == 'mbart':
+        return MBartTranslationBackend(**options)
+    if name == 'http':
+        return HttpTranslationBackend(timeout=timeout, **options)
+    raise Exception(f"Unknown translation backend: {name}")
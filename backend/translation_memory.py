@@ -0,0 +1,214 @@
+"""
+Sentence-level translation memory shared by every worker on the host
+
+Translations are stored per sentence, keyed by source language, target
+language and a hash of the whitespace-normalized sentence. Boilerplate
+that recurs across documents (disclaimers, headers, templated
+paragraphs), and summaries that are translated again, are then served
+from SQLite and never sent to the translation service twice.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of parameters in one statement
+LOOKUP_BATCH = 500
+# Writes between full size checks of the shared store; other workers add to it too
+EVICT_CHECK_INTERVAL = 16
+# Sentences removed per eviction statement
+EVICT_BATCH = 1000
+
+
+def normalize_sentence(sentence):
+    """Collapse whitespace so trivially different copies share an entry"""
+    return ' '.join(sentence.split())
+
+
+def memory_key(sentence, source_lang, target_lang):
+    """Key of a normalized sentence for one language pair"""
+    payload = f"{source_lang}\x00{target_lang}\x00{sentence}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """
+    SQLite-backed sentence translation cache
+
+    The database runs in WAL mode so several gunicorn workers can share one
+    file. The least recently used sentences are evicted when the stored
+    text goes over max_bytes.
+    """
+
+    def __init__(self, path, max_bytes=128 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite file
+            max_bytes: Budget for stored source plus translated text
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.chars_saved = 0
+        self.evictions = 0
+        self._bytes = None  # estimated store size since the last check
+        self._writes = 0
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS sentences (
+                    key TEXT PRIMARY KEY,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sentences_accessed ON sentences (accessed_at)")
+
+    def _connect(self):
+        """One connection per thread and per process (connections must not cross a fork)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get_many(self, sentences, source_lang, target_lang):
+        """
+        Look up normalized sentences
+
+        Returns:
+            Dict of sentence to translation for the sentences that were found
+        """
+        keys = {memory_key(sentence, source_lang, target_lang): sentence for sentence in set(sentences)}
+        found = {}
+        try:
+            conn = self._connect()
+            key_list = list(keys)
+            for start in range(0, len(key_list), LOOKUP_BATCH):
+                batch = key_list[start:start + LOOKUP_BATCH]
+                placeholders = ','.join('?' * len(batch))
+                for key, translation in conn.execute(
+                    f"SELECT key, translation FROM sentences WHERE key IN ({placeholders})", batch
+                ):
+                    found[keys[key]] = translation
+            if found:
+                now = time.time()
+                conn.executemany(
+                    "UPDATE sentences SET accessed_at = ? WHERE key = ?",
+                    [(now, memory_key(sentence, source_lang, target_lang)) for sentence in found]
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Translation memory read failed: {e}")
+
+        hits = sum(1 for sentence in sentences if sentence in found)
+        with self._stats_lock:
+            self.hits += hits
+            self.misses += len(sentences) - hits
+            self.chars_saved += sum(len(sentence) for sentence in sentences if sentence in found)
+        return found
+
+    def put_many(self, translations, source_lang, target_lang):
+        """
+        Store translations
+
+        Args:
+            translations: Dict of normalized sentence to its translation
+        """
+        if not translations:
+            return
+        now = time.time()
+        rows = [
+            (
+                memory_key(sentence, source_lang, target_lang),
+                source_lang,
+                target_lang,
+                translation,
+                len(sentence) + len(translation),
+                now
+            )
+            for sentence, translation in translations.items()
+        ]
+        try:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO sentences "
+                "(key, source_lang, target_lang, translation, size, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._evict(conn, sum(row[4] for row in rows))
+        except sqlite3.Error as e:
+            logger.error(f"Translation memory write failed: {e}")
+
+    def _evict(self, conn, added):
+        """
+        Drop least recently used sentences until under the byte budget
+
+        The store is summed every EVICT_CHECK_INTERVAL writes, or sooner
+        when the sizes written since the last check push it over budget.
+        """
+        with self._stats_lock:
+            self._writes += 1
+            if self._bytes is not None:
+                self._bytes += added
+                if self._bytes <= self.max_bytes and self._writes % EVICT_CHECK_INTERVAL:
+                    return
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM sentences").fetchone()[0]
+        evicted = 0
+        while total > self.max_bytes:
+            sizes = [size for (size,) in conn.execute(
+                "SELECT size FROM sentences ORDER BY accessed_at LIMIT ?", (EVICT_BATCH,)
+            )]
+            if not sizes:
+                break
+            count = 0
+            for size in sizes:
+                total -= size
+                count += 1
+                if total <= self.max_bytes:
+                    break
+            conn.execute(
+                "DELETE FROM sentences WHERE key IN (SELECT key FROM sentences ORDER BY accessed_at LIMIT ?)",
+                (count,)
+            )
+            evicted += count
+        with self._stats_lock:
+            self._bytes = total
+            self.evictions += evicted
+
+    def clear(self):
+        self._connect().execute("DELETE FROM sentences")
+        with self._stats_lock:
+            self._bytes = 0
+
+    def get_stats(self):
+        """Hit rate of this process and the size of the shared store"""
+        entries, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sentences"
+        ).fetchone()
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': self.path,
+                'entries': entries,
+                'bytes': size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'chars_saved': self.chars_saved,
+                'evictions': self.evictions
+            }
@@ -1,17 +1,66 @@
 """
-Translation utilities using Google Translate API
+Translation utilities: retries, a bounded worker pool and the translation
+memory, on top of a pluggable backend (see translation_backends)
 """
 
-from googletrans import Translator, LANGUAGES
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
 import logging
+import random
+import threading
+import time
+
+from translation_backends import GoogletransBackend, join_sentences, split_sentences
 
 class TextTranslator:
     """Handle text translation between languages"""
     
-    def __init__(self):
-        self.translator = Translator()
+    def __init__(self, workers=4, timeout=10.0, retries=2, backoff=0.5, client_factory=None, memory=None, backend=None):
+        """
+        Args:
+            workers: Chunk translations in flight at once, for the whole process
+            timeout: Seconds allowed for one request to the translation service
+            retries: Extra attempts for a failed chunk
+            backoff: Base delay in seconds; attempt n waits up to backoff * 2**n
+            client_factory: googletrans client factory for the default
+                backend (see GoogletransBackend)
+            memory: TranslationMemory; when given, texts are translated
+                sentence by sentence and only unseen sentences are sent
+            backend: Translation backend (default: GoogletransBackend)
+        """
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.backend = backend or GoogletransBackend(timeout=timeout, client_factory=client_factory)
+        self.memory = memory
+        self._executor = None
+        self._attempt_executor = None
+        self._lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
     
+    def set_client_factory(self, client_factory):
+        """Use another googletrans client from now on (default backend only)"""
+        self.backend.set_client_factory(client_factory)
+    
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix='translate'
+                )
+            return self._executor
+    
+    def _get_attempt_executor(self):
+        with self._lock:
+            if self._attempt_executor is None:
+                # Room for abandoned attempts still hanging next to live ones
+                self._attempt_executor = ThreadPoolExecutor(
+                    max_workers=self.workers * 2,
+                    thread_name_prefix='translate-attempt'
+                )
+            return self._attempt_executor
+    
     def translate(self, text, target_lang='en', source_lang='auto'):
         """
         Translate text to target language
@@ -33,20 +82,137 @@ class TextTranslator:
             if source_lang != 'auto' and source_lang == target_lang:
                 return text
             
-            # Translate
-            result = self.translator.translate(
-                text,
-                src=source_lang,
-                dest=target_lang
-            )
-            
-            return result.text
+            return self._translate_texts([text], target_lang, source_lang)[0]
             
         except Exception as e:
             self.logger.error(f"Translation error: {str(e)}")
             # Return original text if translation fails
             return text
     
+    def _attempt(self, texts, target_lang, source_lang):
+        """
+        One backend call; for network backends it is bounded by timeout
+        
+        A thread cannot be stopped, so a call still running at the deadline
+        is abandoned: it finishes (or hangs) on its own and its result is
+        dropped. Local backends run inline without a deadline.
+        """
+        if not self.backend.concurrent or not self.timeout:
+            return self.backend.translate_batch(texts, source_lang, target_lang)
+        future = self._get_attempt_executor().submit(self.backend.translate_batch, texts, source_lang, target_lang)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise Exception(f"no response within {self.timeout}s (attempt abandoned)")
+    
+    def _translate_with_retry(self, texts, target_lang, source_lang):
+        """Translate texts with the backend, retrying failures and timeouts with jittered exponential backoff"""
+        for attempt in range(self.retries + 1):
+            try:
+                return self._attempt(texts, target_lang, source_lang)
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                delay = random.uniform(0, self.backoff * (2 ** attempt))
+                self.logger.warning(
+                    f"Translation attempt {attempt + 1} failed ({e}), retrying in {delay:.2f}s"
+                )
+                time.sleep(delay)
+    
+    def _translate_texts(self, texts, target_lang, source_lang):
+        """
+        Translate texts, through the translation memory when there is one
+        
+        The texts are split into sentences. Sentences already in the memory
+        are reused, the rest are sent to the backend in one batch and
+        stored, and the translations are put back between the original
+        separators.
+        """
+        if self.memory is None:
+            return self._translate_with_retry(texts, target_lang, source_lang)
+        
+        split = [split_sentences(text) for text in texts]
+        sentences = [sentence for _, _, text_sentences in split for sentence in text_sentences]
+        known = self.memory.get_many(sentences, source_lang, target_lang)
+        missing = [sentence for sentence in dict.fromkeys(sentences) if sentence not in known]
+        if missing:
+            translated = dict(zip(missing, self._translate_with_retry(missing, target_lang, source_lang)))
+            self.memory.put_many(translated, source_lang, target_lang)
+            known.update(translated)
+        else:
+            self.logger.info(f"All {len(sentences)} sentences found in the translation memory")
+        
+        return [
+            join_sentences(text, spans, [known[sentence] for sentence in text_sentences])
+            for text, spans, text_sentences in split
+        ]
+    
+    def translate_chunks(self, texts, target_lang='en', source_lang='auto'):
+        """
+        Translate chunks, concurrently for network backends
+        
+        With a network backend the chunks are spread over the shared,
+        bounded worker pool and each one is retried on its own. Every
+        attempt is cut off after timeout seconds (see _attempt). A chunk
+        that still fails comes back as None so the caller can keep the
+        original. A local backend gets all chunks of a source language in
+        one call, so it can batch their sentences.
+        
+        Args:
+            texts: Chunks to translate
+            target_lang: Target language code
+            source_lang: Source language code, or a list with one per chunk
+            
+        Returns:
+            List of translations (or None) in the order of texts
+        """
+        sources = source_lang if isinstance(source_lang, (list, tuple)) else [source_lang] * len(texts)
+        results = [None] * len(texts)
+        pending = []
+        for index, (text, source) in enumerate(zip(texts, sources)):
+            if not text or not text.strip() or (source != 'auto' and source == target_lang):
+                results[index] = text
+            else:
+                pending.append(index)
+        
+        if not self.backend.concurrent:
+            for source in dict.fromkeys(sources[i] for i in pending):
+                group = [i for i in pending if sources[i] == source]
+                try:
+                    translated = self._translate_texts([texts[i] for i in group], target_lang, source)
+                except Exception as e:
+                    self.logger.error(f"Translation of {len(group)} chunks from {source} failed: {e}")
+                    continue
+                for index, result in zip(group, translated):
+                    results[index] = result
+            return results
+        
+        executor = self._get_executor()
+        futures = {
+            executor.submit(self._translate_texts, [texts[index]], target_lang, sources[index]): index
+            for index in pending
+        }
+        
+        # Backstop only: attempts are already bounded. Chunks wait their turn
+        # for a worker, so the deadline grows with the queue.
+        rounds = -(-len(futures) // self.workers)
+        per_chunk = self.timeout * (self.retries + 1) + self.backoff * (2 ** (self.retries + 1))
+        done, pending = wait(futures, timeout=per_chunk * max(1, rounds))
+        
+        for future in pending:
+            if future.cancel():
+                self.logger.error(f"Translation of chunk {futures[future] + 1} timed out before it started")
+            else:
+                # Still running: its result is dropped when it finishes
+                self.logger.error(f"Translation of chunk {futures[future] + 1} timed out and was abandoned")
+        for future in done:
+            try:
+                results[futures[future]] = future.result()[0]
+            except Exception as e:
+                self.logger.error(f"Translation of chunk {futures[future] + 1} failed: {e}")
+        return results
+    
     def detect_language(self, text):
         """
         Detect language of text
@@ -58,15 +224,14 @@ class TextTranslator:
             Detected language code
         """
         try:
-            result = self.translator.detect(text)
-            return result.lang
+            return self.backend.detect_language(text)
         except Exception as e:
             self.logger.error(f"Language detection error: {str(e)}")
             return 'en'
     
     def translate_batch(self, texts, target_lang='en', source_lang='auto'):
         """
-        Translate multiple texts
+        Translate multiple texts, in parallel or as one batch depending on the backend
         
         Args:
             texts: List of texts to translate
@@ -74,24 +239,15 @@ class TextTranslator:
             source_lang: Source language code
             
         Returns:
-            List of translated texts
+            List of translated texts (the original where translation failed)
         """
-        try:
-            results = []
-            for text in texts:
-                translated = self.translate(text, target_lang, source_lang)
-                results.append(translated)
-            return results
-        except Exception as e:
-            self.logger.error(f"Batch translation error: {str(e)}")
-            return texts
+        translated = self.translate_chunks(texts, target_lang, source_lang)
+        return [result if result is not None else text for text, result in zip(texts, translated)]
     
-    @staticmethod
-    def get_supported_languages():
-        """Get all supported language codes and names"""
-        return LANGUAGES
+    def get_supported_languages(self):
+        """Get all language codes and names supported by the backend"""
+        return self.backend.supported_languages()
     
-    @staticmethod
-    def is_language_supported(lang_code):
-        """Check if language is supported"""
-        return lang_code.lower() in LANGUAGES
\ No newline at end of file
+    def is_language_supported(self, lang_code):
+        """Check if the backend supports a language"""
+        return lang_code.lower() in self.get_supported_languages()
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Disk-spooled uploads: request bodies go straight to temp files, hashed as they stream
+"""
+
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+logger = logging.getLogger(__name__)
+
+SPOOL_PREFIX = 'upload-'
+
+
+class UploadTooLarge(RequestEntityTooLarge):
+    """An upload went over the per-file size limit or the per-request quota"""
+
+
+class RequestQuota:
+    """Temp space one request may use across all of its uploaded files"""
+
+    def __init__(self, limit_bytes):
+        self.limit_bytes = limit_bytes
+        self.used_bytes = 0
+
+    def reserve(self, size):
+        self.used_bytes += size
+        if self.limit_bytes and self.used_bytes > self.limit_bytes:
+            raise UploadTooLarge(
+                f"Uploads exceed the per-request limit of {self.limit_bytes // (1024 * 1024)}MB"
+            )
+
+
+class SpoolFile(io.BufferedRandom):
+    """
+    Temp file an upload is written into
+
+    Every write is hashed and counted against the size limits, so the
+    SHA-256 and size are known as soon as the body has been received. The
+    file is removed when it is closed (Flask closes uploads at the end of
+    the request) unless it was moved elsewhere with move_to.
+    """
+
+    def __init__(self, directory=None, max_bytes=None, quota=None):
+        fd, path = tempfile.mkstemp(prefix=SPOOL_PREFIX, dir=directory)
+        super().__init__(io.FileIO(fd, 'r+b'))
+        self.path = path
+        self.size = 0
+        self.max_bytes = max_bytes
+        self.quota = quota
+        self._hasher = hashlib.sha256()
+
+    def write(self, data):
+        size = memoryview(data).nbytes
+        self.size += size
+        if self.max_bytes and self.size > self.max_bytes:
+            raise UploadTooLarge(
+                f"File size exceeds maximum allowed size of {self.max_bytes // (1024 * 1024)}MB"
+            )
+        if self.quota is not None:
+            self.quota.reserve(size)
+        self._hasher.update(data)
+        return super().write(data)
+
+    @property
+    def sha256(self):
+        """Hex SHA-256 of everything written so far"""
+        return self._hasher.hexdigest()
+
+    def move_to(self, destination):
+        """Hand the file over to destination instead of deleting it on close"""
+        self.flush()
+        try:
+            os.replace(self.path, destination)
+        except OSError:
+            # Different filesystem
+            shutil.copyfile(self.path, destination)
+            os.remove(self.path)
+        self.path = None
+        self.close()
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+            self.path = None
+
+
+class UploadRequest(Request):
+    """Flask request whose file uploads are spooled to disk by SpoolFile"""
+
+    spool_dir = None
+    max_file_bytes = 10 * 1024 * 1024
+    request_quota_bytes = 10 * 1024 * 1024
+
+    @classmethod
+    def configure(cls, spool_dir=None, max_file_bytes=None, request_quota_bytes=None):
+        """Set where uploads are spooled and how much space they may take"""
+        if spool_dir:
+            os.makedirs(spool_dir, exist_ok=True)
+        cls.spool_dir = spool_dir
+        cls.max_file_bytes = max_file_bytes
+        cls.request_quota_bytes = request_quota_bytes
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        quota = getattr(self, '_spool_quota', None)
+        if quota is None:
+            quota = self._spool_quota = RequestQuota(self.request_quota_bytes)
+        return SpoolFile(self.spool_dir, self.max_file_bytes, quota)
+
+
+def upload_sha256(file):
+    """SHA-256 of an uploaded file if it was spooled, else None"""
+    return getattr(getattr(file, 'stream', file), 'sha256', None)
+
+
+def save_upload(file, destination):
+    """Move a spooled upload to destination (copying only when it must)"""
+    stream = getattr(file, 'stream', file)
+    if isinstance(stream, SpoolFile) and stream.path:
+        stream.move_to(destination)
+    else:
+        file.save(destination)
+
+
+def purge_stale_spools(directory, max_age_seconds=3600):
+    """Delete spool files left behind by crashed workers"""
+    if not directory or not os.path.isdir(directory):
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            if name.startswith(SPOOL_PREFIX) and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            continue
+    if removed:
+        logger.info(f"Removed {removed} stale upload spool files")
+    return removed
@@ -3,6 +3,7 @@ Configuration file for Text Summarization Application
 """
 
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -16,6 +17,13 @@ class Config:
     DEBUG = False
     TESTING = False
     
+    # Writable state lives outside the source tree: databases and caches in
+    # DATA_DIR, upload spools in the system temp directory
+    DATA_DIR = os.environ.get('DATA_DIR') or os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'text-summarizer'
+    )
+    TEMP_DIR = os.path.join(tempfile.gettempdir(), 'text-summarizer')
+    
     # API Configuration
     API_HOST = os.environ.get('API_HOST') or '0.0.0.0'
     API_PORT = int(os.environ.get('API_PORT') or 5000)
@@ -27,6 +35,94 @@ class Config:
     DEFAULT_MODEL = 'facebook/bart-large-cnn'
     MAX_SUMMARY_LENGTH = 500
     MIN_SUMMARY_LENGTH = 30
+    # 'fp32', 'int8' (dynamic quantization) or 'onnx'; prepare with backend/prepare_models.py
+    INFERENCE_BACKEND = os.environ.get('INFERENCE_BACKEND') or 'fp32'
+    # Unload least recently used idle models above this many MB (0 = no limit)
+    MODEL_MEMORY_LIMIT_MB = int(os.environ.get('MODEL_MEMORY_LIMIT_MB') or 0)
+    # Sharing model weights between gunicorn workers (see backend/gunicorn.conf.py):
+    # PRELOAD_MODELS ('bart', 'mbart', comma separated) are loaded in the master before
+    # it forks, and MMAP_WEIGHTS maps fp32 weights from files prepared with
+    # `prepare_models.py --backend mmap`. Either way workers share read-only pages.
+    PRELOAD_MODELS = [name.strip() for name in (os.environ.get('PRELOAD_MODELS') or '').split(',') if name.strip()]
+    MMAP_WEIGHTS = (os.environ.get('MMAP_WEIGHTS') or 'false').lower() == 'true'
+    EXTRACTIVE_SCORER = os.environ.get('EXTRACTIVE_SCORER') or 'frequency'  # frequency, tfidf, centroid
+    
+    # Startup: torch, transformers, NLTK, googletrans, PyPDF2 and reportlab are
+    # imported by the first request that needs them. Set LAZY_STARTUP=false to
+    # import them and load the English model while the worker boots instead.
+    LAZY_STARTUP = (os.environ.get('LAZY_STARTUP') or 'true').lower() != 'false'
+    STARTUP_BUDGET_MS = int(os.environ.get('STARTUP_BUDGET_MS') or 1500)  # Checked by backend/startup.py
+    # NLTK data (punkt, stopwords) is read from this directory; no downloads unless NLTK_DOWNLOAD=true
+    NLTK_DATA_DIR = os.environ.get('NLTK_DATA_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data')
+    NLTK_DOWNLOAD = (os.environ.get('NLTK_DOWNLOAD') or 'false').lower() == 'true'
+    
+    # Language detection samples a bounded part of the text (see language_detector.py).
+    # LANGUAGE_SEGMENTS also labels every translation chunk, so chunks of a
+    # mixed-language document that are already English are not translated.
+    LANGUAGE_SEGMENTS = (os.environ.get('LANGUAGE_SEGMENTS') or 'false').lower() == 'true'
+    
+    # Chunk translation: requests in flight per process (keep within the service's
+    # rate limit), seconds per request, retries and base backoff for jittered retries
+    # 'googletrans' (web), 'mbart' (local, reuses the mBART-50 checkpoint) or 'http' (LibreTranslate API)
+    TRANSLATION_BACKEND = os.environ.get('TRANSLATION_BACKEND') or 'googletrans'
+    TRANSLATION_HTTP_URL = os.environ.get('TRANSLATION_HTTP_URL') or 'http://localhost:5000'
+    TRANSLATION_HTTP_API_KEY = os.environ.get('TRANSLATION_HTTP_API_KEY')
+    TRANSLATION_BATCH_SIZE = int(os.environ.get('TRANSLATION_BATCH_SIZE') or 8)  # mbart: sentences per generate()
+    TRANSLATION_BEAMS = int(os.environ.get('TRANSLATION_BEAMS') or 2)
+    # Native mBART summaries: longer inputs are map-reduced in chunks of this many tokens
+    NATIVE_CHUNK_TOKENS = int(os.environ.get('NATIVE_CHUNK_TOKENS') or 900)
+    NATIVE_BEAMS = int(os.environ.get('NATIVE_BEAMS') or 4)
+    TRANSLATION_CHUNK_TOKENS = int(os.environ.get('TRANSLATION_CHUNK_TOKENS') or 512)  # Estimated tokens per translated chunk
+    TRANSLATION_WORKERS = int(os.environ.get('TRANSLATION_WORKERS') or 4)
+    TRANSLATION_TIMEOUT = float(os.environ.get('TRANSLATION_TIMEOUT') or 10)
+    TRANSLATION_RETRIES = int(os.environ.get('TRANSLATION_RETRIES') or 2)
+    TRANSLATION_BACKOFF = float(os.environ.get('TRANSLATION_BACKOFF') or 0.5)
+    # Sentence-level translation memory (SQLite, shared by the workers on a host)
+    TRANSLATION_MEMORY_ENABLED = (os.environ.get('TRANSLATION_MEMORY_ENABLED') or 'true').lower() == 'true'
+    TRANSLATION_MEMORY_PATH = os.environ.get('TRANSLATION_MEMORY_PATH') or os.path.join(DATA_DIR, 'translations.sqlite3')
+    TRANSLATION_MEMORY_MAX_MB = int(os.environ.get('TRANSLATION_MEMORY_MAX_MB') or 128)
+    
+    # Micro-batching for concurrent BART requests
+    BATCH_ENABLED = (os.environ.get('BATCH_ENABLED') or 'true').lower() == 'true'
+    BATCH_MAX_WAIT_MS = int(os.environ.get('BATCH_MAX_WAIT_MS') or 20)
+    BATCH_MAX_SIZE = int(os.environ.get('BATCH_MAX_SIZE') or 8)
+    
+    # Long documents (>1000 words): 'extractive' pre-reduction or 'map_reduce'
+    LONG_TEXT_MODE = os.environ.get('LONG_TEXT_MODE') or 'map_reduce'
+    MAP_REDUCE_FAN_OUT = int(os.environ.get('MAP_REDUCE_FAN_OUT') or 8)
+    MAP_REDUCE_WORKERS = int(os.environ.get('MAP_REDUCE_WORKERS') or 2)
+    MAP_REDUCE_CHUNK_TOKENS = 900
+    MAP_REDUCE_OVERLAP_TOKENS = int(os.environ.get('MAP_REDUCE_OVERLAP_TOKENS') or 0)  # Context repeated between chunks
+    
+    # Uploads are spooled to disk, so the limit is about disk space, not RAM
+    MAX_UPLOAD_MB = int(os.environ.get('MAX_UPLOAD_MB') or 300)
+    UPLOAD_REQUEST_QUOTA_MB = int(os.environ.get('UPLOAD_REQUEST_QUOTA_MB') or 300)  # All files in one request
+    UPLOAD_SPOOL_DIR = os.environ.get('UPLOAD_SPOOL_DIR') or os.path.join(TEMP_DIR, 'uploads')
+    MAX_CONTENT_LENGTH = (UPLOAD_REQUEST_QUOTA_MB + 1) * 1024 * 1024  # Flask: reject bigger bodies outright
+    
+    # Server-side documents referenced by document_id
+    DOCUMENT_DB_PATH = os.environ.get('DOCUMENT_DB_PATH') or os.path.join(DATA_DIR, 'documents.sqlite3')
+    DOCUMENT_STORE_MAX_MB = int(os.environ.get('DOCUMENT_STORE_MAX_MB') or 512)
+    DOCUMENT_STORE_MAX_DOCUMENTS = int(os.environ.get('DOCUMENT_STORE_MAX_DOCUMENTS') or 1000)
+    DOCUMENT_TTL = int(os.environ.get('DOCUMENT_TTL') or 3600)  # Seconds since last use
+    
+    # PDF extraction: processes reading page ranges in parallel (0 = single thread)
+    PDF_EXTRACT_WORKERS = int(os.environ.get('PDF_EXTRACT_WORKERS') or 0)
+    
+    # Background jobs (/api/jobs)
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS') or 2)
+    JOB_DB_PATH = os.environ.get('JOB_DB_PATH') or os.path.join(DATA_DIR, 'jobs.sqlite3')
+    JOB_UPLOAD_DIR = os.environ.get('JOB_UPLOAD_DIR') or os.path.join(TEMP_DIR, 'jobs')
+    JOB_RESULT_TTL = 3600  # Finished jobs are kept for 1 hour
+    
+    # PDF reports for originals this long are rendered as a background job
+    REPORT_BACKGROUND_MIN_WORDS = int(os.environ.get('REPORT_BACKGROUND_MIN_WORDS') or 50000)
+    
+    # Bulk summarization (/api/summarize/batch)
+    BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS') or 500)
+    BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE') or 8)
+    BULK_WORKERS = int(os.environ.get('BULK_WORKERS') or 4)
+    BULK_EXTRACTIVE_PROCESSES = int(os.environ.get('BULK_EXTRACTIVE_PROCESSES') or 2)
     
     # Rate Limiting
     RATE_LIMIT_ENABLED = False
@@ -38,8 +134,12 @@ class Config:
     
     # Cache Configuration
     CACHE_ENABLED = False
-    CACHE_TYPE = 'simple'
+    CACHE_TYPE = os.environ.get('CACHE_TYPE') or 'simple'  # 'simple' (memory) or 'disk' (memory + SQLite)
     CACHE_DEFAULT_TIMEOUT = 300  # 5 minutes
+    CACHE_MAX_ENTRIES = 1024
+    CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64MB in-process
+    CACHE_DIR = os.environ.get('CACHE_DIR') or DATA_DIR
+    CACHE_DISK_MAX_BYTES = 512 * 1024 * 1024  # 512MB shared on disk
 
 
 class DevelopmentConfig(Config):
@@ -55,10 +155,8 @@ class ProductionConfig(Config):
     RATE_LIMIT_ENABLED = True
     CACHE_ENABLED = True
     
-    # Override with environment variables in production
+    # Override with environment variables in production (checked in get_config)
     SECRET_KEY = os.environ.get('SECRET_KEY')
-    if not SECRET_KEY:
-        raise ValueError("SECRET_KEY must be set in production")
 
 
 class TestingConfig(Config):
@@ -81,4 +179,7 @@ def get_config(env=None):
     """Get configuration based on environment"""
     if env is None:
         env = os.environ.get('FLASK_ENV') or 'development'
-    return config.get(env, config['default'])
\ No newline at end of file
+    selected = config.get(env, config['default'])
+    if selected is ProductionConfig and not selected.SECRET_KEY:
+        raise ValueError("SECRET_KEY must be set in production")
+    return selected
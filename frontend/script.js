@@ -62,6 +62,7 @@ const stats = document.getElementById('stats');
 const methodSelect = document.getElementById('method');
 const lengthSelect = document.getElementById('length');
 const targetLangSelect = document.getElementById('targetLang');
+const deliverySelect = document.getElementById('delivery');
 const actionButtons = document.getElementById('actionButtons');
 const languageInfo = document.getElementById('languageInfo');
 const detectedLang = document.getElementById('detectedLang');
@@ -85,6 +86,9 @@ const translateTargetLang = document.getElementById('translateTargetLang');
 let currentFile = null;
 let currentSummary = null;
 let currentOriginalText = null;
+let currentDocumentId = null; // Server-side copy of the uploaded text
+let documentText = null; // Text that document holds, to notice edits
+let summaryDocumentId = null; // Document the current summary was made from
 let currentStats = null;
 let detectedLanguage = null;
 let hasUnsavedChanges = false;
@@ -199,7 +203,8 @@ async function detectLanguage() {
         
         if (response.ok) {
             detectedLanguage = data.language_code;
-            detectedLang.textContent = `Detected: ${data.language_name} (${data.language_code})`;
+            const confidence = data.confidence ? `, ${Math.round(data.confidence * 100)}%` : '';
+            detectedLang.textContent = `Detected: ${data.language_name} (${data.language_code}${confidence})`;
             languageInfo.style.display = 'flex';
         }
     } catch (error) {
@@ -217,19 +222,17 @@ function handleFileSelect(e) {
 
 // Process file
 async function handleFile(file) {
-    const allowedTypes = [
-        'application/pdf', 
-        'application/vnd.openxmlformats-officedocument.wordprocessingml.document', 
-        'text/plain'
-    ];
-    
-    if (!allowedTypes.includes(file.type)) {
-        showError('Invalid file type. Please upload PDF, DOCX, or TXT files.');
+    // Browsers report no MIME type for some of these (.md, .epub), so check the extension
+    const allowedExtensions = ['pdf', 'docx', 'txt', 'html', 'htm', 'md', 'markdown', 'epub'];
+    const extension = file.name.includes('.') ? file.name.split('.').pop().toLowerCase() : '';
+    
+    if (!allowedExtensions.includes(extension)) {
+        showError('Invalid file type. Please upload PDF, DOCX, TXT, HTML, Markdown or EPUB files.');
         return;
     }
     
-    if (file.size > 10 * 1024 * 1024) {
-        showError('File size exceeds 10MB limit.');
+    if (file.size > 300 * 1024 * 1024) {
+        showError('File size exceeds 300MB limit.');
         return;
     }
     
@@ -267,7 +270,16 @@ async function extractTextFromFile(file) {
         }
         
         if (response.ok) {
-            inputText.value = data.text;
+            // The upload returns only the id and metadata; the text is fetched separately
+            loadingText.textContent = 'Loading extracted text...';
+            const text = await fetchDocumentText(data.document_id);
+            if (text === null) {
+                showError('Failed to load the extracted text');
+                return;
+            }
+            inputText.value = text;
+            currentDocumentId = data.document_id;
+            documentText = text.trim();
             detectedLanguage = data.detected_language;
             markAsChanged();
             
@@ -289,6 +301,23 @@ async function extractTextFromFile(file) {
     }
 }
 
+// Fetch a stored document's text by id (null if it cannot be loaded)
+async function fetchDocumentText(documentId) {
+    const response = await fetch(`${API_URL}/documents/${encodeURIComponent(documentId)}?include_text=true`, {
+        headers: getAuthHeaders()
+    });
+    
+    if (response.status === 401) {
+        logout();
+        return null;
+    }
+    if (!response.ok) {
+        return null;
+    }
+    const data = await response.json();
+    return data.text;
+}
+
 // Remove file
 function handleRemoveFile() {
     if (isProcessing) {
@@ -299,6 +328,8 @@ function handleRemoveFile() {
     console.log('🗑️ Removing file...');
     
     currentFile = null;
+    currentDocumentId = null;
+    documentText = null;
     fileInput.value = '';
     fileInfo.style.display = 'none';
     uploadArea.style.display = 'block';
@@ -341,11 +372,16 @@ async function handleSummarize() {
         console.log('🚀 Sending summarization request...');
         console.log('Text length:', text.length, 'words:', text.split(' ').length);
         
-        const response = await fetch(`${API_URL}/summarize`, {
+        // An unedited upload is sent by document_id instead of posting the text back
+        let useDocument = currentDocumentId !== null && text === documentText;
+        // Streaming is opt-in: it decodes greedily and its results are not cached
+        const streaming = deliverySelect.value === 'stream';
+        const endpoint = streaming ? '/summarize/stream' : '/summarize';
+        const requestSummary = (source) => fetch(`${API_URL}${endpoint}`, {
             method: 'POST',
             headers: getAuthHeaders(),
             body: JSON.stringify({
-                text: text,
+                ...source,
                 method: methodSelect.value,
                 max_length: selectedLength.max,
                 min_length: selectedLength.min,
@@ -354,20 +390,60 @@ async function handleSummarize() {
             })
         });
         
+        let response = await requestSummary(useDocument ? { document_id: currentDocumentId } : { text: text });
+        
+        if (response.status === 404 && useDocument) {
+            // The stored document expired; fall back to sending the text
+            currentDocumentId = null;
+            useDocument = false;
+            response = await requestSummary({ text: text });
+        }
+        
         if (response.status === 401) {
             logout();
             return;
         }
         
-        const data = await response.json();
-        console.log('📦 Received response:', data);
+        if (!response.ok) {
+            const data = await response.json();
+            showError(data.error || 'An error occurred while summarizing');
+            return;
+        }
+        
+        let data = null;
+        
+        if (streaming) {
+            // Read NDJSON events: stage updates, summary tokens, then a final stats record
+            let streamedSummary = '';
+            await readEventStream(response, (event) => {
+                if (event.event === 'stage') {
+                    loadingText.textContent = STAGE_MESSAGES[event.stage] || 'Generating summary...';
+                } else if (event.event === 'token') {
+                    if (!streamedSummary) {
+                        // First token: drop the spinner and show text as it arrives
+                        loading.classList.remove('active');
+                    }
+                    streamedSummary += event.text;
+                    displayStreamingSummary(streamedSummary);
+                } else if (event.event === 'done') {
+                    data = event;
+                } else if (event.event === 'error') {
+                    data = { error: event.error };
+                }
+            });
+        } else {
+            data = await response.json();
+        }
         
-        if (response.ok && data.summary) {
+        console.log('📦 Received final record:', data);
+        
+        if (data && data.summary) {
             console.log('✅ Summary received:', data.summary.substring(0, 100) + '...');
             
             // Store in state FIRST
             currentSummary = data.summary;
             currentOriginalText = text;
+            summaryDocumentId = useDocument ? currentDocumentId : null;
             currentStats = {
                 original_length: data.original_length,
                 summary_length: data.summary_length,
@@ -382,7 +458,7 @@ async function handleSummarize() {
             // LOCK OUTPUT - Prevent any changes
             outputLocked = true;
             
-            // Display summary with PERMANENT styling
+            // Display the final summary (it may have been translated after streaming)
             displaySummary(data.summary);
             
             // Show language info
@@ -410,7 +486,7 @@ async function handleSummarize() {
             
         } else {
             console.error('❌ Summary generation failed:', data);
-            showError(data.error || 'An error occurred while summarizing');
+            showError((data && data.error) || 'An error occurred while summarizing');
         }
     } catch (error) {
         console.error('❌ Error:', error);
@@ -425,6 +501,51 @@ async function handleSummarize() {
     }
 }
 
+// Loading messages for streamed stage events
+const STAGE_MESSAGES = {
+    'language_detected': 'Language detected, summarizing...',
+    'translation_done': 'Translation done, summarizing...',
+    'extractive_reduction_done': 'Key sentences selected, summarizing...',
+    'map_reduce_done': 'Sections summarized, merging...',
+    'summary_translated': 'Translating summary...'
+};
+
+// Read a newline-delimited JSON response, calling onEvent for each record
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        
+        lines.filter(line => line.trim()).forEach(line => onEvent(JSON.parse(line)));
+    }
+    
+    if (buffer.trim()) {
+        onEvent(JSON.parse(buffer));
+    }
+}
+
+// Update the summary box while tokens are still arriving
+function displayStreamingSummary(summaryText) {
+    let summaryParagraph = summaryDiv.querySelector('p.streaming');
+    
+    if (!summaryParagraph) {
+        displaySummary(summaryText);
+        summaryParagraph = summaryDiv.querySelector('p');
+        summaryParagraph.classList.add('streaming');
+        return;
+    }
+    
+    summaryParagraph.textContent = summaryText;
+}
+
 // Separate function to display summary safely
 function displaySummary(summaryText) {
     console.log('🖼️ Displaying summary...');
@@ -556,21 +677,37 @@ async function handleDownload() {
     loading.classList.add('active');
     
     try {
-        const response = await fetch(`${API_URL}/download-pdf`, {
+        const requestPdf = (source) => fetch(`${API_URL}/download-pdf`, {
             method: 'POST',
             headers: getAuthHeaders(),
             body: JSON.stringify({
-                original_text: currentOriginalText,
+                ...source,
                 summary: currentSummary,
                 stats: currentStats
             })
         });
         
+        let response = await requestPdf(
+            summaryDocumentId ? { document_id: summaryDocumentId } : { original_text: currentOriginalText }
+        );
+        
+        if (response.status === 404 && summaryDocumentId) {
+            summaryDocumentId = null;
+            response = await requestPdf({ original_text: currentOriginalText });
+        }
+        
         if (response.status === 401) {
             logout();
             return;
         }
         
+        if (response.status === 202) {
+            // Very large report: rendered as a background job
+            loadingText.textContent = 'Rendering large PDF...';
+            const job = await response.json();
+            response = await waitForReport(job.job_id);
+        }
+        
         if (response.ok) {
             const blob = await response.blob();
             const url = window.URL.createObjectURL(blob);
@@ -597,6 +734,21 @@ async function handleDownload() {
     }
 }
 
+// Poll a background report job, then fetch its PDF
+async function waitForReport(jobId) {
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        const statusResponse = await fetch(`${API_URL}/jobs/${jobId}`, { headers: getAuthHeaders() });
+        const job = await statusResponse.json();
+        if (!statusResponse.ok || job.status === 'failed' || job.status === 'cancelled') {
+            throw new Error(job.error || 'PDF generation failed');
+        }
+        if (job.status === 'completed') {
+            return fetch(`${API_URL}/jobs/${jobId}/download`, { headers: getAuthHeaders() });
+        }
+    }
+}
+
 // Clear all
 function handleClear() {
     if (isProcessing) {
@@ -634,12 +786,16 @@ function handleClear() {
     
     currentSummary = null;
     currentOriginalText = null;
+    currentDocumentId = null;
+    documentText = null;
+    summaryDocumentId = null;
     currentStats = null;
     detectedLanguage = null;
     
     methodSelect.value = 'transformer';
     lengthSelect.value = 'medium';
     targetLangSelect.value = 'auto';
+    deliverySelect.value = 'complete';
     
     markAsSaved();
     
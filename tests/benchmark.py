@@ -0,0 +1,406 @@
+"""
+Offline performance benchmarks for the summarization stack
+
+Runs extractive scoring, text chunking, file extraction, PDF generation and
+end-to-end Flask requests against stub models (see stub_models.py), writes
+the timings as JSON and compares them with a stored baseline.
+
+Usage:
+    python tests/benchmark.py                      # run and compare
+    python tests/benchmark.py --only extractive    # one group
+    python tests/benchmark.py --update-baseline    # record this machine's numbers
+    python tests/benchmark.py --strict             # also fail on skipped groups
+
+Exits with status 1 when any benchmark's median is slower than its
+baseline by more than the tolerance. Groups whose dependencies are missing
+are skipped and listed in the report; with --strict a skip fails the run too.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from io import BytesIO
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+sys.path.append(os.path.join(ROOT_DIR, 'backend'))
+sys.path.append(ROOT_DIR)
+sys.path.append(TESTS_DIR)
+
+DEFAULT_BASELINE = os.path.join(TESTS_DIR, 'benchmark_baseline.json')
+DEFAULT_TOLERANCE = 0.3
+# Medians this close to the baseline never count as regressions (timer noise)
+MIN_SLACK_MS = 2.0
+
+VOCABULARY = (
+    'research team model data system language network energy market city '
+    'policy health climate water students school project results analysis '
+    'growth company industry government report study process design future '
+    'technology computer science history culture people community public '
+    'important significant new large small early recent global local major '
+    'develop improve increase reduce provide require support include show '
+    'change measure build create manage protect train learn use find explain'
+).split()
+
+STOP_WORDS = (
+    'the a an and or of to in on for with is are was were be by as at this that it from'
+).split()
+
+GROUPS = {}
+
+
+def group(name):
+    """Register a benchmark group; the function returns [(case_name, callable), ...]"""
+    def register(setup):
+        GROUPS[name] = setup
+        return setup
+    return register
+
+
+def make_sentences(count, seed=13):
+    """Deterministic English-looking sentences"""
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(count):
+        words = [rng.choice(VOCABULARY) for _ in range(rng.randint(8, 24))]
+        for position in range(2, len(words), 5):
+            words[position] = rng.choice(STOP_WORDS)
+        sentences.append(' '.join(words).capitalize() + '.')
+    return sentences
+
+
+def make_text(words, seed=13):
+    sentences = []
+    total = 0
+    for sentence in make_sentences(words // 8 + 1, seed):
+        if total >= words:
+            break
+        sentences.append(sentence)
+        total += len(sentence.split())
+    return ' '.join(sentences)
+
+
+def make_pdf(pages, seed=13):
+    """PDF with roughly pages pages of paragraphs"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+    buffer = BytesIO()
+    style = getSampleStyleSheet()['Normal']
+    paragraphs = [
+        Paragraph(' '.join(make_sentences(8, seed + i)), style)
+        for i in range(pages * 6)
+    ]
+    SimpleDocTemplate(buffer, pagesize=letter).build(paragraphs)
+    return buffer.getvalue()
+
+
+def make_docx(paragraphs, seed=13):
+    from docx import Document
+
+    document = Document()
+    for i in range(paragraphs):
+        document.add_paragraph(' '.join(make_sentences(5, seed + i)))
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+@group('extractive')
+def extractive_cases(options):
+    from extractive import ExtractiveScorer
+
+    scorer = ExtractiveScorer(STOP_WORDS)
+    cases = []
+    for size in (100, 1000, 10000):
+        sentences = make_sentences(size)
+        for name in ExtractiveScorer.SCORERS:
+            cases.append((
+                f"extractive.{name}.{size}_sentences",
+                lambda sentences=sentences, name=name: scorer.summarize(sentences, 10, name)
+            ))
+    return cases
+
+
+@group('chunking')
+def chunking_cases(options):
+    from multilingual_summarizer import MultilingualSummarizer
+
+    multilingual = MultilingualSummarizer()
+    cases = []
+    for words in (5000, 50000):
+        text = make_text(words)
+        cases.append((
+            f"chunking.chunk_text.{words}_words",
+            lambda text=text: multilingual._chunk_text(text)
+        ))
+    # No spaces and only full-width stops: one sentence per '。'
+    cjk = '今天我们讨论了项目的进展和下一步的计划。' * 5000
+    cases.append((
+        "chunking.chunk_text.cjk_100000_chars",
+        lambda: multilingual._chunk_text(cjk)
+    ))
+    return cases
+
+
+def python_docx_text(data):
+    from docx import Document
+
+    return '\n'.join(paragraph.text for paragraph in Document(BytesIO(data)).paragraphs).strip()
+
+
+@group('file_handler')
+def file_handler_cases(options):
+    from file_handler import FileHandler
+
+    pdf = make_pdf(20)
+    large_pdf = make_pdf(120)
+    docx = make_docx(300)
+    large_docx = make_docx(3000)
+    original = make_text(5000)
+    long_original = make_text(50000)
+    summary = make_text(150, seed=7)
+    stats = {'original_length': 5000, 'summary_length': 150, 'compression_ratio': '3.0%'}
+    return [
+        ('file_handler.extract_pdf.20_pages', lambda: FileHandler.extract_text(BytesIO(pdf), 'doc.pdf')),
+        ('file_handler.extract_pdf.120_pages', lambda: FileHandler.extract_text(BytesIO(large_pdf), 'doc.pdf')),
+        ('file_handler.extract_pdf.120_pages_4_workers',
+         lambda: FileHandler.extract_text(BytesIO(large_pdf), 'doc.pdf', pdf_workers=4)),
+        ('file_handler.extract_pdf.first_10_of_120_pages',
+         lambda: FileHandler.extract_text(BytesIO(large_pdf), 'doc.pdf', max_pages=10)),
+        ('file_handler.extract_docx.300_paragraphs', lambda: FileHandler.extract_text(BytesIO(docx), 'doc.docx')),
+        ('file_handler.extract_docx.3000_paragraphs',
+         lambda: FileHandler.extract_text(BytesIO(large_docx), 'doc.docx')),
+        # Reference: the python-docx object model the streaming reader replaced
+        ('file_handler.extract_docx_python_docx.3000_paragraphs', lambda: python_docx_text(large_docx)),
+        ('file_handler.generate_pdf.5000_words', lambda: FileHandler.generate_pdf(original, summary, stats)),
+        ('file_handler.generate_pdf.50000_words', lambda: FileHandler.generate_pdf(long_original, summary, stats)),
+        ('file_handler.stream_pdf.50000_words',
+         lambda: sum(len(chunk) for chunk in FileHandler.stream_pdf(long_original, summary, stats)))
+    ]
+
+
+@group('flask')
+def flask_cases(options):
+    import app as app_module
+    from stub_models import install_stubs
+
+    install_stubs(
+        app_module.summarizer,
+        app_module.multilingual_summarizer,
+        token_cost_ms=options.token_cost_ms
+    )
+    # Measure the work, not cache hits
+    app_module.summary_service.cache = None
+    client = app_module.app.test_client()
+
+    short = make_text(600)
+    long = make_text(4000)
+    docx = make_docx(60)
+    pdf_request = {
+        'original_text': make_text(3000),
+        'summary': make_text(150, seed=7),
+        'stats': {'original_length': 3000, 'summary_length': 150}
+    }
+
+    def post_json(path, payload):
+        def run():
+            response = client.post(path, json=payload)
+            if response.status_code != 200:
+                raise Exception(f"{path} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+            return response.get_data()
+        return run
+
+    def post_file():
+        response = client.post('/api/summarize-file', data={
+            'file': (BytesIO(docx), 'doc.docx'),
+            'method': 'transformer'
+        }, content_type='multipart/form-data')
+        if response.status_code != 200:
+            raise Exception(f"/api/summarize-file returned {response.status_code}")
+        return response.get_data()
+
+    return [
+        ('flask.summarize.extractive.600_words', post_json('/api/summarize', {'text': short, 'method': 'extractive'})),
+        ('flask.summarize.transformer.600_words', post_json('/api/summarize', {'text': short})),
+        ('flask.summarize.transformer.4000_words', post_json('/api/summarize', {'text': long})),
+        ('flask.summarize.translate_fr.600_words', post_json('/api/summarize', {'text': short, 'target_lang': 'fr'})),
+        ('flask.summarize.native_fr.4000_words', post_json(
+            '/api/summarize', {'text': long, 'target_lang': 'fr', 'multilingual_mode': 'native'}
+        )),
+        ('flask.summarize_file.docx', post_file),
+        ('flask.download_pdf.3000_words', post_json('/api/download-pdf', pdf_request))
+    ]
+
+
+def measure(func, repeat, warmup=1):
+    """Time func; returns summary statistics in milliseconds"""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    timings.sort()
+    return {
+        'runs': repeat,
+        'median_ms': round(statistics.median(timings), 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'min_ms': round(timings[0], 3),
+        'p95_ms': round(timings[max(0, math.ceil(0.95 * len(timings)) - 1)], 3)
+    }
+
+
+def run_benchmarks(options):
+    """Run every selected group; groups whose dependencies are missing are skipped"""
+    results = {}
+    skipped = {}
+    for name, setup in GROUPS.items():
+        if options.only and name not in options.only:
+            continue
+        try:
+            cases = setup(options)
+        except (ImportError, LookupError, OSError) as e:
+            skipped[name] = f"{type(e).__name__}: {e}"
+            print(f"SKIP {name}: {skipped[name]}")
+            continue
+        for case_name, func in cases:
+            results[case_name] = measure(func, options.repeat)
+            print(f"{case_name:<50} {results[case_name]['median_ms']:>10.2f} ms")
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'token_cost_ms': options.token_cost_ms,
+        'results': results,
+        'skipped': skipped
+    }
+
+
+def compare(report, baseline, tolerance=None):
+    """
+    Compare a report with a baseline
+
+    A benchmark regresses when its median is more than the allowed
+    fraction above the baseline median and also more than MIN_SLACK_MS
+    slower in absolute terms. The allowed fraction is the entry's own
+    'tolerance', else the tolerance argument, else the baseline file's.
+
+    Returns:
+        (rows, regressions) where rows are (name, baseline_ms, current_ms,
+        ratio, status) for every benchmark in the report, followed by one
+        row per skipped group (current_ms None, status 'SKIPPED')
+    """
+    if tolerance is None:
+        tolerance = baseline.get('tolerance', DEFAULT_TOLERANCE)
+    rows = []
+    regressions = []
+    expected = baseline.get('results', {})
+    for name, current in sorted(report['results'].items()):
+        reference = expected.get(name)
+        if reference is None:
+            rows.append((name, None, current['median_ms'], None, 'new'))
+            continue
+        allowed = reference.get('tolerance', tolerance)
+        limit = max(reference['median_ms'] * (1.0 + allowed), reference['median_ms'] + MIN_SLACK_MS)
+        ratio = current['median_ms'] / reference['median_ms'] if reference['median_ms'] else None
+        status = 'REGRESSION' if current['median_ms'] > limit else 'ok'
+        rows.append((name, reference['median_ms'], current['median_ms'], ratio, status))
+        if status == 'REGRESSION':
+            regressions.append(name)
+    for group in sorted(report.get('skipped', {})):
+        recorded = [name for name in expected if name.startswith(group + '.')]
+        rows.append((f"{group}.* ({len(recorded)} in baseline)", None, None, None, 'SKIPPED'))
+    return rows, regressions
+
+
+def print_comparison(rows):
+    print(f"\n{'benchmark':<50} {'baseline':>10} {'current':>10} {'ratio':>7}  status")
+    for name, reference, current, ratio, status in rows:
+        reference_text = f"{reference:.2f}" if reference is not None else '-'
+        current_text = f"{current:.2f}" if current is not None else '-'
+        ratio_text = f"{ratio:.2f}x" if ratio is not None else '-'
+        print(f"{name:<50} {reference_text:>10} {current_text:>10} {ratio_text:>7}  {status}")
+
+
+def update_baseline(report, path):
+    """Merge this run's medians into the baseline file"""
+    baseline = {'tolerance': DEFAULT_TOLERANCE, 'results': {}}
+    if os.path.exists(path):
+        with open(path) as f:
+            baseline = json.load(f)
+    for name, current in report['results'].items():
+        entry = baseline['results'].setdefault(name, {})
+        entry['median_ms'] = current['median_ms']
+    baseline['updated'] = report['created']
+    baseline['platform'] = report['platform']
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='+', choices=sorted(GROUPS), help='Run only these groups')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark (default 5)')
+    parser.add_argument('--token-cost-ms', type=float, default=1.0,
+                        help='Stub model cost per generated token in ms (default 1.0)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--tolerance', type=float,
+                        help='Allowed slowdown over the baseline median (default: baseline file, else 0.3)')
+    parser.add_argument('--output', help='Write the JSON report here')
+    parser.add_argument('--update-baseline', action='store_true', help='Store this run as the baseline')
+    parser.add_argument('--strict', action='store_true',
+                        help='Fail when a group is skipped because its dependencies are missing')
+    options = parser.parse_args(argv)
+
+    report = run_benchmarks(options)
+
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if options.update_baseline:
+        update_baseline(report, options.baseline)
+        print(f"\nBaseline updated: {options.baseline}")
+        if report['skipped']:
+            print(f"Not recorded (skipped): {', '.join(sorted(report['skipped']))}")
+            return 1 if options.strict else 0
+        return 0
+
+    if not os.path.exists(options.baseline):
+        print(f"\nNo baseline at {options.baseline}; run with --update-baseline first")
+        return 0
+
+    with open(options.baseline) as f:
+        baseline = json.load(f)
+    rows, regressions = compare(report, baseline, options.tolerance)
+    print_comparison(rows)
+
+    skipped = report['skipped']
+    if skipped:
+        print(f"\n{len(skipped)} group(s) skipped, not compared:")
+        for group, reason in sorted(skipped.items()):
+            print(f"  {group}: {reason}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) over threshold: {', '.join(regressions)}")
+        return 1
+    if skipped and options.strict:
+        print("\n--strict: skipped groups count as failures")
+        return 1
+    print("\nAll benchmarks within threshold")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
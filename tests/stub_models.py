@@ -0,0 +1,165 @@
+"""
+Deterministic stand-ins for the BART pipeline, mBART and the translator
+
+They take the same calls the app makes and return the same shapes. Each
+one sleeps for a configurable cost per token, so benchmarks measure our
+own code plus a predictable model cost, with no downloads or network.
+"""
+
+from types import SimpleNamespace
+import time
+
+
+def _words(text):
+    return text.split()
+
+
+class StubTokenizer:
+    """Whitespace tokenizer with a growing vocabulary and mBART language codes"""
+
+    def __init__(self, lang_codes=None):
+        self.vocab = {'<pad>': 0, '</s>': 1}
+        self.inverse = {0: '<pad>', 1: '</s>'}
+        self.src_lang = 'en_XX'
+        self.lang_code_to_id = {}
+        for code in lang_codes or ():
+            self.lang_code_to_id[code] = self._id(f"[{code}]")
+
+    def _id(self, token):
+        index = self.vocab.get(token)
+        if index is None:
+            index = self.vocab[token] = len(self.vocab)
+            self.inverse[index] = token
+        return index
+
+    def encode_text(self, text, max_length=None):
+        ids = [self._id(word) for word in _words(text)]
+        return ids[:max_length] if max_length else ids
+
+    def __call__(self, texts, add_special_tokens=True, return_tensors=None, max_length=None, truncation=False, **kwargs):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        limit = max_length if truncation else None
+        input_ids = [self.encode_text(text, limit) for text in batch]
+        if single and return_tensors is None:
+            # Like transformers: one unbatched encoding for a single string
+            return {'input_ids': input_ids[0], 'attention_mask': [1] * len(input_ids[0])}
+        return {
+            'input_ids': input_ids,
+            'attention_mask': [[1] * len(ids) for ids in input_ids]
+        }
+
+    def pad(self, features, return_tensors=None):
+        """Collate single encodings into a batch (lists stand in for tensors)"""
+        return {
+            'input_ids': [feature['input_ids'] for feature in features],
+            'attention_mask': [feature['attention_mask'] for feature in features]
+        }
+
+    def decode(self, ids, skip_special_tokens=True):
+        tokens = [self.inverse.get(i, '') for i in ids]
+        if skip_special_tokens:
+            tokens = [t for t in tokens if not (t.startswith('[') and t.endswith(']')) and t not in ('<pad>', '</s>')]
+        return ' '.join(tokens)
+
+    def batch_decode(self, sequences, skip_special_tokens=True):
+        return [self.decode(ids, skip_special_tokens) for ids in sequences]
+
+
+class StubSeq2SeqModel:
+    """
+    generate() keeps the first tokens of each input
+
+    The cost is input_tokens * encode_cost plus output_tokens * token_cost
+    for the longest sequence in the batch, which is how padded batches
+    behave on the real model.
+    """
+
+    def __init__(self, token_cost_ms=1.0, encode_cost_ms=0.02):
+        self.token_cost = token_cost_ms / 1000.0
+        self.encode_cost = encode_cost_ms / 1000.0
+        self.calls = 0
+
+    def generate(self, input_ids, max_length=150, min_length=0, forced_bos_token_id=None, **kwargs):
+        self.calls += 1
+        outputs = [ids[:max_length] for ids in input_ids]
+        longest_in = max((len(ids) for ids in input_ids), default=0)
+        longest_out = max((len(ids) for ids in outputs), default=0)
+        time.sleep(longest_in * self.encode_cost + longest_out * self.token_cost)
+        if forced_bos_token_id is not None:
+            outputs = [[forced_bos_token_id] + ids for ids in outputs]
+        return outputs
+
+
+class StubSummarizationPipeline:
+    """Callable with the transformers summarization pipeline interface"""
+
+    def __init__(self, token_cost_ms=1.0, encode_cost_ms=0.02, max_input_tokens=1024):
+        self.tokenizer = StubTokenizer()
+        self.model = StubSeq2SeqModel(token_cost_ms, encode_cost_ms)
+        self.max_input_tokens = max_input_tokens
+
+    def __call__(self, texts, max_length=150, min_length=0, truncation=True, batch_size=1, **kwargs):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        encoded = self.tokenizer(batch, truncation=truncation, max_length=self.max_input_tokens)
+        generated = self.model.generate(encoded['input_ids'], max_length=max_length, min_length=min_length)
+        results = [{'summary_text': self.tokenizer.decode(ids)} for ids in generated]
+        return results[0] if single else results
+
+
+class StubTranslationClient:
+    """googletrans Translator stand-in: returns the text unchanged after a per-word delay"""
+
+    def __init__(self, word_cost_ms=0.01, request_ms=0.0):
+        self.word_cost = word_cost_ms / 1000.0
+        self.request_cost = request_ms / 1000.0
+        self.calls = 0
+
+    def translate(self, text, src='auto', dest='en'):
+        self.calls += 1
+        time.sleep(self.request_cost + len(_words(text)) * self.word_cost)
+        return SimpleNamespace(text=text, src=src, dest=dest)
+
+    def detect(self, text):
+        return SimpleNamespace(lang='en', confidence=1.0)
+
+
+def install_stubs(summarizer=None, multilingual_summarizer=None, token_cost_ms=1.0, translate_cost_ms=0.01):
+    """
+    Point TextSummarizer / MultilingualSummarizer instances at stub models
+
+    The loaders are replaced on the instances, so the model registry holds
+    the stubs under the usual keys and every code path above the model
+    stays as it is in production.
+
+    Returns:
+        dict with the installed 'pipeline', 'mbart' and 'translator' stubs
+    """
+    stubs = {}
+    if summarizer is not None:
+        pipeline = StubSummarizationPipeline(token_cost_ms)
+        summarizer.registry.unload(summarizer.model_key)
+        summarizer._load_pipeline = lambda: pipeline
+        stubs['pipeline'] = pipeline
+
+    if multilingual_summarizer is not None:
+        codes = multilingual_summarizer.MBART_LANG_CODES.values()
+        mbart = (StubSeq2SeqModel(token_cost_ms), StubTokenizer(codes))
+        multilingual_summarizer.registry.unload(multilingual_summarizer.mbart_key)
+        multilingual_summarizer._load_mbart = lambda: mbart
+        stubs['mbart'] = mbart
+
+        translator = multilingual_summarizer.translator
+        if hasattr(translator.backend, '_load_mbart'):
+            # Local mBART translation shares the stub model
+            translator.backend._load_mbart = lambda: mbart
+
+        # The real TextTranslator (pool, retries) runs on top of the stub client
+        client = StubTranslationClient(translate_cost_ms)
+        if hasattr(translator.backend, 'set_client_factory'):
+            translator.set_client_factory(lambda timeout: client)
+        # Every run pays for translation; a warm memory would hide the cost
+        translator.memory = None
+        stubs['translator'] = client
+    return stubs
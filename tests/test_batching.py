@@ -0,0 +1,95 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from batching import BatchScheduler
+
+class TestBatchScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def fake_generate(self, texts, max_length, min_length):
+        with self.lock:
+            self.calls.append((list(texts), max_length, min_length))
+        return [f"{text}:{max_length}" for text in texts]
+
+    def test_results_routed_to_callers(self):
+        """Each caller gets the summary of its own text"""
+        scheduler = BatchScheduler(self.fake_generate, max_wait_ms=50, max_batch_size=8)
+        texts = [f"text {i}" for i in range(6)]
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(lambda t: scheduler.summarize(t, 100, 30), texts))
+
+        self.assertEqual(results, [f"{t}:100" for t in texts])
+        self.assertLess(len(self.calls), len(texts))
+
+    def test_incompatible_lengths_not_mixed(self):
+        """Requests with different max/min lengths run in separate batches"""
+        scheduler = BatchScheduler(self.fake_generate, max_wait_ms=50)
+        futures = [
+            scheduler.submit("a", 100, 30),
+            scheduler.submit("b", 150, 50),
+            scheduler.submit("c", 100, 30)
+        ]
+        self.assertEqual([f.result() for f in futures], ["a:100", "b:150", "c:100"])
+        for texts, max_length, min_length in self.calls:
+            if "b" in texts:
+                self.assertEqual((texts, max_length), (["b"], 150))
+
+    def test_options_split_batches_and_reach_generate(self):
+        """Only requests with equal options (e.g. target language) share a batch"""
+        def generate(texts, max_length, min_length, target_lang):
+            with self.lock:
+                self.calls.append((list(texts), target_lang))
+            return [f"{text}:{target_lang}" for text in texts]
+
+        scheduler = BatchScheduler(generate, max_wait_ms=50, name='mbart')
+        futures = [
+            scheduler.submit("a", 100, 30, target_lang='fr'),
+            scheduler.submit("b", 100, 30, target_lang='de'),
+            scheduler.submit("c", 100, 30, target_lang='fr')
+        ]
+        self.assertEqual([f.result() for f in futures], ["a:fr", "b:de", "c:fr"])
+        self.assertEqual(sorted(self.calls), [(["a", "c"], 'fr'), (["b"], 'de')])
+
+    def test_errors_reach_every_caller(self):
+        """A failing batch raises in each waiting caller"""
+        def failing(texts, max_length, min_length):
+            raise RuntimeError("model crashed")
+
+        scheduler = BatchScheduler(failing, max_wait_ms=10)
+        with self.assertRaises(RuntimeError):
+            scheduler.summarize("text", 100, 30)
+
+    def test_short_result_fails_the_unanswered_callers(self):
+        """A batch that returns too few summaries fails every caller instead of hanging"""
+        def short(texts, max_length, min_length):
+            return texts[:1]
+
+        scheduler = BatchScheduler(short, max_wait_ms=50, result_timeout=5)
+        futures = [scheduler.submit(text, 100, 30) for text in ("a", "b")]
+        for future in futures:
+            with self.assertRaises(Exception):
+                future.result(timeout=5)
+
+    def test_worker_survives_planning_errors(self):
+        """An error outside generate fails the drained requests and the worker keeps serving"""
+        scheduler = BatchScheduler(self.fake_generate, max_wait_ms=10, result_timeout=5)
+        plan = scheduler._plan
+        def broken_once(pending):
+            scheduler._plan = plan
+            raise RuntimeError("planning bug")
+        scheduler._plan = broken_once
+
+        with self.assertRaises(RuntimeError):
+            scheduler.summarize("a", 100, 30)
+        self.assertEqual(scheduler.summarize("b", 100, 30), "b:100")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+import benchmark
+from benchmark import compare
+from stub_models import StubSummarizationPipeline, StubTokenizer, StubSeq2SeqModel
+
+class TestBaselineComparison(unittest.TestCase):
+
+    def report(self, **medians):
+        return {'results': {name: {'median_ms': value} for name, value in medians.items()}}
+
+    def test_within_tolerance_passes(self):
+        rows, regressions = compare(self.report(a=120.0), {'results': {'a': {'median_ms': 100.0}}}, 0.3)
+        self.assertEqual(regressions, [])
+        self.assertEqual(rows[0][4], 'ok')
+
+    def test_over_tolerance_fails(self):
+        _, regressions = compare(self.report(a=140.0), {'results': {'a': {'median_ms': 100.0}}}, 0.3)
+        self.assertEqual(regressions, ['a'])
+
+    def test_entry_tolerance_and_absolute_slack(self):
+        """Per-entry tolerance wins, and tiny benchmarks get a little absolute slack"""
+        baseline = {'results': {'a': {'median_ms': 100.0, 'tolerance': 0.5}, 'b': {'median_ms': 1.0}}}
+        _, regressions = compare(self.report(a=140.0, b=2.5), baseline, 0.1)
+        self.assertEqual(regressions, [])
+
+    def test_new_benchmarks_are_reported_not_failed(self):
+        rows, regressions = compare(self.report(new=10.0), {'results': {}})
+        self.assertEqual(regressions, [])
+        self.assertEqual(rows[0][4], 'new')
+
+    def test_skipped_groups_are_listed(self):
+        report = dict(self.report(a=10.0), skipped={'flask': 'ImportError: No module named flask'})
+        baseline = {'results': {'a': {'median_ms': 10.0}, 'flask.x': {'median_ms': 5.0}}}
+        rows, regressions = compare(report, baseline)
+        self.assertEqual(regressions, [])
+        self.assertEqual(rows[-1], ('flask.* (1 in baseline)', None, None, None, 'SKIPPED'))
+
+    def test_strict_fails_on_skipped_groups(self):
+        def missing(options):
+            raise ImportError("No module named 'flask'")
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump({'results': {}}, f)
+        self.addCleanup(os.remove, f.name)
+        argv = ['--only', 'flask', '--repeat', '1', '--baseline', f.name]
+        with mock.patch.dict(benchmark.GROUPS, {'flask': missing}), redirect_stdout(StringIO()) as out:
+            self.assertEqual(benchmark.main(argv), 0)
+            self.assertEqual(benchmark.main(argv + ['--strict']), 1)
+        self.assertIn('SKIPPED', out.getvalue())
+
+class TestStubModels(unittest.TestCase):
+
+    def test_pipeline_is_deterministic(self):
+        pipeline = StubSummarizationPipeline(token_cost_ms=0)
+        texts = ['one two three four five', 'six seven']
+        first = pipeline(texts, max_length=3, min_length=1, batch_size=2)
+        second = pipeline(texts, max_length=3, min_length=1, batch_size=2)
+        self.assertEqual(first, second)
+        self.assertEqual(first[0]['summary_text'], 'one two three')
+
+    def test_mbart_interface(self):
+        tokenizer = StubTokenizer(['fr_XX'])
+        model = StubSeq2SeqModel(token_cost_ms=0)
+        encoded = tokenizer('bonjour le monde', return_tensors='pt', max_length=1024, truncation=True)
+        generated = model.generate(**encoded, forced_bos_token_id=tokenizer.lang_code_to_id['fr_XX'], max_length=2)
+        self.assertEqual(tokenizer.batch_decode(generated, skip_special_tokens=True), ['bonjour le'])
+
+if __name__ == '__main__':
+    unittest.main()
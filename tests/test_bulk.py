@@ -0,0 +1,118 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import unittest
+from bulk import BulkSummarizer, parse_json_items, parse_ndjson_items
+from summary_service import SummaryService
+from document import as_document
+
+class FakeDetector:
+
+    def detect_language(self, text):
+        return 'fr' if text.startswith('fr:') else 'en'
+
+    def get_language_name(self, code):
+        return code
+
+class FakeSummarizer:
+
+    extractive_scorer = 'frequency'
+
+    def __init__(self):
+        self.batches = []
+
+    def summarize_batch(self, texts, max_length, min_length, batch_size):
+        texts = [as_document(text).text for text in texts]
+        self.batches.append(texts)
+        if any('boom' in text for text in texts):
+            raise Exception('generate failed')
+        return [text.upper() for text in texts]
+
+class FakeMultilingual:
+
+    def summarize_multilingual(self, text, target_lang, method, max_length, min_length):
+        return {
+            'summary': as_document(text).text[3:],
+            'original_length': 2,
+            'summary_length': 1,
+            'source_language': 'fr',
+            'source_language_name': 'fr',
+            'target_language': target_lang,
+            'target_language_name': target_lang
+        }
+
+class TestBulkParsing(unittest.TestCase):
+
+    def test_json_options_are_item_defaults(self):
+        """Top-level options apply unless an item overrides them"""
+        items = parse_json_items({
+            'items': ['plain', {'id': 'b', 'text': 'x', 'max_length': 60}],
+            'options': {'max_length': 90, 'method': 'extractive'}
+        })
+        self.assertEqual(items[0]['text'], 'plain')
+        self.assertEqual(items[0]['max_length'], 90)
+        self.assertEqual(items[1]['max_length'], 60)
+        self.assertEqual(items[1]['method'], 'extractive')
+        self.assertEqual(items[1]['id'], 'b')
+
+    def test_json_rejects_non_list(self):
+        with self.assertRaises(ValueError):
+            parse_json_items({'text': 'not a batch'})
+
+    def test_ndjson_bad_line_becomes_item_error(self):
+        """A malformed line is reported in place without losing the others"""
+        items = parse_ndjson_items([b'{"text": "a"}', b'', b'not json', '{"text": "b"}'])
+        self.assertEqual(len(items), 3)
+        self.assertEqual(items[0]['text'], 'a')
+        self.assertIn('error', items[1])
+        self.assertEqual(items[2]['text'], 'b')
+
+class TestBulkSummarizer(unittest.TestCase):
+
+    def setUp(self):
+        self.summarizer = FakeSummarizer()
+        service = SummaryService(self.summarizer, FakeMultilingual(), FakeDetector())
+        self.bulk = BulkSummarizer(service, batch_size=2)
+
+    def run_items(self, payload):
+        return {result['index']: result for result in self.bulk.run(parse_json_items(payload))}
+
+    def test_every_item_gets_a_result(self):
+        results = self.run_items(['one two', 'three', 'fr:bonjour', {'text': ''}])
+        self.assertEqual(results[0]['summary'], 'ONE TWO')
+        self.assertEqual(results[1]['summary'], 'THREE')
+        self.assertEqual(results[2]['summary'], 'bonjour')
+        self.assertEqual(results[3]['error'], 'No text provided')
+
+    def test_transformer_items_are_batched_by_length_settings(self):
+        """Items with the same lengths share batches; different lengths never mix"""
+        self.run_items(['a', 'bb', 'ccc', {'text': 'dddd', 'max_length': 60}])
+        self.assertEqual(sorted(len(batch) for batch in self.summarizer.batches), [1, 1, 2])
+        self.assertIn(['dddd'], self.summarizer.batches)
+
+    def test_failed_batch_does_not_fail_others(self):
+        """A failing batch is retried item by item, so only the bad item errors"""
+        results = self.run_items(['boom', 'fine', {'text': 'also fine', 'max_length': 60}])
+        self.assertEqual(results[0]['error'], 'generate failed')
+        self.assertEqual(results[1]['summary'], 'FINE')
+        self.assertEqual(results[2]['summary'], 'ALSO FINE')
+        self.assertIn(['fine'], self.summarizer.batches)
+
+    def test_invalid_lengths_fail_only_their_item(self):
+        results = self.run_items([
+            {'id': 'list', 'text': 'a', 'max_length': [1]},
+            {'text': 'b', 'max_length': 'long'},
+            {'text': 'c', 'max_length': 10 ** 6},
+            {'text': 'd', 'max_length': 40, 'min_length': 80},
+            {'text': 'e', 'max_length': '60', 'min_length': 20.0}
+        ])
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[0], {'index': 0, 'id': 'list', 'error': 'max_length must be an integer'})
+        self.assertIn('max_length', results[1]['error'])
+        self.assertIn('between', results[2]['error'])
+        self.assertIn('min_length', results[3]['error'])
+        self.assertEqual(results[4]['summary'], 'E')
+
+if __name__ == '__main__':
+    unittest.main()
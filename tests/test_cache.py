@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from cache import DiskCache, SummaryCache, make_cache_key
+from summary_service import OUTPUT_SETTINGS, output_model_id
+
+class TestSummaryCache(unittest.TestCase):
+
+    def test_key_normalizes_whitespace(self):
+        """Whitespace-only differences share a key, parameters do not"""
+        base = make_cache_key("Some  text\nhere", 'extractive', 150, 50, 'auto', 'translate', 'bart')
+        self.assertEqual(base, make_cache_key("Some text here", 'extractive', 150, 50, 'auto', 'translate', 'bart'))
+        self.assertNotEqual(base, make_cache_key("Some text here", 'extractive', 100, 50, 'auto', 'translate', 'bart'))
+
+    def test_hit_and_miss_counters(self):
+        """Lookups are counted"""
+        cache = SummaryCache()
+        self.assertIsNone(cache.get('k'))
+        cache.set('k', {'summary': 'x'})
+        self.assertEqual(cache.get('k'), {'summary': 'x'})
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_byte_budget_evicts_oldest(self):
+        """Memory tier evicts least recently used entries past its budget"""
+        cache = SummaryCache(max_bytes=60)
+        cache.set('a', {'summary': 'a' * 20})
+        cache.set('b', {'summary': 'b' * 20})
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('b'))
+        self.assertEqual(cache.get_stats()['memory']['evictions'], 1)
+
+    def test_ttl_expiry(self):
+        """Entries expire after their timeout"""
+        cache = SummaryCache()
+        cache.set('k', {'summary': 'x'}, timeout=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('k'))
+
+    def test_disk_tier_survives_restart(self):
+        """A new cache instance reads entries written by an earlier one"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'summaries.sqlite3')
+            SummaryCache(cache_type='disk', disk_path=path).set('k', {'summary': 'x'})
+            restarted = SummaryCache(cache_type='disk', disk_path=path)
+            self.assertEqual(restarted.get('k'), {'summary': 'x'})
+            self.assertEqual(restarted.get_stats()['disk']['hits'], 1)
+
+    def test_disk_eviction_sums_the_table_only_when_needed(self):
+        """Writes under budget skip the SUM; going over evicts the oldest rows in bulk"""
+        with tempfile.TemporaryDirectory() as tmp:
+            disk = DiskCache(os.path.join(tmp, 'summaries.sqlite3'), max_bytes=100)
+            statements = []
+            disk._connect().set_trace_callback(statements.append)
+
+            for i in range(4):
+                disk.set(f"k{i}", '"' + 'x' * 18 + '"', 60)
+            self.assertEqual(sum('SUM(size)' in sql for sql in statements), 1)
+
+            for i in range(4, 8):
+                disk.set(f"k{i}", '"' + 'x' * 18 + '"', 60)
+            self.assertLessEqual(disk.get_stats()['bytes'], 100)
+            self.assertIsNone(disk.get('k0'))
+            self.assertIsNotNone(disk.get('k7'))
+            self.assertEqual(disk.get_stats()['evictions'], 3)
+            disk._connect().close()
+
+    def test_disabled_cache_never_stores(self):
+        """Disabled cache always misses"""
+        cache = SummaryCache(enabled=False)
+        cache.set('k', {'summary': 'x'})
+        self.assertIsNone(cache.get('k'))
+
+    def test_counters_under_concurrent_lookups(self):
+        """Hits and misses from many threads are all counted"""
+        cache = SummaryCache()
+        cache.set('k', {'summary': 'x'})
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: cache.get('k' if i % 2 else 'missing'), range(2000)))
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1000, 1000))
+
+    def test_model_id_covers_output_settings(self):
+        """Changing any setting that shapes a summary changes the cache key"""
+        settings = {name: 'default' for name in OUTPUT_SETTINGS}
+        base = output_model_id(settings)
+        for name in ('EXTRACTIVE_SCORER', 'LONG_TEXT_MODE', 'MAP_REDUCE_CHUNK_TOKENS', 'NATIVE_BEAMS', 'TRANSLATION_BACKEND',
+                     'LANGUAGE_SEGMENTS', 'TRANSLATION_CHUNK_TOKENS'):
+            self.assertNotEqual(output_model_id(dict(settings, **{name: 'other'})), base, name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import unittest
+from chunking import TextChunker, estimate_tokens, refine_spans, sentence_spans
+from multilingual_summarizer import MultilingualSummarizer
+
+MIXED = (
+    '第一句话。第二句话！第三句？ English sentence. Dr. Smith said "yes." '
+    'नमस्ते दुनिया। दूसरा वाक्य। هل أنت بخير؟ نعم۔\n\nHeading\n\nBody text here.'
+)
+
+def count_words(texts):
+    return [len(text.split()) for text in texts]
+
+class TestSentenceSpans(unittest.TestCase):
+
+    def test_terminators_of_every_script(self):
+        sentences = [MIXED[start:end] for start, end in sentence_spans(MIXED)]
+        self.assertEqual(sentences, [
+            '第一句话。', '第二句话！', '第三句？', 'English sentence.', 'Dr.', 'Smith said "yes."',
+            'नमस्ते दुनिया।', 'दूसरा वाक्य।', 'هل أنت بخير؟', 'نعم۔', 'Heading', 'Body text here.'
+        ])
+
+    def test_refine_punkt_spans(self):
+        text = 'Dr. Smith arrived. 他来了。她也来了。'
+        # As punkt would split it: abbreviation kept, CJK stops ignored
+        punkt = [(0, 18), (19, len(text))]
+        self.assertEqual(
+            [text[start:end] for start, end in refine_spans(text, punkt)],
+            ['Dr. Smith arrived.', '他来了。', '她也来了。']
+        )
+        self.assertIs(refine_spans('No script stops.', punkt), punkt)
+
+    def test_token_estimate_counts_cjk_characters(self):
+        chinese, english = estimate_tokens(['今天天气很好。' * 10, 'The weather is nice today.'])
+        self.assertGreater(chinese, 60)
+        self.assertEqual(english, 7)
+
+class TestTextChunker(unittest.TestCase):
+
+    def test_chunks_fit_the_budget_and_cover_the_text(self):
+        text = ' '.join(f"Sentence number {i} has six words." for i in range(50))
+        chunker = TextChunker(max_tokens=20, count_tokens=count_words)
+        spans = chunker.chunk_spans(text)
+        self.assertEqual(len(spans), 17)
+        self.assertTrue(all(tokens <= 20 for _, _, tokens in spans))
+        self.assertEqual(' '.join(chunker.chunk(text)), text)
+
+    def test_cjk_text_is_chunked_without_inserting_spaces(self):
+        text = '今天我们讨论了项目的进展和下一步的计划。' * 200
+        chunker = TextChunker(max_tokens=512)
+        chunks = chunker.chunk(text)
+        self.assertGreater(len(chunks), 5)
+        self.assertEqual(''.join(chunks), text)
+        self.assertTrue(all(tokens <= 512 for _, _, tokens in chunker.chunk_spans(text)))
+
+    def test_long_sentence_is_split_at_clause_breaks(self):
+        text = '，'.join(['这是一个很长的句子的一部分'] * 300) + '。'
+        chunker = TextChunker(max_tokens=400)
+        chunks = chunker.chunk(text)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(chunk.endswith(('，', '。')) for chunk in chunks))
+        self.assertEqual(''.join(chunks), text)
+
+    def test_overlap_repeats_trailing_sentences(self):
+        text = ' '.join(f"S{i} a b c." for i in range(12))
+        chunks = TextChunker(max_tokens=16, count_tokens=count_words, overlap_tokens=4).chunk(text)
+        self.assertEqual(chunks[0], 'S0 a b c. S1 a b c. S2 a b c. S3 a b c.')
+        self.assertTrue(chunks[1].startswith('S3 a b c.'))
+        self.assertTrue(chunks[-1].endswith('S11 a b c.'))
+
+    def test_translation_path_uses_the_chunker(self):
+        multilingual = MultilingualSummarizer(summarizer=object(), translation_chunk_tokens=300)
+        text = 'हम आज परियोजना की प्रगति पर चर्चा करते हैं। ' * 300
+        self.assertGreater(len(multilingual._chunk_text(text)), 1)
+        self.assertTrue(all(tokens <= 300 for _, _, tokens in multilingual.chunker.chunk_spans(text)))
+
+if __name__ == '__main__':
+    unittest.main()
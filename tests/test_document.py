@@ -0,0 +1,94 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import unittest
+from document import Document, as_document, normalize_text
+from document_store import StoredDocument
+from multilingual_summarizer import MultilingualSummarizer
+from summary_service import SummaryService
+
+TEXT = 'First  sentence here.\r\n\r\n\r\nSecond\tone follows! Third is a question? '
+
+class CountingDetector:
+
+    def __init__(self, language='en'):
+        self.language = language
+        self.calls = 0
+
+    def detect_language(self, text):
+        self.calls += 1
+        return self.language
+
+    def get_language_name(self, code):
+        return code
+
+class EchoSummarizer:
+    """English summarizer that records what it was given"""
+
+    def __init__(self):
+        self.inputs = []
+
+    def summarize(self, text, method='transformer', max_length=150, min_length=50):
+        self.inputs.append(text)
+        return ' '.join(as_document(text).text.split()[:25])
+
+class PrefixTranslator:
+
+    def translate(self, text, target_lang, source_lang='auto'):
+        return f"{target_lang}: {text}"
+
+class TestDocument(unittest.TestCase):
+
+    def test_normalized_text_keeps_paragraphs(self):
+        self.assertEqual(normalize_text(TEXT), 'First sentence here.\n\nSecond one follows! Third is a question?')
+        self.assertEqual(normalize_text('Café'), 'Café')
+
+    def test_analysis_is_memoized(self):
+        detector = CountingDetector()
+        document = Document(TEXT, language_detector=detector)
+        self.assertEqual(document.word_count, 10)
+        self.assertEqual(document.language, 'en')
+        self.assertEqual(document.language, 'en')
+        self.assertEqual(detector.calls, 1)
+        self.assertEqual(len(document.sentences), 3)
+        self.assertEqual(document.sentences[1], 'Second one follows!')
+        self.assertEqual(
+            [document.text[start:end] for start, end in document.sentence_spans], document.sentences
+        )
+
+        counted = []
+        def count_tokens(texts):
+            counted.append(len(texts))
+            return [len(text.split()) for text in texts]
+        self.assertEqual(document.sentence_token_counts(count_tokens), [3, 3, 4])
+        self.assertEqual(document.token_count(count_tokens), 10)
+        self.assertEqual(counted, [3])
+
+    def test_from_stored_reuses_metadata(self):
+        stored = StoredDocument('id', 'Bonjour tout le monde.', {'word_count': 4, 'language': 'fr'})
+        document = Document.from_stored(stored, CountingDetector())
+        self.assertEqual(document.language, 'fr')
+        self.assertEqual(document.language_detector.calls, 0)
+        self.assertIs(as_document(document), document)
+
+    def test_language_is_detected_once_per_request(self):
+        """The service and the multilingual summarizer share one detection"""
+        detector = CountingDetector('fr')
+        english = EchoSummarizer()
+        multilingual = MultilingualSummarizer(summarizer=english)
+        multilingual.translator = PrefixTranslator()
+        service = SummaryService(english, multilingual, detector)
+
+        text = ' '.join(f"Phrase numero {i} du texte." for i in range(20))
+        result = service.summarize(text, target_lang='fr')
+        self.assertEqual(detector.calls, 1)
+        self.assertEqual(result['detected_language'], 'fr')
+        self.assertEqual(result['original_length'], 100)
+        self.assertTrue(result['summary'].startswith('fr: en: Phrase numero 0'))
+        # The translated text reaches the English summarizer already analysed
+        self.assertIsInstance(english.inputs[0], Document)
+        self.assertEqual(english.inputs[0].known_language, 'en')
+
+if __name__ == '__main__':
+    unittest.main()
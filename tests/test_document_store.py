@@ -0,0 +1,143 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import shutil
+import tempfile
+import time
+import unittest
+from io import BytesIO
+from unittest import mock
+from document_store import DocumentStore, DocumentNotFound, sentence_spans
+
+class FakeDetector:
+
+    def __init__(self):
+        self.calls = 0
+
+    def detect_language(self, text):
+        self.calls += 1
+        return 'en'
+
+    def get_language_name(self, code):
+        return 'English'
+
+class TestDocumentStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'documents.sqlite3')
+        self.detector = FakeDetector()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_store(self, **options):
+        return DocumentStore(self.path, language_detector=self.detector, **options)
+
+    def test_metadata_is_computed_once(self):
+        store = self.make_store()
+        document = store.add('First sentence here. Second one!', filename='a.txt')
+        self.assertEqual(document.word_count, 5)
+        self.assertEqual(document.language, 'en')
+        self.assertEqual(document.sentences(), ['First sentence here.', 'Second one!'])
+
+        again = store.add('First sentence here. Second one!')
+        self.assertEqual(again.id, document.id)
+        self.assertEqual(self.detector.calls, 1)
+
+    def test_documents_are_shared_between_store_instances(self):
+        """Another worker process opens the same database"""
+        document = self.make_store().add('Shared text.')
+        other = self.make_store()
+        self.assertEqual(other.get(document.id).text, 'Shared text.')
+        self.assertEqual(other.get(document.id).metadata['language_name'], 'English')
+
+    def test_idle_documents_expire(self):
+        store = self.make_store(ttl=0.05)
+        document = store.add('Short lived.')
+        time.sleep(0.1)
+        self.assertIsNone(store.get(document.id))
+        with self.assertRaises(DocumentNotFound):
+            store.require(document.id)
+
+    def test_size_and_count_limits_evict_least_recently_used(self):
+        store = self.make_store(max_bytes=50, max_documents=2)
+        first = store.add('a' * 20)
+        second = store.add('b' * 20)
+        store.get(first.id)
+        third = store.add('c' * 20)
+        self.assertIsNotNone(store.get(first.id))
+        self.assertIsNone(store.get(second.id))
+        self.assertIsNotNone(store.get(third.id))
+        self.assertEqual(store.get_stats()['documents'], 2)
+
+    def test_eviction_only_counts_the_store_when_needed(self):
+        store = self.make_store(max_bytes=1000, max_documents=3)
+        statements = []
+        store._connect().set_trace_callback(statements.append)
+        documents = [store.add(f"Document number {i}.") for i in range(5)]
+        # One full count on the first add, then one per add that reaches the limit
+        self.assertEqual(sum('SUM(size)' in sql for sql in statements), 3)
+        self.assertEqual(store.get_stats()['documents'], 3)
+        self.assertIsNone(store.get(documents[0].id))
+        self.assertIsNotNone(store.get(documents[4].id))
+
+    def test_delete(self):
+        store = self.make_store()
+        document = store.add('Gone soon.')
+        self.assertTrue(store.delete(document.id))
+        self.assertIsNone(store.get(document.id))
+        self.assertFalse(store.delete(document.id))
+
+    def test_sentence_spans(self):
+        text = 'One. Two?  Three\nwithout end'
+        self.assertEqual([text[a:b] for a, b in sentence_spans(text)], ['One.', 'Two?', 'Three\nwithout end'])
+
+class FakeSummaryService:
+
+    def summarize(self, document, **options):
+        return {'summary': 'Short summary.', 'detected_language': 'en'}
+
+class TestDocumentEndpoints(unittest.TestCase):
+    """Uploads return the text only when asked; it is fetched by document_id otherwise"""
+
+    TEXT = 'The committee met on Tuesday. It approved the budget for next year.'
+
+    def setUp(self):
+        import app as app_module
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        store = DocumentStore(os.path.join(self.directory, 'documents.sqlite3'), language_detector=FakeDetector())
+        for name, value in (('document_store', store), ('summary_service', FakeSummaryService())):
+            patch = mock.patch.object(app_module, name, value)
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.client = app_module.app.test_client()
+
+    def post(self, endpoint, **form):
+        form['file'] = (BytesIO(self.TEXT.encode('utf-8')), 'notes.txt')
+        response = self.client.post(endpoint, data=form, content_type='multipart/form-data')
+        self.assertEqual(response.status_code, 200, response.json)
+        return response.json
+
+    def test_upload_returns_the_id_without_the_text(self):
+        data = self.post('/api/upload')
+        self.assertNotIn('text', data)
+        self.assertEqual(data['word_count'], 12)
+
+        document = self.client.get(f"/api/documents/{data['document_id']}?include_text=true").json
+        self.assertEqual(document['text'], self.TEXT)
+        self.assertNotIn('text', self.client.get(f"/api/documents/{data['document_id']}").json)
+
+    def test_upload_text_on_request(self):
+        self.assertEqual(self.post('/api/upload', include_text='true')['text'], self.TEXT)
+
+    def test_summarize_file_text_on_request(self):
+        data = self.post('/api/summarize-file')
+        self.assertEqual(data['summary'], 'Short summary.')
+        self.assertNotIn('original_text', data)
+        self.assertEqual(self.post('/api/summarize-file', include_text='true')['original_text'], self.TEXT)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import unittest
+from extractive import ExtractiveScorer
+
+class TestExtractiveScorer(unittest.TestCase):
+
+    def setUp(self):
+        self.scorer = ExtractiveScorer({'the', 'a', 'and', 'is'})
+        self.sentences = [
+            "The climate is changing quickly.",
+            "Climate change affects the climate of every region.",
+            "Bananas are yellow.",
+            "Scientists study climate change and its effects.",
+            "A cat sleeps."
+        ]
+
+    def test_frequency_matches_reference(self):
+        """Vectorized frequency scores match the per-sentence loop"""
+        scores = self.scorer.score(self.sentences, 'frequency')
+        self.assertAlmostEqual(scores[0], (4 + 1 + 1) / 6)
+        self.assertAlmostEqual(scores[2], (1 + 1 + 1) / 4)
+
+    def test_selection_keeps_document_order(self):
+        """Selected sentences come back in original order"""
+        for name in ExtractiveScorer.SCORERS:
+            indices = self.scorer.select(self.sentences, 2, name)
+            self.assertEqual(indices, sorted(indices))
+            self.assertEqual(len(indices), 2)
+
+    def test_short_input_returns_everything(self):
+        """Fewer sentences than requested keeps them all"""
+        self.assertEqual(self.scorer.select(self.sentences[:2], 3), [0, 1])
+
+    def test_invalid_scorer(self):
+        """Unknown scorer raises error"""
+        with self.assertRaises(ValueError):
+            self.scorer.score(self.sentences, 'invalid_scorer')
+
+if __name__ == '__main__':
+    unittest.main()
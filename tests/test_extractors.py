@@ -0,0 +1,178 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import subprocess
+import unittest
+import zipfile
+from io import BytesIO
+from reportlab.pdfgen import canvas
+from extractors import (
+    EPUB_MIME, HTML_MIME, PDF_MIME, TEXT_MIME, Extractor, ExtractorRegistry, detect_encoding,
+    get_registry, sniff_mime
+)
+from file_handler import FileHandler
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+
+HTML = b'''<!DOCTYPE html><html><head><meta charset="iso-8859-1"><title>Caf\xe9</title>
+<style>p { color: red }</style><script>var hidden = 1;</script></head>
+<body><h1>Main   heading</h1><p>First
+line with <b>bold</b> &amp; a <a href="#">link</a>.<br>After break.</p>
+<table><tr><th>Name</th><th>Value</th></tr><tr><td><p>a</p><p>b</p></td><td>2</td></tr></table>
+<ul><li>One</li><li>Two</li></ul></body></html>'''
+
+MARKDOWN = '''---
+title: ignored
+---
+# Title #
+
+Some *emphasis*, **strong**, a [link](http://example.com) and `code`
+in snake_case_name.
+
+- first item
+- [x] done item
+
+```python
+print("skipped")
+```
+
+| A | B |
+|---|---|
+| 1 | 2 |
+
+> Quoted text
+'''
+
+def make_epub():
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('mimetype', 'application/epub+zip')
+        archive.writestr(
+            'META-INF/container.xml',
+            '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+            '<rootfiles><rootfile full-path="OEBPS/content.opf"/></rootfiles></container>'
+        )
+        archive.writestr(
+            'OEBPS/content.opf',
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0"><manifest>'
+            '<item id="two" href="text/two.xhtml" media-type="application/xhtml+xml"/>'
+            '<item id="one" href="text/one.xhtml" media-type="application/xhtml+xml"/>'
+            '<item id="css" href="style.css" media-type="text/css"/>'
+            '</manifest><spine><itemref idref="one"/><itemref idref="two"/></spine></package>'
+        )
+        archive.writestr('OEBPS/text/one.xhtml', '<html><body><h1>Chapter One</h1><p>It begins.</p></body></html>')
+        archive.writestr('OEBPS/text/two.xhtml', '<html><body><p>It ends.</p></body></html>')
+    return buffer.getvalue()
+
+def make_docx_with_tab_stops():
+    from docx import Document
+    from docx.shared import Inches
+    document = Document()
+    document.add_paragraph('Title')
+    paragraph = document.add_paragraph('Hello world')
+    paragraph.paragraph_format.tab_stops.add_tab_stop(Inches(1))
+    paragraph.paragraph_format.tab_stops.add_tab_stop(Inches(2))
+    line = document.add_paragraph('Name')
+    line.add_run().add_tab()
+    line.add_run('Value')
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def make_pdf(text):
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer)
+    pdf.drawString(72, 720, text)
+    pdf.save()
+    return buffer.getvalue()
+
+class TestFormats(unittest.TestCase):
+
+    def extract(self, data, filename):
+        return FileHandler.extract_text(BytesIO(data), filename)
+
+    def test_html(self):
+        self.assertEqual(self.extract(HTML, 'page.html').split('\n'), [
+            'Café',
+            'Main heading',
+            'First line with bold & a link.',
+            'After break.',
+            'Name\tValue',
+            'a b\t2',
+            'One',
+            'Two'
+        ])
+
+    def test_markdown(self):
+        self.assertEqual(self.extract(MARKDOWN.encode('utf-8'), 'notes.md').split('\n'), [
+            'Title',
+            'Some emphasis, strong, a link and code in snake_case_name.',
+            'first item',
+            'done item',
+            'A\tB',
+            '1\t2',
+            'Quoted text'
+        ])
+
+    def test_epub_follows_spine_order(self):
+        self.assertEqual(self.extract(make_epub(), 'book.epub'), 'Chapter One\nIt begins.\nIt ends.')
+
+    def test_docx_tab_stops_are_not_text(self):
+        """w:tab in paragraph properties defines a stop; only run tabs are characters"""
+        text = self.extract(make_docx_with_tab_stops(), 'doc.docx')
+        self.assertEqual(text.split('\n')[-3:], ['Title', 'Hello world', 'Name\tValue'])
+
+    def test_text_encodings(self):
+        self.assertEqual(self.extract('Grüße\nzweite'.encode('utf-16'), 'a.txt'), 'Grüße\nzweite')
+        self.assertEqual(self.extract('Café déjà vu, naïve façade'.encode('cp1252'), 'a.txt'), 'Café déjà vu, naïve façade')
+        self.assertEqual(detect_encoding('é'.encode('utf-8')[:1]), 'utf-8')
+
+    def test_text_is_decoded_across_chunks(self):
+        text = ('ünïcödé line\n' * 20000).strip()
+        extractor = get_registry().for_mime(TEXT_MIME)
+        blocks = list(extractor.iter_blocks(BytesIO(text.encode('utf-8'))))
+        self.assertGreater(len(blocks), 1)
+        self.assertEqual('\n'.join(blocks), text)
+
+class TestRegistry(unittest.TestCase):
+
+    def test_sniffing(self):
+        self.assertEqual(sniff_mime(BytesIO(make_pdf('x'))), PDF_MIME)
+        self.assertEqual(sniff_mime(BytesIO(make_epub())), EPUB_MIME)
+        self.assertEqual(sniff_mime(BytesIO(HTML)), HTML_MIME)
+        self.assertEqual(sniff_mime(BytesIO(b'plain words')), TEXT_MIME)
+        self.assertIsNone(sniff_mime(BytesIO(b'\x00\x01\x02binary')))
+
+    def test_content_signature_beats_extension(self):
+        self.assertIn('Hidden PDF', FileHandler.extract_text(BytesIO(make_pdf('Hidden PDF')), 'report.txt'))
+        self.assertEqual(FileHandler.extract_text(BytesIO(HTML), 'page').split('\n')[0], 'Café')
+
+    def test_unsupported_file(self):
+        with self.assertRaises(Exception):
+            FileHandler.extract_text(BytesIO(b'\x00\x01binary'), 'archive.bin')
+
+    def test_custom_extractor(self):
+        class UpperExtractor(Extractor):
+            name = 'Upper'
+            extensions = ('up',)
+
+            def iter_blocks(self, file, **options):
+                yield file.read().decode('ascii').upper()
+
+        registry = ExtractorRegistry()
+        registry.register(UpperExtractor())
+        file = BytesIO(b'shout')
+        self.assertEqual(registry.resolve(file, 'a.up').extract(file), 'SHOUT')
+        self.assertEqual(registry.extensions, ['up'])
+
+    def test_format_libraries_are_imported_lazily(self):
+        script = (
+            "import sys; import file_handler; "
+            "print(','.join(m for m in ('PyPDF2', 'reportlab', 'docx') if m in sys.modules))"
+        )
+        output = subprocess.check_output([sys.executable, '-c', script], cwd=BACKEND, text=True)
+        self.assertEqual(output.strip(), '')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import tracemalloc
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from unittest import mock
+from docx import Document
+from reportlab.pdfgen import canvas
+from file_handler import FileHandler
+import extractors
+
+def make_pdf(pages):
+    """One line per page: 'Page N marker'"""
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for number in range(1, pages + 1):
+        pdf.drawString(72, 720, f"Page {number} marker")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+def make_docx(paragraphs=0):
+    """Header, body paragraphs, a table with a nested table, and a footer"""
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = 'Quarterly report'
+    document.sections[0].footer.paragraphs[0].text = 'Confidential'
+    document.add_paragraph('Introduction.')
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = 'Region'
+    table.cell(0, 1).text = 'Revenue'
+    table.cell(1, 0).text = 'North'
+    nested = table.cell(1, 1).add_table(rows=1, cols=2)
+    nested.cell(0, 0).text = 'Q1'
+    nested.cell(0, 1).text = '120'
+    paragraph = document.add_paragraph('Before tab')
+    paragraph.add_run().add_tab()
+    paragraph.add_run('after tab & <markup>')
+    for number in range(paragraphs):
+        document.add_paragraph(f'Generated paragraph {number} with some filler words in it.')
+    document.add_paragraph('Conclusion.')
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+class TestPdfExtraction(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pdf = make_pdf(40)
+
+    def pages(self, **options):
+        return list(FileHandler.iter_pdf_pages(BytesIO(self.pdf), **options))
+
+    def test_pages_stream_in_order(self):
+        pages = self.pages()
+        self.assertEqual(len(pages), 40)
+        self.assertIn('Page 1 marker', pages[0])
+        self.assertIn('Page 40 marker', pages[-1])
+
+    def test_page_range_and_limit(self):
+        pages = self.pages(first_page=5, last_page=9)
+        self.assertEqual([p.strip() for p in pages], [f"Page {n} marker" for n in range(5, 10)])
+        self.assertEqual(len(self.pages(first_page=38, max_pages=10)), 3)
+        self.assertEqual(len(self.pages(max_pages=2)), 2)
+
+    def test_parallel_matches_sequential(self):
+        """Page ranges fanned out to processes come back in page order"""
+        sequential = self.pages()
+        submitted = []
+        extract_range = extractors._extract_pdf_page_range
+        def recording(source, start, stop):
+            submitted.append((start, stop))
+            return extract_range(source, start, stop)
+        # The pool runs in this process so the ranges can be recorded
+        with mock.patch.object(extractors, 'available_cpus', lambda: 2), \
+                mock.patch.object(extractors, '_get_pdf_pool', lambda workers: ThreadPoolExecutor(workers)), \
+                mock.patch.object(extractors, '_extract_pdf_page_range', recording):
+            parallel = self.pages(workers=2)
+        self.assertEqual(parallel, sequential)
+        # One range per worker
+        self.assertEqual(submitted, [(0, 20), (20, 40)])
+
+    def test_parallel_in_worker_processes(self):
+        with mock.patch.object(extractors, 'available_cpus', lambda: 2):
+            self.assertEqual(self.pages(workers=2), self.pages())
+
+    def test_workers_are_capped_by_available_cpus(self):
+        with mock.patch.object(extractors, 'available_cpus', lambda: 1), \
+                mock.patch.object(extractors, '_get_pdf_pool', lambda workers: self.fail("fanned out on one CPU")):
+            self.assertEqual(len(self.pages(workers=4)), 40)
+
+    def test_extract_text_joins_pages(self):
+        text = FileHandler.extract_text(BytesIO(self.pdf), 'doc.pdf', first_page=2, max_pages=2)
+        self.assertEqual([line for line in text.splitlines() if line], ['Page 2 marker', 'Page 3 marker'])
+
+class TestDocxExtraction(unittest.TestCase):
+
+    def test_blocks_in_document_order(self):
+        blocks = list(FileHandler.iter_docx_blocks(BytesIO(make_docx())))
+        self.assertEqual(blocks, [
+            'Quarterly report',
+            'Introduction.',
+            'Region\tRevenue',
+            'North\tQ1 120',
+            'Before tab\tafter tab & <markup>',
+            'Conclusion.',
+            'Confidential'
+        ])
+
+    def test_matches_python_docx_paragraphs(self):
+        data = make_docx(50)
+        document = Document(BytesIO(data))
+        text = FileHandler.extract_text(BytesIO(data), 'doc.docx')
+        for paragraph in document.paragraphs:
+            self.assertIn(paragraph.text, text)
+
+    def test_memory_does_not_grow_with_document(self):
+        def peak(paragraphs):
+            data = make_docx(paragraphs)
+            tracemalloc.start()
+            for _ in FileHandler.iter_docx_blocks(BytesIO(data)):
+                pass
+            result = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return result
+        small, large = peak(500), peak(5000)
+        self.assertLess(large, small * 2)
+
+    def test_invalid_file(self):
+        with self.assertRaises(Exception):
+            FileHandler.extract_text(BytesIO(b'not a zip'), 'doc.docx')
+
+if __name__ == '__main__':
+    unittest.main()
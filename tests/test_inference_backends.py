@@ -0,0 +1,122 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import tempfile
+import types
+import unittest
+from unittest import mock
+import inference_backends
+from inference_backends import artifact_dir, load_seq2seq, prepare_artifacts, registry_key
+
+class FakeModel:
+    """Records where it was loaded from; nothing is downloaded"""
+
+    def __init__(self, source, export=False):
+        self.source = source
+        self.export = export
+        self.state = None
+
+    def eval(self):
+        return self
+
+    def load_state_dict(self, state):
+        self.state = state
+
+class FakeAutoModel:
+
+    @staticmethod
+    def from_pretrained(name, export=False):
+        return FakeModel(name, export)
+
+    @staticmethod
+    def from_config(config):
+        return FakeModel(('config', config))
+
+class FakeLoader:
+
+    @staticmethod
+    def from_pretrained(source):
+        return ('loaded', source)
+
+def fake_modules():
+    """transformers and torch stand-ins for load_seq2seq"""
+    transformers = types.ModuleType('transformers')
+    transformers.AutoConfig = FakeLoader
+    transformers.AutoTokenizer = FakeLoader
+    transformers.AutoModelForSeq2SeqLM = FakeAutoModel
+    torch = types.ModuleType('torch')
+    torch.load = lambda path: ('weights', path)
+    return {'transformers': transformers, 'torch': torch}
+
+class TestInferenceBackends(unittest.TestCase):
+
+    MODEL = 'facebook/bart-large-cnn'
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.models_dir = tmp.name
+        patches = [
+            mock.patch.dict(sys.modules, fake_modules()),
+            mock.patch.object(inference_backends, 'quantize_int8', lambda model: model),
+            mock.patch.object(inference_backends, '_load_onnx_class', lambda: FakeAutoModel)
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def load(self, backend, **options):
+        return load_seq2seq(self.MODEL, backend, models_dir=self.models_dir, **options)
+
+    def test_registry_key_per_backend(self):
+        self.assertEqual(registry_key(self.MODEL, 'fp32'), self.MODEL)
+        self.assertEqual(registry_key(self.MODEL, 'int8'), f"{self.MODEL}:int8")
+        self.assertEqual(registry_key(self.MODEL, 'onnx'), f"{self.MODEL}:onnx")
+
+    def test_artifact_dir_per_backend(self):
+        dirs = {backend: artifact_dir(self.MODEL, backend, 'models') for backend in ('int8', 'onnx', 'mmap')}
+        self.assertEqual(dirs['int8'], os.path.join('models', 'facebook--bart-large-cnn-int8'))
+        self.assertEqual(len(set(dirs.values())), 3)
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.load('tpu')
+        with self.assertRaises(ValueError):
+            prepare_artifacts(self.MODEL, 'tpu', models_dir=self.models_dir)
+        with self.assertRaises(ValueError):
+            prepare_artifacts(self.MODEL, 'fp32', models_dir=self.models_dir)
+        self.assertEqual(os.listdir(self.models_dir), [])
+
+    def test_int8_without_artifacts_quantizes_the_checkpoint(self):
+        model, tokenizer = self.load('int8')
+        self.assertEqual(model.source, self.MODEL)
+        self.assertIsNone(model.state)
+        self.assertEqual(tokenizer, ('loaded', self.MODEL))
+
+    def test_int8_uses_prepared_artifacts(self):
+        prepared = artifact_dir(self.MODEL, 'int8', self.models_dir)
+        os.makedirs(prepared)
+        model, tokenizer = self.load('int8')
+        self.assertEqual(model.source, ('config', ('loaded', prepared)))
+        self.assertEqual(model.state, ('weights', os.path.join(prepared, inference_backends.INT8_WEIGHTS)))
+        self.assertEqual(tokenizer, ('loaded', prepared))
+
+    def test_onnx_without_artifacts_exports_at_load_time(self):
+        model, tokenizer = self.load('onnx')
+        self.assertEqual((model.source, model.export), (self.MODEL, True))
+        self.assertEqual(tokenizer, ('loaded', self.MODEL))
+
+    def test_onnx_uses_prepared_export(self):
+        prepared = artifact_dir(self.MODEL, 'onnx', self.models_dir)
+        os.makedirs(prepared)
+        model, _ = self.load('onnx')
+        self.assertEqual((model.source, model.export), (prepared, False))
+
+    def test_missing_mmap_weights_fall_back_to_a_private_copy(self):
+        with self.assertLogs('inference_backends', level='WARNING'):
+            model, _ = self.load('fp32', mmap_weights=True)
+        self.assertEqual(model.source, self.MODEL)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import Future
+from io import BytesIO
+from unittest import mock
+from werkzeug.datastructures import FileStorage
+import jobs
+from jobs import JobManager, JobStore, run_file_job
+
+class FakeFileHandler:
+
+    def extract_text(self, file, filename, **options):
+        return file.read().decode('utf-8')
+
+class FakeService:
+    """SummaryService stand-in that reports its stages like the real one"""
+
+    def __init__(self, result=None, on_summarizing=None):
+        self.result = {'summary': 'Short summary.', 'method': 'transformer'} if result is None else result
+        self.on_summarizing = on_summarizing
+        self.calls = []
+
+    def summarize(self, text, on_stage=None, **options):
+        self.calls.append((text, options))
+        on_stage('language_detected')
+        if self.on_summarizing is not None:
+            self.on_summarizing()
+        on_stage('summarizing')
+        return self.result
+
+class FakeExecutor:
+    """Keeps every submitted job queued"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append((fn, args))
+        return Future()
+
+class JobTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.settings = {
+            'JOB_DB_PATH': os.path.join(self.tmp, 'jobs.sqlite3'),
+            'JOB_UPLOAD_DIR': os.path.join(self.tmp, 'uploads'),
+            'JOB_WORKERS': 1,
+            'JOB_RESULT_TTL': 3600
+        }
+        self.store = JobStore(self.settings['JOB_DB_PATH'])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write_upload(self, text='The committee approved the budget.'):
+        path = os.path.join(self.tmp, 'upload.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+class TestJobStore(JobTestCase):
+
+    def test_create_and_get(self):
+        job_id = self.store.create('notes.txt', '/tmp/x', {'method': 'extractive'})
+        job = self.store.get(job_id)
+        self.assertEqual((job['status'], job['stage'], job['progress']), ('queued', 'queued', 0.0))
+        self.assertEqual(job['options'], {'method': 'extractive'})
+        self.assertIsNone(job['result'])
+        self.assertIsNone(self.store.get('missing'))
+
+    def test_stage_progress_and_finish(self):
+        job_id = self.store.create('notes.txt', None, {})
+        self.store.set_stage(job_id, 'language_detected')
+        self.assertEqual(self.store.get(job_id)['progress'], jobs.STAGE_PROGRESS['language_detected'])
+
+        self.store.finish(job_id, 'completed', 60, result={'summary': 'ok'})
+        job = self.store.get(job_id)
+        self.assertEqual((job['status'], job['progress'], job['result']), ('completed', 1.0, {'summary': 'ok'}))
+        self.assertIsNotNone(job['expires_at'])
+
+    def test_cancel_flag(self):
+        job_id = self.store.create('notes.txt', None, {})
+        self.assertFalse(self.store.is_cancel_requested(job_id))
+        self.store.request_cancel(job_id)
+        self.assertTrue(self.store.is_cancel_requested(job_id))
+
+    def test_purge_removes_only_expired_jobs(self):
+        expired = self.store.create('a.txt', '/tmp/a', {})
+        kept = self.store.create('b.txt', '/tmp/b', {})
+        running = self.store.create('c.txt', '/tmp/c', {})
+        self.store.finish(expired, 'failed', -1, error='boom')
+        self.store.finish(kept, 'completed', 3600, result={})
+
+        self.assertEqual(self.store.purge_expired(), ['/tmp/a'])
+        self.assertIsNone(self.store.get(expired))
+        self.assertIsNotNone(self.store.get(kept))
+        self.assertIsNotNone(self.store.get(running))
+
+class TestRunFileJob(JobTestCase):
+
+    def run_job(self, service, options=None):
+        upload_path = self.write_upload()
+        job_id = self.store.create('notes.txt', upload_path, options or {})
+        with mock.patch.object(jobs, '_worker_service', service), \
+                mock.patch.object(jobs, '_worker_file_handler', FakeFileHandler()):
+            run_file_job(self.settings, job_id, upload_path, 'notes.txt', options or {})
+        self.assertFalse(os.path.exists(upload_path))
+        return job_id, self.store.get(job_id)
+
+    def test_completed_job_records_the_summary(self):
+        service = FakeService()
+        _, job = self.run_job(service, {'method': 'extractive', 'max_length': 80})
+
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['result']['summary'], 'Short summary.')
+        self.assertEqual(job['result']['filename'], 'notes.txt')
+        self.assertNotIn('original_text', job['result'])
+        self.assertEqual(service.calls[0][1]['method'], 'extractive')
+        self.assertEqual(service.calls[0][1]['max_length'], 80)
+        # The service's (possibly cached) result is not modified
+        self.assertNotIn('filename', service.result)
+
+    def test_missing_result_fails_the_job(self):
+        _, job = self.run_job(FakeService(result={}))
+        self.assertEqual(job['status'], 'failed')
+        self.assertIn('without a result', job['error'])
+
+    def test_cancel_before_start(self):
+        upload_path = self.write_upload()
+        job_id = self.store.create('notes.txt', upload_path, {})
+        self.store.request_cancel(job_id)
+        service = FakeService()
+        with mock.patch.object(jobs, '_worker_service', service):
+            run_file_job(self.settings, job_id, upload_path, 'notes.txt', {})
+        self.assertEqual(self.store.get(job_id)['status'], 'cancelled')
+        self.assertEqual(service.calls, [])
+
+    def test_cancel_at_a_stage_boundary(self):
+        service = FakeService()
+        service.on_summarizing = lambda: self.store.request_cancel(self.current_job)
+        upload_path = self.write_upload()
+        self.current_job = self.store.create('notes.txt', upload_path, {})
+        with mock.patch.object(jobs, '_worker_service', service), \
+                mock.patch.object(jobs, '_worker_file_handler', FakeFileHandler()), \
+                mock.patch.object(jobs, 'CANCEL_CHECK_INTERVAL', 0):
+            run_file_job(self.settings, self.current_job, upload_path, 'notes.txt', {})
+        job = self.store.get(self.current_job)
+        self.assertEqual(job['status'], 'cancelled')
+        self.assertIsNone(job['result'])
+
+    def test_cancel_checks_are_throttled(self):
+        lookups = []
+        original = JobStore.is_cancel_requested
+
+        def counting(store, job_id):
+            lookups.append(job_id)
+            return original(store, job_id)
+
+        with mock.patch.object(JobStore, 'is_cancel_requested', counting), \
+                mock.patch.object(jobs, 'CANCEL_CHECK_INTERVAL', 3600):
+            _, job = self.run_job(FakeService())
+        self.assertEqual(job['status'], 'completed')
+        # Start, after extraction and after summarization; stage checks are skipped
+        self.assertEqual(len(lookups), 3)
+
+class TestJobManager(JobTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.manager = JobManager(self.settings)
+        self.executor = FakeExecutor()
+        self.manager._get_executor = lambda: self.executor
+
+    def submit(self, text='Some text.'):
+        file = FileStorage(stream=BytesIO(text.encode('utf-8')), filename='notes.txt')
+        return self.manager.submit_file(file, 'notes.txt', {'method': 'extractive'})
+
+    def test_submit_queues_the_upload(self):
+        job_id = self.submit()
+        job = self.manager.get(job_id)
+        self.assertEqual(job['status'], 'queued')
+        self.assertNotIn('upload_path', job)
+        fn, args = self.executor.submitted[0]
+        self.assertIs(fn, run_file_job)
+        with open(args[2], encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'Some text.')
+
+    def test_cancel_queued_job(self):
+        job_id = self.submit()
+        upload_path = self.executor.submitted[0][1][2]
+        job = self.manager.cancel(job_id)
+        self.assertEqual(job['status'], 'cancelled')
+        self.assertFalse(os.path.exists(upload_path))
+        self.assertIsNone(self.manager.cancel('missing'))
+
+    def test_cancel_finished_job_keeps_its_status(self):
+        job_id = self.submit()
+        self.manager.store.finish(job_id, 'completed', 3600, result={'summary': 'ok'})
+        self.assertEqual(self.manager.cancel(job_id)['status'], 'completed')
+
+    def test_expired_jobs_are_purged_on_poll(self):
+        job_id = self.submit()
+        upload_path = self.executor.submitted[0][1][2]
+        self.manager.store.finish(job_id, 'failed', -1, error='boom')
+
+        with mock.patch.object(jobs, 'PURGE_INTERVAL', 0):
+            self.assertIsNone(self.manager.get(job_id))
+        self.assertFalse(os.path.exists(upload_path))
+
+    def test_poll_purges_at_most_once_per_interval(self):
+        job_id = self.submit()
+        self.manager.store.finish(job_id, 'failed', -1, error='boom')
+        # submit_file just purged, so this poll does not
+        self.assertIsNotNone(self.manager.get(job_id))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import time
+import unittest
+from language_detector import LanguageDetector, SAMPLE_SPANS, SPAN_CHARS, sample_text
+from document import Document
+from multilingual_summarizer import MultilingualSummarizer
+
+FRENCH = 'Le chat est assis sur la table et il regarde les oiseaux par la fenêtre ouverte. '
+ENGLISH = 'The quick brown fox jumps over the lazy dog near the quiet river bank today. '
+
+class RecordingTranslator:
+
+    def __init__(self):
+        self.calls = []
+
+    def translate(self, text, target_lang, source_lang='auto'):
+        self.calls.append(source_lang)
+        return 'Translated into English: ' + text
+
+    def translate_chunks(self, texts, target_lang, source_lang='auto'):
+        langs = source_lang if isinstance(source_lang, list) else [source_lang] * len(texts)
+        return [self.translate(text, target_lang, lang) for text, lang in zip(texts, langs)]
+
+class TestLanguageDetector(unittest.TestCase):
+
+    def test_sample_is_bounded(self):
+        text = FRENCH * 5000
+        sample = sample_text(text)
+        self.assertLessEqual(len(sample), SAMPLE_SPANS * SPAN_CHARS + SAMPLE_SPANS)
+        self.assertEqual(sample.count('\n'), SAMPLE_SPANS - 1)
+        self.assertEqual(sample_text('short text'), 'short text')
+
+    def test_confidence_and_constant_cost(self):
+        result = LanguageDetector.detect_with_confidence(FRENCH * 20)
+        self.assertEqual(result['language'], 'fr')
+        self.assertGreater(result['confidence'], 0.9)
+
+        huge = FRENCH * 100000 + ENGLISH
+        started = time.perf_counter()
+        self.assertEqual(LanguageDetector.detect_language(huge), 'fr')
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(LanguageDetector.detect_with_confidence('12345')['confidence'], 0.0)
+
+    def test_segments_of_mixed_document(self):
+        text = '\n\n'.join([FRENCH * 30] * 3 + [ENGLISH * 30] * 3)
+        segments = LanguageDetector.detect_segments(text)
+        self.assertEqual([segment['language'] for segment in segments], ['fr', 'en'])
+        self.assertEqual(segments[0]['start'], 0)
+        self.assertEqual(segments[-1]['end'], len(text.rstrip()))
+        self.assertTrue(text[segments[1]['start']:].startswith('The quick'))
+
+    def test_english_chunks_are_not_translated(self):
+        multilingual = MultilingualSummarizer(segment_detection=True)
+        multilingual.translator = RecordingTranslator()
+        text = FRENCH * 40 + ENGLISH * 40
+        english = multilingual._translate_to_english(Document(text), 'fr')
+        # Three chunks: French, mixed (labelled French) and English, which is kept as is
+        self.assertEqual(multilingual.translator.calls, ['fr', 'fr'])
+        self.assertIn('The quick brown fox', english.text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import threading
+import unittest
+from chunking import TextChunker
+from map_reduce import MapReduceSummarizer
+from summarizer import TextSummarizer
+from stub_models import install_stubs
+
+def count_words(texts):
+    return [len(text.split()) for text in texts]
+
+class TestMapReduce(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def fake_summarize_batch(self, texts, max_length, min_length):
+        with self.lock:
+            self.calls.append((list(texts), max_length, min_length))
+        # Each partial summary is one word naming the text it came from
+        return [f"p{abs(hash(text)) % 10000}" for text in texts]
+
+    def make(self, **options):
+        options.setdefault('count_tokens', count_words)
+        return MapReduceSummarizer(self.fake_summarize_batch, **options)
+
+    def test_pack_respects_budget_and_item_cap(self):
+        reducer = self.make()
+        pieces = ['a b c', 'd e', 'f g h i', 'j', 'k l']
+        self.assertEqual(reducer.pack(pieces, 5), ['a b c d e', 'f g h i j', 'k l'])
+        self.assertEqual(reducer.pack(pieces, 100, max_items=2), ['a b c d e', 'f g h i j', 'k l'])
+        self.assertEqual(reducer.pack(pieces, 100), [' '.join(pieces)])
+
+    def test_oversized_piece_gets_its_own_group(self):
+        reducer = self.make()
+        self.assertEqual(reducer.pack(['a', 'b c d e f g', 'h'], 3), ['a', 'b c d e f g', 'h'])
+
+    def test_single_chunk_skips_the_map(self):
+        reducer = self.make(chunk_tokens=50)
+        self.assertEqual(reducer.reduce(['One two.', 'Three four.'], 100, 30), 'One two. Three four.')
+        self.assertEqual(self.calls, [])
+
+    def test_levels_merge_fan_out_partials_at_a_time(self):
+        reducer = self.make(chunk_tokens=100, fan_out=2, batch_size=4, max_workers=2)
+        chunks = [f"chunk {i} " + 'word ' * 20 for i in range(8)]
+
+        final_input = reducer.reduce_chunks(chunks, 150, 40)
+
+        summarized = [text for texts, _, _ in self.calls for text in texts]
+        # 8 chunks, then 4 and 2 groups of two partials each
+        self.assertEqual(len(summarized), 8 + 4 + 2)
+        self.assertEqual(set(summarized[:8]), set(chunks))
+        self.assertEqual(len(final_input.split()), 2)
+        self.assertTrue(all(len(texts) <= 4 for texts, _, _ in self.calls))
+        # Partial summaries are capped so fan_out of them fit one pass
+        self.assertTrue(all(max_length == 50 and min_length == 25 for _, max_length, min_length in self.calls))
+
+    def test_max_levels_stops_the_reduction(self):
+        reducer = self.make(chunk_tokens=100, fan_out=2, max_levels=1)
+        final_input = reducer.reduce_chunks([f"chunk {i}" for i in range(8)], 150, 40)
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(len(final_input.split()), 8)
+
+    def test_overlapping_chunks_are_all_summarized(self):
+        text = ' '.join(f"S{i} a b c." for i in range(12))
+        chunks = TextChunker(max_tokens=16, count_tokens=count_words, overlap_tokens=4).chunk(text)
+        reducer = self.make(chunk_tokens=16, fan_out=4, max_workers=1)
+
+        reducer.reduce_chunks(chunks, 150, 40)
+
+        first_level = [text for texts, _, _ in self.calls for text in texts][:len(chunks)]
+        self.assertEqual(first_level, chunks)
+        # The sentence at each boundary reaches the model twice
+        self.assertEqual(sum('S3 a b c.' in chunk for chunk in first_level), 2)
+
+    def test_map_goes_through_the_batch_scheduler(self):
+        """With batching on, map chunks share the scheduler instead of calling generate directly"""
+        summarizer = TextSummarizer(batching=True, batch_max_wait_ms=20)
+        summarizer._generate_batch = lambda texts, max_length, min_length: self.fail("bypassed the scheduler")
+        summarizer.batch_scheduler.generate_batch = self.fake_summarize_batch
+
+        partials = summarizer.map_reduce._map([f"chunk {i}" for i in range(6)], 60, 20)
+
+        self.assertEqual(len(partials), 6)
+        self.assertEqual(sum(len(texts) for texts, _, _ in self.calls), 6)
+
+    def test_bart_tokenizer_is_used_under_one_lock(self):
+        """Counting, stream encoding and pipeline calls share the BART tokenizer lock"""
+        summarizer = TextSummarizer()
+        pipeline = install_stubs(summarizer=summarizer, token_cost_ms=0)['pipeline']
+        self.addCleanup(summarizer.registry.unload, summarizer.model_key)
+        held = []
+        tokenize = type(pipeline.tokenizer).__call__
+        def checking(tokenizer, texts, **kwargs):
+            held.append(summarizer._tokenizer_lock.locked())
+            return tokenize(tokenizer, texts, **kwargs)
+        pipeline.tokenizer.__class__ = type('CheckingTokenizer', (type(pipeline.tokenizer),), {'__call__': checking})
+
+        self.assertEqual(summarizer._count_tokens(['one two three', 'four']), [3, 1])
+        summarizer._generate_batch(['one two three'], 10, 1)
+        self.assertEqual(held, [True, True])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from model_registry import ModelRegistry
+
+class FakeModel:
+    """Stands in for a torch module with a fixed parameter size"""
+
+    def __init__(self, size):
+        self.size = size
+
+    def parameters(self):
+        class Param:
+            def __init__(self, n):
+                self.n = n
+            def numel(self):
+                return self.n
+            def element_size(self):
+                return 1
+        return [Param(self.size)]
+
+class TestModelRegistry(unittest.TestCase):
+
+    def test_concurrent_first_use_loads_once(self):
+        """Concurrent first requests share a single load"""
+        registry = ModelRegistry()
+        loads = []
+        lock = threading.Lock()
+
+        def loader():
+            with lock:
+                loads.append(1)
+            time.sleep(0.05)
+            return FakeModel(10)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            models = list(pool.map(lambda _: registry.get('bart', loader), range(8)))
+
+        self.assertEqual(len(loads), 1)
+        self.assertTrue(all(model is models[0] for model in models))
+        self.assertEqual(registry.get_stats()['models']['bart']['memory_bytes'], 10)
+
+    def test_ceiling_unloads_idle_models(self):
+        """Least recently used idle model is unloaded above the ceiling"""
+        registry = ModelRegistry(max_memory_bytes=150)
+        registry.get('bart', lambda: FakeModel(100))
+        registry.get('mbart', lambda: FakeModel(100))
+        self.assertFalse(registry.is_loaded('bart'))
+        self.assertTrue(registry.is_loaded('mbart'))
+
+    def test_models_in_use_are_kept(self):
+        """A model held with use() is never unloaded"""
+        registry = ModelRegistry(max_memory_bytes=150)
+        with registry.use('bart', lambda: FakeModel(100)):
+            registry.get('mbart', lambda: FakeModel(100))
+            self.assertTrue(registry.is_loaded('bart'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from document import Document
+from multilingual_summarizer import MultilingualSummarizer
+from stub_models import install_stubs
+
+def french_text(sentences, seed=0):
+    return ' '.join(f"La phrase {seed}-{i} parle du projet et de son avenir." for i in range(sentences))
+
+class TestNativeSummary(unittest.TestCase):
+
+    def make_summarizer(self, **options):
+        multilingual = MultilingualSummarizer(summarizer=object(), native_chunk_tokens=120, **options)
+        self.model, self.tokenizer = install_stubs(multilingual_summarizer=multilingual, token_cost_ms=0)['mbart']
+        self.addCleanup(multilingual.registry.unload, multilingual.mbart_key)
+
+        self.batches = []
+        lock = threading.Lock()
+        generate = multilingual._generate_mbart_batch
+        def recording(items, max_length, min_length, target_lang='en'):
+            with lock:
+                self.batches.append((len(items), {source for _, source in items}, target_lang))
+            return generate(items, max_length, min_length, target_lang=target_lang)
+        if multilingual.batch_scheduler is not None:
+            multilingual.batch_scheduler.generate_batch = recording
+        else:
+            multilingual._generate_mbart_batch = recording
+        return multilingual
+
+    def test_short_input_is_one_pass(self):
+        multilingual = self.make_summarizer()
+        result = multilingual._native_summarize(Document(french_text(3)), 'fr', 'de', 40, 5)
+        self.assertEqual(self.batches, [(1, {'fr'}, 'de')])
+        self.assertEqual(result['method'], 'native')
+        self.assertTrue(result['summary'].startswith('La phrase 0-0'))
+
+    def test_token_counting_holds_the_tokenizer_lock(self):
+        """Counting shares the tokenizer with generation, so it takes the same lock"""
+        multilingual = self.make_summarizer()
+        held = []
+        tokenize = type(self.tokenizer).__call__
+        def checking(tokenizer, texts, **kwargs):
+            held.append(multilingual._tokenizer_lock.locked())
+            return tokenize(tokenizer, texts, **kwargs)
+        self.tokenizer.__class__ = type('CheckingTokenizer', (type(self.tokenizer),), {'__call__': checking})
+
+        self.assertEqual(multilingual._count_mbart_tokens(['un deux trois', 'quatre']), [3, 1])
+        self.assertEqual(held, [True])
+
+    def test_long_input_is_chunked_and_batched(self):
+        multilingual = self.make_summarizer(batch_max_size=4)
+        document = Document(french_text(60))
+        chunks = multilingual.native_chunker.chunk(document)
+        self.assertGreater(len(chunks), 4)
+
+        result = multilingual._native_summarize(document, 'fr', 'de', 40, 5)
+        # Chunk summaries run several to a generate call, in French
+        self.assertGreater(max(size for size, _, _ in self.batches), 1)
+        self.assertEqual(self.batches[0][2], 'fr')
+        # The final pass writes the summary in the target language
+        self.assertEqual(self.batches[-1], (1, {'fr'}, 'de'))
+        self.assertLess(len(self.batches), len(chunks))
+        self.assertTrue(result['summary'])
+
+    def test_concurrent_requests_share_batches_per_target_language(self):
+        multilingual = self.make_summarizer(batching=True, batch_max_wait_ms=100)
+        requests = [('fr', 'de', 0), ('es', 'de', 1), ('fr', 'it', 2)]
+
+        def run(request):
+            source, target, seed = request
+            return multilingual._native_summarize(Document(french_text(3, seed)), source, target, 40, 5)
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            results = list(pool.map(run, requests))
+
+        self.assertEqual([r['target_language'] for r in results], ['de', 'de', 'it'])
+        self.assertTrue(results[1]['summary'].startswith('La phrase 1-0'))
+        self.assertEqual(sorted(self.batches, key=lambda b: b[2]), [(2, {'fr', 'es'}, 'de'), (1, {'fr'}, 'it')])
+
+    def test_stuck_batch_times_out(self):
+        """A request waits at most result_timeout for its batch"""
+        multilingual = self.make_summarizer(batching=True, batch_max_wait_ms=1)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        multilingual.batch_scheduler.generate_batch = lambda *args, **kwargs: release.wait(10)
+        multilingual.batch_scheduler.result_timeout = 0.1
+
+        with self.assertRaises(TimeoutError):
+            multilingual._mbart_summarize(['bonjour'], 'fr', 'en', 40, 5)
+
+if __name__ == '__main__':
+    unittest.main()
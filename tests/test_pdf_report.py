@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import unittest
+from file_handler import FileHandler
+from pdf_report import body_blocks, iter_report
+
+STATS = {'original_length': 12, 'summary_length': 3, 'compression_ratio': '25.0%'}
+
+class TestPdfReport(unittest.TestCase):
+
+    def test_long_lines_are_split_into_blocks(self):
+        line = ' '.join(['word'] * 50)
+        blocks = list(body_blocks(line + '\n\nShort & sweet <b>', block_chars=40))
+        self.assertTrue(all(len(markup) <= 40 for markup, _ in blocks[:-1]))
+        self.assertEqual(' '.join(markup for markup, _ in blocks[:-1]), line)
+        self.assertEqual([end for _, end in blocks].count(True), 2)
+        self.assertEqual(blocks[-1], ('Short &amp; sweet &lt;b&gt;', True))
+
+    def test_streamed_report_matches_generated_report(self):
+        original = 'First paragraph & more.\n' * 200
+        summary = 'Summary <with> markup.'
+        streamed = list(iter_report(original, summary, STATS, max_pending_chunks=2))
+        data = b''.join(streamed)
+        self.assertTrue(data.startswith(b'%PDF'))
+        # Only the creation timestamp and document id may differ
+        self.assertEqual(len(data), len(FileHandler.generate_pdf(original, summary, STATS)))
+
+    def test_closing_the_stream_early_stops_rendering(self):
+        stream = iter_report('Text.\n' * 5000, 'Summary.', STATS, max_pending_chunks=1)
+        self.assertTrue(next(stream).startswith(b'%PDF'))
+        stream.close()
+
+if __name__ == '__main__':
+    unittest.main()
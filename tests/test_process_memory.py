@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import unittest
+from process_memory import child_pids, memory_report, parse_smaps, process_memory
+
+ROLLUP = '''55c0742c5000-7ffcdb4d1000 ---p 00000000 00:00 0                          [rollup]
+Rss:                1304 kB
+Pss:                 441 kB
+Shared_Clean:       1164 kB
+Shared_Dirty:          0 kB
+Private_Clean:        40 kB
+Private_Dirty:       100 kB
+Swap:                  0 kB
+'''
+
+class TestProcessMemory(unittest.TestCase):
+
+    def test_parse_smaps(self):
+        smaps = parse_smaps(ROLLUP)
+        self.assertEqual(smaps['Rss'], 1304 * 1024)
+        self.assertEqual(smaps['Shared_Clean'] + smaps['Private_Clean'] + smaps['Private_Dirty'], 1304 * 1024)
+
+    @unittest.skipUnless(os.path.exists('/proc/self/smaps') and hasattr(os, 'fork'), 'needs Linux /proc and fork')
+    def test_memory_allocated_before_fork_is_shared(self):
+        # Stands in for model weights loaded by the master before forking
+        weights = bytearray(os.urandom(1024)) * (48 * 1024)
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(write_end)
+            os.read(read_end, 1)
+            os._exit(0)
+        os.close(read_end)
+        try:
+            worker = process_memory(pid)
+            self.assertGreater(worker['shared_mb'], 40)
+            self.assertLess(worker['unique_mb'], 40)
+            self.assertIn(pid, child_pids(os.getpid()))
+
+            report = memory_report(os.getpid())
+            self.assertIn(pid, [w['pid'] for w in report['workers']])
+            self.assertGreater(report['shared_saving_mb'], 20)
+        finally:
+            os.write(write_end, b'x')
+            os.close(write_end)
+            os.waitpid(pid, 0)
+        del weights
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import unittest
+from startup import HEAVY_PACKAGES, import_report, parse_importtime
+
+SAMPLE = '''import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2500 |       2500 |     numpy.core
+import time:       900 |       3400 |   numpy
+import time:      1000 |       4520 | extractive
+'''
+
+class TestStartup(unittest.TestCase):
+
+    def test_parse_importtime(self):
+        modules = parse_importtime(SAMPLE)
+        self.assertEqual([m['module'] for m in modules], ['_io', 'numpy.core', 'numpy', 'extractive'])
+        self.assertEqual([m['depth'] for m in modules], [1, 2, 1, 0])
+        self.assertEqual(modules[-1]['cumulative_ms'], 4.52)
+        self.assertEqual(modules[1]['self_ms'], 2.5)
+
+    def test_app_import_defers_heavy_libraries(self):
+        report = import_report('app')
+        self.assertEqual(report['heavy_imports'], [])
+        self.assertGreater(report['total_ms'], 0)
+        self.assertIn('flask', [p['package'] for p in report['packages']])
+
+    def test_report_lists_heavy_imports(self):
+        report = import_report('nltk_support; import nltk')
+        self.assertIn('nltk', report['heavy_imports'])
+        self.assertTrue(set(report['heavy_imports']) <= set(HEAVY_PACKAGES))
+
+if __name__ == '__main__':
+    unittest.main()
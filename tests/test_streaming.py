@@ -0,0 +1,213 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import json
+import queue
+import threading
+import types
+import unittest
+from unittest import mock
+from cache import SummaryCache, make_cache_key
+from streaming import stream_generate, to_ndjson
+from summary_service import SummaryService
+
+class FakeStreamer:
+    """TextIteratorStreamer stand-in: generate puts text, the caller iterates"""
+
+    def __init__(self, tokenizer, skip_special_tokens=True, timeout=None):
+        self.queue = queue.Queue()
+        self.timeout = timeout
+
+    def put(self, text):
+        self.queue.put(text)
+
+    def end(self):
+        self.queue.put(None)
+
+    def __iter__(self):
+        while True:
+            text = self.queue.get(timeout=self.timeout)
+            if text is None:
+                return
+            yield text
+
+class FakeStoppingCriteria:
+    pass
+
+class FakeGenerateModel:
+
+    def __init__(self, pieces, error=None):
+        self.pieces = pieces
+        self.error = error
+        self.kwargs = None
+
+    def generate(self, streamer=None, stopping_criteria=None, **kwargs):
+        self.kwargs = kwargs
+        for piece in self.pieces:
+            streamer.put(piece)
+        if self.error is not None:
+            raise self.error
+        streamer.end()
+
+class EndlessModel:
+    """Generates until a stopping criterion says stop"""
+
+    def __init__(self):
+        self.steps = 0
+        self.finished = threading.Event()
+
+    def generate(self, streamer=None, stopping_criteria=None, **kwargs):
+        while not any(criterion(None, None) for criterion in stopping_criteria):
+            self.steps += 1
+            streamer.put('word ')
+        self.finished.set()
+        streamer.end()
+
+class FakeLanguageDetector:
+
+    def detect_language(self, text):
+        return 'en'
+
+    def get_language_name(self, code):
+        return {'en': 'English'}.get(code, code)
+
+class FakeSummarizer:
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    def stream_summarize(self, document, method='transformer', max_length=150, min_length=50):
+        self.calls += 1
+        yield {'event': 'stage', 'stage': 'generating'}
+        for piece in ('Short ', 'summary', '.'):
+            yield {'event': 'token', 'text': piece}
+        if self.error is not None:
+            raise self.error
+
+def fake_transformers():
+    transformers = types.ModuleType('transformers')
+    transformers.TextIteratorStreamer = FakeStreamer
+    transformers.StoppingCriteria = FakeStoppingCriteria
+    transformers.StoppingCriteriaList = list
+    return {'transformers': transformers}
+
+class TestStreamGenerate(unittest.TestCase):
+
+    def test_pieces_are_yielded_in_order(self):
+        model = FakeGenerateModel(['Hello', '', ' world'])
+        with mock.patch.dict(sys.modules, fake_transformers()):
+            pieces = list(stream_generate(model, None, {'input_ids': [[1]]}, max_length=20, num_beams=1))
+        self.assertEqual(pieces, ['Hello', ' world'])
+        self.assertEqual(model.kwargs, {'input_ids': [[1]], 'max_length': 20, 'num_beams': 1})
+
+    def test_generate_errors_reach_the_caller(self):
+        model = FakeGenerateModel(['partial'], error=RuntimeError("out of memory"))
+        with mock.patch.dict(sys.modules, fake_transformers()):
+            stream = stream_generate(model, None, {}, timeout=5)
+            self.assertEqual(next(stream), 'partial')
+            with self.assertRaises(RuntimeError):
+                list(stream)
+
+    def test_abandoned_stream_stops_generate(self):
+        """Closing the stream (client disconnect) ends the generate thread"""
+        model = EndlessModel()
+        with mock.patch.dict(sys.modules, fake_transformers()):
+            stream = stream_generate(model, None, {}, timeout=5)
+            self.assertEqual(next(stream), 'word ')
+            stream.close()
+        self.assertTrue(model.finished.wait(5))
+
+    def test_ndjson_is_one_event_per_line(self):
+        lines = list(to_ndjson([{'event': 'token', 'text': 'héllo'}, {'event': 'done'}]))
+        self.assertEqual(lines, ['{"event": "token", "text": "héllo"}\n', '{"event": "done"}\n'])
+
+class TestSummaryStream(unittest.TestCase):
+
+    TEXT = "The committee met on Tuesday. It approved the budget."
+
+    def make_service(self, summarizer=None, cache=None):
+        return SummaryService(
+            summarizer or FakeSummarizer(),
+            multilingual_summarizer=None,
+            language_detector=FakeLanguageDetector(),
+            cache=cache,
+            model_id='test'
+        )
+
+    def test_event_order(self):
+        events = list(self.make_service().stream(self.TEXT, target_lang='en'))
+        self.assertEqual(
+            [event['event'] for event in events],
+            ['stage', 'stage', 'token', 'token', 'token', 'done']
+        )
+        self.assertEqual(events[0]['stage'], 'language_detected')
+        self.assertEqual(events[-1]['summary'], 'Short summary.')
+
+    def test_failure_ends_with_an_error_event(self):
+        service = self.make_service(FakeSummarizer(error=RuntimeError("model crashed")))
+        events = list(service.stream(self.TEXT, target_lang='en'))
+        self.assertEqual(events[-1], {'event': 'error', 'error': 'model crashed'})
+        self.assertNotIn('done', [event['event'] for event in events])
+
+    def test_streamed_output_is_not_stored(self):
+        """Greedy streamed output never replaces a stored (beam search) result"""
+        cache = SummaryCache()
+        summarizer = FakeSummarizer()
+        service = self.make_service(summarizer, cache)
+
+        list(service.stream(self.TEXT, target_lang='en'))
+        events = list(service.stream(self.TEXT, target_lang='en'))
+
+        self.assertEqual(cache.get_stats()['memory']['entries'], 0)
+        self.assertEqual(summarizer.calls, 2)
+        self.assertNotIn('cached', events[-1])
+
+class TestStreamEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        import app as app_module
+        self.app_module = app_module
+        self.summarizer = FakeSummarizer()
+        self.cache = SummaryCache()
+        service = SummaryService(
+            self.summarizer, None, FakeLanguageDetector(), cache=self.cache, model_id='test'
+        )
+        for name, value in (('summary_service', service), ('language_detector', FakeLanguageDetector())):
+            patch = mock.patch.object(app_module, name, value)
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.client = app_module.app.test_client()
+
+    def post(self, payload):
+        response = self.client.post('/api/summarize/stream', json=payload)
+        events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        return response, events
+
+    def test_streams_ndjson_events(self):
+        response, events = self.post({'text': TestSummaryStream.TEXT, 'target_lang': 'en'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertEqual([event['event'] for event in events][-4:], ['token', 'token', 'token', 'done'])
+        self.assertEqual(events[-1]['summary'], 'Short summary.')
+
+    def test_cache_hit_replays_the_summary(self):
+        text = TestSummaryStream.TEXT
+        key = make_cache_key(text, 'transformer', 150, 50, 'en', 'translate', 'test')
+        self.cache.set(key, {'summary': 'Cached summary.', 'method': 'transformer'})
+
+        _, events = self.post({'text': text, 'target_lang': 'en'})
+
+        self.assertEqual(events, [
+            {'event': 'token', 'text': 'Cached summary.'},
+            {'summary': 'Cached summary.', 'method': 'transformer', 'event': 'done', 'cached': True}
+        ])
+        self.assertEqual(self.summarizer.calls, 0)
+
+    def test_empty_text_is_rejected(self):
+        response = self.client.post('/api/summarize/stream', json={'text': '  '})
+        self.assertEqual(response.status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
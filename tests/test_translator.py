@@ -0,0 +1,252 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import ModuleType, SimpleNamespace
+from unittest import mock
+from language_detector import LanguageDetector
+from multilingual_summarizer import MultilingualSummarizer
+from stub_models import StubSeq2SeqModel, StubTokenizer
+from translation_backends import MBART_LANG_CODES, HttpTranslationBackend, MBartTranslationBackend
+from translation_memory import TranslationMemory
+from translator import TextTranslator
+
+class FakeClient:
+    """googletrans-like client with per-text delays and scripted failures"""
+
+    def __init__(self, delays=None, failures=None, hang=None):
+        self.delays = delays or {}
+        self.failures = dict(failures or {})
+        self.hang = hang or set()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.calls = []
+
+    def translate(self, text, src='auto', dest='en'):
+        with self.lock:
+            self.calls.append(text)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(2.0 if text in self.hang else self.delays.get(text, 0.0))
+            with self.lock:
+                if self.failures.get(text, 0) > 0:
+                    self.failures[text] -= 1
+                    raise Exception('503 Service Unavailable')
+            return SimpleNamespace(text='\n'.join(f"{dest}[{src}]:{line}" for line in text.split('\n')))
+        finally:
+            with self.lock:
+                self.active -= 1
+
+def make_translator(client, **options):
+    options.setdefault('backoff', 0.01)
+    return TextTranslator(client_factory=lambda timeout: client, **options)
+
+class TestConcurrentTranslation(unittest.TestCase):
+
+    def test_parallel_and_ordered(self):
+        chunks = [f"chunk {i}" for i in range(8)]
+        # Later chunks finish first
+        client = FakeClient(delays={chunk: 0.1 - i * 0.01 for i, chunk in enumerate(chunks)})
+        translator = make_translator(client, workers=4)
+
+        started = time.perf_counter()
+        results = translator.translate_chunks(chunks, 'en', 'hi')
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(results, [f"en[hi]:{chunk}" for chunk in chunks])
+        self.assertEqual(client.max_active, 4)
+        self.assertLess(elapsed, 0.5)
+
+    def test_retries_then_falls_back_per_chunk(self):
+        client = FakeClient(failures={'flaky': 2, 'broken': 10})
+        translator = make_translator(client, retries=2)
+        results = translator.translate_chunks(['flaky', 'broken', 'fine'], 'en', ['fr', 'de', 'es'])
+        self.assertEqual(results, ['en[fr]:flaky', None, 'en[es]:fine'])
+        self.assertEqual(client.calls.count('broken'), 3)
+        self.assertEqual(translator.translate_batch(['broken', 'fine'], 'en', 'de'), ['broken', 'en[de]:fine'])
+
+    def test_slow_chunk_times_out(self):
+        client = FakeClient(hang={'stuck'})
+        translator = make_translator(client, timeout=0.05, retries=0, backoff=0)
+        started = time.perf_counter()
+        self.assertEqual(translator.translate_chunks(['stuck', 'quick'], 'en', 'fr'), [None, 'en[fr]:quick'])
+        self.assertLess(time.perf_counter() - started, 1.0)
+
+    def test_timeout_applies_to_each_attempt(self):
+        """A hung attempt is abandoned at the timeout and the chunk is retried"""
+        class HangsOnce(FakeClient):
+            """Every text hangs on its first attempt"""
+            def translate(self, text, src='auto', dest='en'):
+                with self.lock:
+                    first = text not in self.tried
+                    self.tried.add(text)
+                if first:
+                    time.sleep(2.0)
+                return super().translate(text, src, dest)
+
+        client = HangsOnce()
+        client.tried = set()
+        translator = make_translator(client, timeout=0.1, retries=1, backoff=0)
+        started = time.perf_counter()
+        self.assertEqual(translator.translate_chunks(['slow', 'quick'], 'en', 'fr'), ['en[fr]:slow', 'en[fr]:quick'])
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(translator.translate('again', 'en', 'fr'), 'en[fr]:again')
+
+    def test_same_language_and_empty_chunks_are_not_sent(self):
+        client = FakeClient()
+        translator = make_translator(client)
+        self.assertEqual(translator.translate_chunks(['hello', ' '], 'en', 'en'), ['hello', ' '])
+        self.assertEqual(client.calls, [])
+
+class TestTranslationMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.memory = TranslationMemory(os.path.join(self.directory, 'translations.sqlite3'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_only_unseen_sentences_are_sent(self):
+        client = FakeClient()
+        translator = make_translator(client, memory=self.memory)
+        disclaimer = 'Ce document est confidentiel. Toute diffusion est interdite.'
+
+        first = translator.translate(f"Rapport annuel.\n\n{disclaimer}", 'en', 'fr')
+        self.assertEqual(
+            first,
+            'en[fr]:Rapport annuel.\n\nen[fr]:Ce document est confidentiel. en[fr]:Toute diffusion est interdite.'
+        )
+        # All misses went out together, one per line
+        self.assertEqual(client.calls, ['Rapport annuel.\nCe document est confidentiel.\nToute diffusion est interdite.'])
+
+        second = translator.translate(f"Rapport  trimestriel.  {disclaimer}", 'en', 'fr')
+        self.assertTrue(second.endswith('en[fr]:Toute diffusion est interdite.'))
+        self.assertEqual(client.calls[1], 'Rapport trimestriel.')
+
+        translator.translate(disclaimer, 'en', 'fr')
+        self.assertEqual(len(client.calls), 2)
+        stats = self.memory.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (4, 4))
+        self.assertEqual(stats['entries'], 4)
+
+        # Another language pair is a separate entry
+        translator.translate(disclaimer, 'de', 'fr')
+        self.assertEqual(len(client.calls), 3)
+
+    def test_lines_merged_by_the_service_fall_back_to_single_sentences(self):
+        class MergingClient(FakeClient):
+            def translate(self, text, src='auto', dest='en'):
+                return super().translate(text.replace('\n', ' '), src, dest)
+
+        client = MergingClient()
+        translator = make_translator(client, memory=self.memory)
+        self.assertEqual(translator.translate('Un. Deux.', 'en', 'fr'), 'en[fr]:Un. en[fr]:Deux.')
+        self.assertEqual(client.calls, ['Un. Deux.', 'Un.', 'Deux.'])
+
+    def test_least_recently_used_sentences_are_evicted(self):
+        memory = TranslationMemory(os.path.join(self.directory, 'small.sqlite3'), max_bytes=100)
+        memory.put_many({'a' * 30: 'b' * 10}, 'fr', 'en')
+        memory.put_many({'c' * 30: 'd' * 10}, 'fr', 'en')
+        time.sleep(0.01)
+        self.assertEqual(memory.get_many(['a' * 30], 'fr', 'en'), {'a' * 30: 'b' * 10})
+        memory.put_many({'e' * 30: 'f' * 10}, 'fr', 'en')
+        self.assertEqual(memory.get_many(['a' * 30, 'c' * 30, 'e' * 30], 'fr', 'en'), {'a' * 30: 'b' * 10, 'e' * 30: 'f' * 10})
+        self.assertEqual(memory.get_stats()['evictions'], 1)
+
+    def test_eviction_removes_many_sentences_in_one_pass(self):
+        memory = TranslationMemory(os.path.join(self.directory, 'small.sqlite3'), max_bytes=100)
+        memory.put_many({'a' * 30: 'b' * 10}, 'fr', 'en')
+        memory.put_many({f"{i}" * 20: 'x' for i in range(5)}, 'fr', 'en')
+        stats = memory.get_stats()
+        self.assertLessEqual(stats['bytes'], 100)
+        self.assertEqual(stats['evictions'], 2)
+        self.assertEqual(memory.get_many(['a' * 30], 'fr', 'en'), {})
+
+class FakeLibreTranslate(BaseHTTPRequestHandler):
+    """LibreTranslate-style /translate endpoint that upper-cases its input"""
+
+    requests = []
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.requests.append(payload)
+        if payload['target'] == 'xx':
+            self.send_response(400)
+            self.end_headers()
+            return
+        body = json.dumps({'translatedText': [text.upper() for text in payload['q']]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestTranslationBackends(unittest.TestCase):
+
+    def test_http_backend(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FakeLibreTranslate)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        FakeLibreTranslate.requests = []
+        try:
+            backend = HttpTranslationBackend(f"http://127.0.0.1:{server.server_port}", timeout=2, api_key='secret')
+            translator = TextTranslator(backend=backend, retries=0)
+            self.assertEqual(translator.translate_chunks(['un', 'deux'], 'en', 'fr'), ['UN', 'DEUX'])
+            self.assertIn({
+                'q': ['un'], 'source': 'fr', 'target': 'en', 'format': 'text', 'api_key': 'secret'
+            }, FakeLibreTranslate.requests)
+            self.assertEqual(translator.translate('trois', 'xx', 'fr'), 'trois')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_mbart_backend_batches_sentences(self):
+        model = StubSeq2SeqModel(token_cost_ms=0, encode_cost_ms=0)
+        backend = MBartTranslationBackend(batch_size=2)
+        backend.registry.unload(backend.mbart_key)
+        backend._load_mbart = lambda: (model, StubTokenizer(MBART_LANG_CODES.values()))
+        self.addCleanup(backend.registry.unload, backend.mbart_key)
+        # Native summarization and translation share one copy of mBART
+        self.assertEqual(backend.mbart_key, MultilingualSummarizer(summarizer=object()).mbart_key)
+
+        translator = TextTranslator(backend=backend)
+        texts = ['Un. Deux deux.\n\nTrois trois trois.', 'Deux deux. Quatre.', 'Five.']
+        results = translator.translate_chunks(texts, 'en', ['fr', 'fr', 'en'])
+        self.assertEqual(results, texts)
+        # Four distinct French sentences in batches of two
+        self.assertEqual(model.calls, 2)
+        self.assertEqual(translator.translate('Un.', 'en', 'sw'), 'Un.')
+
+    def test_mbart_covers_every_detected_language(self):
+        languages = MBartTranslationBackend().supported_languages()
+        self.assertEqual(set(languages), set(LanguageDetector.SUPPORTED_LANGUAGES))
+        self.assertEqual((languages['bn'], languages['ur']), ('Bengali', 'Urdu'))
+
+        translator = TextTranslator(backend=MBartTranslationBackend())
+        self.assertTrue(translator.is_language_supported('TA'))
+        self.assertFalse(translator.is_language_supported('sw'))
+
+    def test_language_queries_use_the_backend(self):
+        """The default googletrans backend answers from googletrans.LANGUAGES"""
+        googletrans = ModuleType('googletrans')
+        googletrans.LANGUAGES = {'fr': 'french', 'sw': 'swahili'}
+        translator = TextTranslator()
+        with mock.patch.dict(sys.modules, {'googletrans': googletrans}):
+            self.assertEqual(translator.get_supported_languages(), googletrans.LANGUAGES)
+            self.assertTrue(translator.is_language_supported('SW'))
+            self.assertFalse(translator.is_language_supported('bn'))
+
+if __name__ == '__main__':
+    unittest.main()
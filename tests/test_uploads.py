@@ -0,0 +1,92 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import hashlib
+import shutil
+import tempfile
+import unittest
+from io import BytesIO
+from flask import Flask, jsonify, request
+from werkzeug.exceptions import RequestEntityTooLarge
+from docx import Document
+from file_handler import FileHandler
+from uploads import SpoolFile, UploadRequest, save_upload, upload_sha256
+
+class TestSpooledUploads(unittest.TestCase):
+
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+        self.seen = {}
+
+        class Request(UploadRequest):
+            pass
+        Request.configure(spool_dir=self.spool_dir, max_file_bytes=64 * 1024, request_quota_bytes=96 * 1024)
+
+        app = Flask(__name__)
+        app.request_class = Request
+
+        @app.route('/upload', methods=['POST'])
+        def upload():
+            try:
+                file = request.files['file']
+                self.seen['stream'] = file.stream
+                self.seen['files_during_request'] = os.listdir(self.spool_dir)
+                text = FileHandler.extract_text(file, file.filename)
+                for extra in request.files.getlist('extra'):
+                    extra.read()
+                return jsonify({'text': text, 'sha256': upload_sha256(file)})
+            except RequestEntityTooLarge as e:
+                return jsonify({'error': e.description}), 413
+
+        self.client = app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.spool_dir)
+
+    def post(self, data, filename, **extra):
+        payload = {'file': (BytesIO(data), filename)}
+        payload.update(extra)
+        return self.client.post('/upload', data=payload, content_type='multipart/form-data')
+
+    def test_upload_is_spooled_hashed_and_removed(self):
+        data = 'héllo world\n'.encode('utf-8') * 100
+        response = self.post(data, 'notes.txt')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['sha256'], hashlib.sha256(data).hexdigest())
+        self.assertEqual(response.json['text'], data.decode('utf-8').strip())
+        self.assertIsInstance(self.seen['stream'], SpoolFile)
+        self.assertEqual(len(self.seen['files_during_request']), 1)
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_docx_extracts_through_mapping(self):
+        document = Document()
+        document.add_paragraph('First paragraph.')
+        document.add_paragraph('Second paragraph.')
+        buffer = BytesIO()
+        document.save(buffer)
+        response = self.post(buffer.getvalue(), 'doc.docx')
+        self.assertEqual(response.json['text'], 'First paragraph.\nSecond paragraph.')
+
+    def test_file_over_limit_is_rejected(self):
+        response = self.post(b'x' * (65 * 1024), 'big.txt')
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_request_quota_covers_all_files(self):
+        """Each file is under the per-file limit but together they exceed the quota"""
+        response = self.post(b'a' * (60 * 1024), 'one.txt', extra=(BytesIO(b'b' * (60 * 1024)), 'two.txt'))
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_save_upload_moves_spool_file(self):
+        spool = SpoolFile(self.spool_dir)
+        spool.write(b'payload')
+        destination = os.path.join(self.spool_dir, 'kept')
+        save_upload(spool, destination)
+        with open(destination, 'rb') as f:
+            self.assertEqual(f.read(), b'payload')
+        self.assertEqual(os.listdir(self.spool_dir), ['kept'])
+
+if __name__ == '__main__':
+    unittest.main()